@@ -0,0 +1,191 @@
+import json
+from collections import namedtuple
+
+# 各类成员记录中依次保存的字段，用于报告成员的哪些字段发生了变化
+_FIELDS = {
+    'var': ('visibility', 'type', 'desc'),
+    'fun': ('visibility', 'type', 'desc', 'params', 'ret', 'template'),
+    'typedef': ('desc',),
+    'enum': ('desc',),
+}
+
+# 类型本身参与比较的字段
+_CLASS_FIELDS = ('desc', 'bases')
+
+# 报告中表示变化类型的符号
+_MARKS = {'added': '+', 'removed': '-', 'changed': '~'}
+
+
+class ClassPrint(namedtuple('ClassPrint', ['digest', 'header', 'members'])):
+    """
+    类型指纹：整个类型的摘要，类型本身的字段(描述, 基类)，成员键 -> (成员摘要, 成员记录)的字典
+    成员键为(种类, 签名)，函数的签名包含参数，重载的函数对应不同的键
+    摘要为记录元组的hash值，计算比加密哈希快数倍，只在同一进程内比较，不保存
+    """
+    __slots__ = ()
+
+
+class MemberChange(namedtuple('MemberChange', ['change', 'kind', 'signature', 'visibility', 'fields'])):
+    """
+    成员变化：变化类型(added/removed/changed)，成员种类(var/fun/typedef/enum)，签名，可见性，发生变化的字段
+    """
+    __slots__ = ()
+
+
+class ClassChange(namedtuple('ClassChange', ['change', 'name', 'fields', 'members'])):
+    """
+    类型变化：变化类型(added/removed/changed)，类型完整名称，类型本身发生变化的字段，MemberChange列表
+    """
+    __slots__ = ()
+
+
+def _member_records(data_type):
+    """
+    将数据类型的各类成员展开为(成员键, 成员记录)，成员记录的字段与_FIELDS一致
+    :param data_type: 数据类型信息
+    :return: 产生(成员键, 成员记录)二元组的生成器
+    """
+    for visiable, var_list in (('public', data_type.public_var_list),
+                               ('protected', data_type.protected_var_list),
+                               ('private', data_type.private_var_list)):
+        for var in var_list:
+            yield ('var', var[1]), (visiable, var[0], var[2])
+    for visiable, fun_list in (('public', data_type.public_fun_list),
+                               ('protected', data_type.protected_fun_list),
+                               ('private', data_type.private_fun_list)):
+        for fun in fun_list:
+            yield ('fun', fun[1]), (visiable, fun[0], fun[2], tuple(fun[3]), fun[4], fun[5])
+    for typedef in data_type.typedef_list:
+        yield ('typedef', typedef[0]), (typedef[1],)
+    for enum in data_type.enum_list:
+        yield ('enum', enum[0]), (enum[1],)
+
+
+def fingerprint(data_type):
+    """
+    计算类型及其每个成员的指纹
+    :param data_type: 数据类型信息
+    :return: ClassPrint对象
+    """
+    header = (data_type.desc, tuple(data_type.bases))
+    members = {}
+    for key, record in _member_records(data_type):
+        if key in members:
+            # 签名相同的成员(如doxygen重复输出的成员)按出现顺序编号，避免相互覆盖
+            number = 2
+            while key + (number,) in members:
+                number += 1
+            key += (number,)
+        members[key] = (hash(record), record)
+    digest = hash((header, tuple((key, member[0]) for key, member in members.items())))
+    return ClassPrint(digest, header, members)
+
+
+def snapshot(models):
+    """
+    计算一次doxygen输出中全部类型的指纹，只保留指纹，解析结果逐个处理后即释放
+    :param models: 产生(文件路径, DataType对象)二元组的可迭代对象
+    :return: 类型完整名称 -> ClassPrint的字典，同名类型保留最后一个
+    """
+    return {data_type.name: fingerprint(data_type) for file_path, data_type in models}
+
+
+def _visibility(record, kind):
+    """
+    获取成员记录中的可见性，类型重定义及枚举值没有可见性
+    """
+    return record[0] if kind in ('var', 'fun') else ''
+
+
+def _diff_members(old_members, new_members):
+    """
+    比较同一类型在新旧版本中的成员
+    :param old_members: 旧版本的成员键 -> (成员摘要, 成员记录)
+    :param new_members: 新版本的成员键 -> (成员摘要, 成员记录)
+    :return: MemberChange列表，依次为删除、修改(按旧版本顺序)及新增(按新版本顺序)的成员
+    """
+    changes = []
+    for key, (digest, record) in old_members.items():
+        other = new_members.get(key)
+        if other is None:
+            changes.append(MemberChange('removed', key[0], key[1], _visibility(record, key[0]), ()))
+        elif other[0] != digest or other[1] != record:
+            fields = tuple(name for name, old, new in zip(_FIELDS[key[0]], record, other[1]) if old != new)
+            changes.append(MemberChange('changed', key[0], key[1], _visibility(other[1], key[0]), fields))
+    for key, (digest, record) in new_members.items():
+        if key not in old_members:
+            changes.append(MemberChange('added', key[0], key[1], _visibility(record, key[0]), ()))
+    return changes
+
+
+def diff(old, new):
+    """
+    比较两次doxygen输出的类型指纹，每个类型及成员只访问常数次，耗时与类型及成员数量成线性关系
+    类型摘要相同时直接跳过，只比较摘要不同的类型的成员
+    :param old: 旧版本的snapshot结果
+    :param new: 新版本的snapshot结果
+    :return: ClassChange列表，依次为删除、修改(按旧版本顺序)及新增(按新版本顺序)的类型
+    """
+    changes = []
+    for name, old_print in old.items():
+        new_print = new.get(name)
+        if new_print is None:
+            changes.append(ClassChange('removed', name, (), []))
+        elif new_print.digest != old_print.digest:
+            fields = tuple(field for field, a, b in zip(_CLASS_FIELDS, old_print.header, new_print.header) if a != b)
+            members = _diff_members(old_print.members, new_print.members)
+            # 仅成员顺序变化时摘要不同，但没有需要报告的变化
+            if fields or members:
+                changes.append(ClassChange('changed', name, fields, members))
+    for name in new:
+        if name not in old:
+            changes.append(ClassChange('added', name, (), []))
+    return changes
+
+
+def summarize(changes):
+    """
+    统计各类变化的数量
+    :param changes: diff的结果
+    :return: 统计字典，如 {'added': 1, 'removed': 0, 'changed': 2, 'members': {'added': 3, ...}}
+    """
+    summary = {'added': 0, 'removed': 0, 'changed': 0, 'members': {'added': 0, 'removed': 0, 'changed': 0}}
+    for change in changes:
+        summary[change.change] += 1
+        for member in change.members:
+            summary['members'][member.change] += 1
+    return summary
+
+
+def format_report(changes):
+    """
+    生成文本格式的变化报告，每个变化一行，+ 新增，- 删除，~ 修改，修改的字段列在方括号中
+    :param changes: diff的结果
+    :return: 产生报告各行文本的生成器
+    """
+    summary = summarize(changes)
+    yield '类型：新增{0}个，删除{1}个，修改{2}个；成员：新增{3}个，删除{4}个，修改{5}个'.format(
+        summary['added'], summary['removed'], summary['changed'],
+        summary['members']['added'], summary['members']['removed'], summary['members']['changed'])
+    for change in changes:
+        fields = ' [{0}]'.format(','.join(change.fields)) if change.fields else ''
+        yield '{0} {1}{2}'.format(_MARKS[change.change], change.name, fields)
+        for member in change.members:
+            fields = ' [{0}]'.format(','.join(member.fields)) if member.fields else ''
+            visibility = member.visibility + ' ' if member.visibility else ''
+            yield '    {0} {1} {2}{3}{4}'.format(_MARKS[member.change], member.kind, visibility, member.signature,
+                                                fields)
+
+
+def save_json(file_name, changes):
+    """
+    将变化报告保存为json文件
+    :param file_name: json文件路径
+    :param changes: diff的结果
+    :return: 无
+    """
+    report = {'summary': summarize(changes),
+              'classes': [dict(change._asdict(), members=[member._asdict() for member in change.members])
+                          for change in changes]}
+    with open(file_name, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=1)
@@ -0,0 +1,141 @@
+import importlib
+import importlib.util
+from collections import namedtuple
+
+
+class ParserBackend(namedtuple('ParserBackend', ['parser', 'lister', 'desc'])):
+    """
+    输入格式：解析器类的位置，从目录中获取文件列表的函数的位置，说明
+    位置为"模块:属性"形式的字符串，使用时才导入对应的模块
+    """
+    __slots__ = ()
+
+
+class WriterBackend(namedtuple('WriterBackend', ['writer', 'ext', 'export', 'desc', 'requires'])):
+    """
+    输出方式：输出工具类的位置，默认扩展名，是否为数据导出(-e)方式，说明，
+    输出工具在创建对象时才导入的第三方模块名称元组，导入输出工具类时只检查这些模块是否已安装，不导入
+    """
+    __slots__ = ()
+
+
+# 输入格式，htmldocparser依赖pyquery，获取文件列表时只需lxml
+PARSERS = {
+    'html': ParserBackend('htmldocparser:HtmlDocParser', 'htmlreader:iter_annotated',
+                          'doxygen生成的html文档(-f、-d)，依赖lxml、pyquery'),
+    'xml': ParserBackend('xmldocparser:XmlDocParser', 'xmldocparser:XmlDocParser.iter_data_files',
+                         'doxygen生成的xml文档(-x)，无第三方依赖'),
+}
+
+# 输出方式，docwriter依赖pywin32及office word，仅Windows可用
+WRITERS = {
+    'word': WriterBackend('docwriter:DocWriter', '.doc', False, '通过office word生成.doc文件，依赖pywin32',
+                          ('win32com',)),
+    'docx': WriterBackend('docxwriter:DocxWriter', '.docx', False, '直接生成.docx文件，无第三方依赖', ()),
+    'markdown': WriterBackend('textwriter:MarkdownWriter', '.md', False, '生成Markdown文件，无第三方依赖', ()),
+    'html': WriterBackend('textwriter:HtmlWriter', '.html', False, '生成html文件，无第三方依赖', ()),
+    'asciidoc': WriterBackend('textwriter:AsciiDocWriter', '.adoc', False, '生成AsciiDoc文件，无第三方依赖', ()),
+    'jsonl': WriterBackend('exporter:JsonLinesExporter', '.jsonl', True, '导出为JSON Lines文件', ()),
+    'sqlite': WriterBackend('exporter:SqliteExporter', '.db', True, '导出为sqlite数据库', ()),
+}
+
+
+def _load(location):
+    """
+    导入location指定的对象
+    :param location: "模块:属性"形式的字符串，属性可包含"."，如 xmldocparser:XmlDocParser.iter_data_files
+    :return: 导入的对象
+    """
+    module_name, _, attr = location.partition(':')
+    target = importlib.import_module(module_name)
+    for name in attr.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+def _get(registry, kind, name):
+    """
+    从注册表中获取指定名称的项
+    :param registry: PARSERS 或 WRITERS
+    :param kind: 注册表的名称，用于错误信息
+    :param name: 输入格式或输出方式的名称
+    :return: ParserBackend 或 WriterBackend
+    """
+    if name not in registry:
+        raise ValueError('未知的{0}：{1}'.format(kind, name))
+    return registry[name]
+
+
+def register_parser(name, parser, lister, desc=''):
+    """
+    注册输入格式，同名时替换
+    :param name: 输入格式名称
+    :param parser: 解析器类的位置，如 mymodule:MyParser
+    :param lister: 获取文件列表的函数的位置，以目录为参数，产生文件路径
+    :param desc: 说明
+    :return: 无
+    """
+    PARSERS[name] = ParserBackend(parser, lister, desc)
+
+
+def register_writer(name, writer, ext, export=False, desc='', requires=()):
+    """
+    注册输出方式，同名时替换
+    :param name: 输出方式名称
+    :param writer: 输出工具类的位置，如 mymodule:MyWriter，需提供write(data_type)及save()方法
+    :param ext: 默认扩展名，如 .docx
+    :param export: 是否为数据导出方式
+    :param desc: 说明
+    :param requires: 输出工具在创建对象时才导入的第三方模块名称，如 ('win32com',)
+    :return: 无
+    """
+    WRITERS[name] = WriterBackend(writer, ext, export, desc, tuple(requires))
+
+
+def load_parser(name):
+    """
+    导入输入格式对应的解析器类
+    :param name: 输入格式名称，取值：html xml
+    :return: 解析器类，如HtmlDocParser
+    """
+    return _load(_get(PARSERS, '输入格式', name).parser)
+
+
+def load_lister(name):
+    """
+    导入输入格式对应的获取文件列表的函数，不导入解析器
+    :param name: 输入格式名称，取值：html xml
+    :return: 以目录为参数、产生文件路径的函数
+    """
+    return _load(_get(PARSERS, '输入格式', name).lister)
+
+
+def load_writer(name):
+    """
+    导入输出方式对应的输出工具类，并检查创建对象时才导入的模块是否已安装，缺少时在开始处理前即抛出ImportError
+    :param name: 输出方式名称，取值：word docx markdown html asciidoc jsonl sqlite
+    :return: 输出工具类，如DocxWriter
+    """
+    backend = _get(WRITERS, '输出方式', name)
+    for module_name in backend.requires:
+        if importlib.util.find_spec(module_name) is None:
+            raise ModuleNotFoundError("No module named '{0}'".format(module_name), name=module_name)
+    return _load(backend.writer)
+
+
+def writer_ext(name):
+    """
+    获取输出方式的默认扩展名
+    :param name: 输出方式名称
+    :return: 扩展名，如 .docx
+    """
+    return _get(WRITERS, '输出方式', name).ext
+
+
+def writer_names(export=False):
+    """
+    获取输出方式名称列表，用于命令行参数的可选值
+    :param export: True 获取数据导出方式，False 获取文档输出方式
+    :return: 名称列表
+    """
+    return [name for name, backend in WRITERS.items() if backend.export == export]
@@ -0,0 +1,283 @@
+import os
+import sys
+import json
+import time
+import pickle
+import shutil
+import tempfile
+import optparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import backends
+import corpusgen
+
+
+# 参与计时的解析步骤，依次为构造解析器、遍历文档及各get_*方法
+_PARSE_STEPS = [('__init__', None),
+                ('_scan', ()),
+                ('get_class_name', ()),
+                ('get_class_desc', ()),
+                ('get_var_info', ('Public',)),
+                ('get_var_info', ('Protected',)),
+                ('get_var_info', ('Private',)),
+                ('get_fun_info', ('Public',)),
+                ('get_fun_info', ('Protected',)),
+                ('get_fun_info', ('Private',)),
+                ('get_typedefs', ()),
+                ('get_enums', ()),
+                ('get_bases', ())]
+
+
+def _start_memory_trace():
+    """
+    开始统计内存峰值，支持resource模块的平台使用进程的最大常驻内存，否则使用tracemalloc统计python堆内存
+    :return: 无
+    """
+    try:
+        import resource
+    except ImportError:
+        import tracemalloc
+        tracemalloc.start()
+
+
+def _peak_memory():
+    """
+    获取当前进程的内存峰值
+    :return: 内存峰值(MB)
+    """
+    try:
+        import resource
+    except ImportError:
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[1] / 1024.0 / 1024.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux下单位为KB，macOS下单位为字节
+    return peak / 1024.0 / 1024.0 if sys.platform == 'darwin' else peak / 1024.0
+
+
+def _create_writer(backend, out_name):
+    """
+    创建指定的输出工具
+    :param backend: 输出方式，取值：word docx jsonl sqlite
+    :param out_name: 输出文件路径(不含扩展名)
+    :return: 输出工具对象
+    """
+    return backends.load_writer(backend)(out_name + backends.writer_ext(backend))
+
+
+def bench_parser(file_list, model_file):
+    """
+    逐个解析file_list中的文件，统计各解析步骤的耗时，解析结果依次pickle到model_file中供输出测试使用
+    应在独立进程中执行，以便统计内存峰值
+    :param file_list: html文件列表
+    :param model_file: 保存解析结果的文件路径
+    :return: 测试结果字典
+    """
+    from htmldocparser import HtmlDocParser as HtmlDocParser
+    from datatype import DataType as DataType
+    _start_memory_trace()
+    step_times = {}
+    total = 0.0
+    with open(model_file, 'wb') as models:
+        for html_file in file_list:
+            results = []
+            for name, args in _PARSE_STEPS:
+                start = time.perf_counter()
+                if args is None:
+                    doc_parser = HtmlDocParser(html_file)
+                else:
+                    results.append(getattr(doc_parser, name)(*args))
+                elapsed = time.perf_counter() - start
+                total += elapsed
+                key = name if not args else '{0}({1})'.format(name, args[0])
+                step_times[key] = step_times.get(key, 0.0) + elapsed
+            doc_parser.release()
+            results = results[1:]  # 去掉_scan的返回值
+            dt = DataType(results[0], results[1], results[2:5], results[5:8], results[8], results[9], results[10])
+            pickle.dump(dt, models, pickle.HIGHEST_PROTOCOL)
+    return {'files': len(file_list), 'seconds': total,
+            'files_per_sec': len(file_list) / total if total else 0.0,
+            'steps': step_times, 'peak_mb': _peak_memory()}
+
+
+def bench_writer(backend, model_file, out_name):
+    """
+    从model_file中逐个读取解析结果写入指定的输出工具，统计写入及保存的耗时
+    应在独立进程中执行，以便统计内存峰值
+    :param backend: 输出方式，取值：word docx markdown html asciidoc jsonl sqlite，或fakeword(使用模拟的word统计COM调用次数)
+    :param model_file: bench_parser保存的解析结果文件
+    :param out_name: 输出文件路径(不含扩展名)
+    :return: 测试结果字典
+    """
+    _start_memory_trace()
+    start = time.perf_counter()
+    recorder = None
+    if backend == 'fakeword':
+        import fakeword
+        from docwriter import DocWriter
+        # 使用模拟的word，无需安装pywin32，不经过backends中的依赖检查
+        recorder = fakeword.CallRecorder()
+        writer = DocWriter(out_name + '.doc', word_app=recorder.application())
+    else:
+        writer = _create_writer(backend, out_name)
+    count = 0
+    with open(model_file, 'rb') as models:
+        while True:
+            try:
+                dt = pickle.load(models)
+            except EOFError:
+                break
+            writer.write(dt)
+            count += 1
+    write_end = time.perf_counter()
+    writer.save()
+    end = time.perf_counter()
+    result = {'files': count, 'seconds': end - start, 'write_seconds': write_end - start,
+              'save_seconds': end - write_end, 'files_per_sec': count / (end - start) if end > start else 0.0,
+              'peak_mb': _peak_memory()}
+    if recorder is not None:
+        result['com_calls'] = recorder.count
+        result['com_calls_top'] = recorder.members.most_common(10)
+    return result
+
+
+def _run_isolated(func, *args):
+    """
+    在新的子进程中执行func，使各项测试的内存峰值互不影响
+    :return: func的返回值
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(func, *args).result()
+
+
+def run_benchmark(sizes, backends, work_dir, **corpus_options):
+    """
+    针对不同规模的语料依次测试解析及各输出方式的性能
+    :param sizes: 语料规模(类的数量)列表
+    :param backends: 参与测试的输出方式列表
+    :param work_dir: 语料及输出文件所在目录
+    :param corpus_options: 传递给corpusgen.generate_corpus的语料参数
+    :return: 测试结果列表，每个元素为一个语料规模的结果字典
+    """
+    report = []
+    for size in sizes:
+        corpus_dir = os.path.join(work_dir, 'corpus_{0}'.format(size))
+        file_list = corpusgen.generate_corpus(corpus_dir, class_count=size, **corpus_options)
+        model_file = os.path.join(work_dir, 'models_{0}.pickle'.format(size))
+        result = {'size': size, 'parser': _run_isolated(bench_parser, file_list, model_file), 'writers': {}}
+        for backend in backends:
+            out_name = os.path.join(work_dir, 'output_{0}_{1}'.format(size, backend))
+            result['writers'][backend] = _run_isolated(bench_writer, backend, model_file, out_name)
+        report.append(result)
+        print_result(result)
+    return report
+
+
+def _import_seconds(module, repeat):
+    """
+    在新的python进程中导入module并计时，取多次中的最小值，排除其他进程及磁盘缓存的干扰
+    :param module: 模块名称
+    :param repeat: 重复次数
+    :return: 导入耗时(秒)，导入失败(如缺少依赖)时返回None
+    """
+    code = 'import time\nstart = time.perf_counter()\nimport {0}\nprint(time.perf_counter() - start)'.format(module)
+    best = None
+    for n in range(repeat):
+        proc = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+        if proc.returncode:
+            return None
+        seconds = float(proc.stdout)
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def bench_imports(repeat=5):
+    """
+    测试命令行工具及各输入格式、输出方式的导入耗时，命令行工具的导入耗时即启动耗时，不应包含解析器、输出工具的导入
+    :param repeat: 每个模块的重复次数
+    :return: 模块名称 -> 导入耗时(秒)的字典，导入失败的模块为None
+    """
+    locations = [backend.lister for backend in backends.PARSERS.values()]
+    locations += [backend.parser for backend in backends.PARSERS.values()]
+    locations += [backend.writer for backend in backends.WRITERS.values()]
+    modules = ['doccrawler']
+    for location in locations:
+        module = location.partition(':')[0]
+        if module not in modules:
+            modules.append(module)
+    return {module: _import_seconds(module, repeat) for module in modules}
+
+
+def print_imports(imports):
+    """
+    输出导入耗时的测试结果
+    :param imports: bench_imports产生的结果字典
+    :return: 无
+    """
+    print('=== 导入耗时 ===')
+    for module, seconds in imports.items():
+        print('  {0:<28} {1}'.format(module, '{0:8.1f} ms'.format(seconds * 1000.0) if seconds is not None
+                                     else '     无法导入'))
+
+
+def print_result(result):
+    """
+    输出一个语料规模的测试结果
+    :param result: run_benchmark产生的结果字典
+    :return: 无
+    """
+    parser = result['parser']
+    print('=== 语料规模：{0} 个类 ==='.format(result['size']))
+    print('解析：{0:.1f} 文件/秒，总耗时 {1:.2f} 秒，内存峰值 {2:.1f} MB'.format(
+        parser['files_per_sec'], parser['seconds'], parser['peak_mb']))
+    for step, seconds in parser['steps'].items():
+        print('  {0:<28} {1:8.2f} ms/文件'.format(step, seconds * 1000.0 / max(parser['files'], 1)))
+    for backend, writer in result['writers'].items():
+        print('输出[{0}]：{1:.1f} 文件/秒，写入 {2:.2f} 秒，保存 {3:.2f} 秒，内存峰值 {4:.1f} MB'.format(
+            backend, writer['files_per_sec'], writer['write_seconds'], writer['save_seconds'], writer['peak_mb']))
+        if 'com_calls' in writer:
+            print('  COM调用：共{0}次，{1:.1f} 次/文件'.format(writer['com_calls'],
+                                                       writer['com_calls'] / max(writer['files'], 1)))
+            for name, count in writer['com_calls_top']:
+                print('    {0:<24} {1:8d}'.format(name, count))
+
+
+if __name__ == '__main__':
+    opt_parser = optparse.OptionParser(usage='%prog [options]\n使用生成的doxygen语料测试解析及输出性能')
+    opt_parser.add_option("-s", "--sizes", dest="sizes", default="100,1000",
+                          help="SIZES:语料规模(类的数量)，以逗号分隔，默认为100,1000")
+    opt_parser.add_option("-b", "--backends", dest="backends", default="docx,jsonl,sqlite",
+                          help="BACKENDS:参与测试的输出方式，以逗号分隔，可选word docx markdown html asciidoc jsonl sqlite fakeword，"
+                               "fakeword使用模拟的word统计COM调用次数，默认为docx,jsonl,sqlite")
+    opt_parser.add_option("--vars", dest="var_count", type="int", default=5, help="每种可见性的成员变量数量")
+    opt_parser.add_option("--funs", dest="fun_count", type="int", default=20, help="每种可见性的成员函数数量")
+    opt_parser.add_option("--enums", dest="enum_count", type="int", default=2, help="每个类的枚举类型数量")
+    opt_parser.add_option("--templates", dest="template_ratio", type="float", default=0.1, help="模板函数比例")
+    opt_parser.add_option("--details", dest="detail_ratio", type="float", default=0.5, help="带详细说明的函数比例")
+    opt_parser.add_option("-w", "--work_dir", dest="work_dir",
+                          help="WORK_DIR:语料及输出文件目录，指定时测试结束后保留，否则使用临时目录")
+    opt_parser.add_option("-j", "--json", dest="json_file", help="JSON_FILE:以json格式保存测试结果")
+    opt_parser.add_option("-i", "--imports", dest="imports", action="store_true", default=False,
+                          help="IMPORTS:只测试命令行工具及各输入格式、输出方式的导入耗时")
+    opts, args = opt_parser.parse_args()
+
+    if opts.imports:
+        imports = bench_imports()
+        print_imports(imports)
+        if opts.json_file:
+            with open(opts.json_file, 'w', encoding='utf-8') as file:
+                json.dump(imports, file, ensure_ascii=False, indent=2)
+        sys.exit(0)
+
+    work_dir = opts.work_dir or tempfile.mkdtemp(prefix='doccrawler_bench_')
+    try:
+        report = run_benchmark([int(size) for size in opts.sizes.split(',')], opts.backends.split(','), work_dir,
+                               var_count=opts.var_count, fun_count=opts.fun_count, enum_count=opts.enum_count,
+                               template_ratio=opts.template_ratio, detail_ratio=opts.detail_ratio)
+    finally:
+        if not opts.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    if opts.json_file:
+        with open(opts.json_file, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
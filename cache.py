@@ -0,0 +1,120 @@
+import hashlib
+import pickle
+import sqlite3
+import time
+
+
+class SqliteCache:
+    """
+    基于sqlite的持久化缓存，值以pickle格式保存，支持按最近最少使用的顺序淘汰
+    """
+    def __init__(self, db_name, table, max_size=0):
+        """
+        构造函数，打开(或创建)缓存数据库
+        :param db_name: 缓存数据库文件路径，或已打开的sqlite3连接(不同用途的缓存共用同一个数据库文件时使用)
+        :param table: 缓存使用的数据表名称
+        :param max_size: 缓存大小上限(字节)，超出时按最近最少使用的顺序淘汰，0表示不限制
+        """
+        self.table = table
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.own_conn = not isinstance(db_name, sqlite3.Connection)
+        self.conn = sqlite3.connect(db_name) if self.own_conn else db_name
+        self.conn.execute('CREATE TABLE IF NOT EXISTS {0} ('
+                          'key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, '
+                          'last_used REAL NOT NULL)'.format(table))
+        self.conn.execute('CREATE INDEX IF NOT EXISTS {0}_last_used ON {0}(last_used)'.format(table))
+
+    def get(self, key):
+        """
+        读取缓存的值
+        :param key: 缓存键
+        :return: 缓存的值，未命中时返回None
+        """
+        row = self.conn.execute('SELECT data FROM {0} WHERE key = ?'.format(self.table), (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute('UPDATE {0} SET last_used = ? WHERE key = ?'.format(self.table), (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        """
+        写入缓存
+        :param key: 缓存键
+        :param value: 缓存的值，需可被pickle
+        :return: 无
+        """
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.conn.execute('INSERT OR REPLACE INTO {0} VALUES (?, ?, ?, ?)'.format(self.table),
+                          (key, data, len(data), time.time()))
+
+    def _evict(self):
+        """
+        缓存超出大小上限时，按最近最少使用的顺序淘汰
+        :return: 无
+        """
+        if not self.max_size:
+            return
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM {0}'.format(self.table)).fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = self.conn.execute('SELECT key, size FROM {0} ORDER BY last_used'.format(self.table))
+        expired = []
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            expired.append((key,))
+            total -= size
+        self.conn.executemany('DELETE FROM {0} WHERE key = ?'.format(self.table), expired)
+
+    def close(self):
+        """
+        淘汰超出上限的缓存，提交并关闭数据库，共用的连接只提交不关闭
+        :return: 无
+        """
+        self._evict()
+        self.conn.commit()
+        if self.own_conn:
+            self.conn.close()
+
+
+class ParseCache(SqliteCache):
+    """
+    html解析结果缓存
+    以文件内容的哈希值和解析器版本作为键，缓存解析得到的DataType对象，文件内容未变化时无需重新解析
+    """
+    def __init__(self, db_name, version, max_size=0):
+        """
+        构造函数，打开(或创建)缓存数据库
+        :param db_name: 缓存数据库文件路径或已打开的sqlite3连接
+        :param version: 解析器版本，解析器版本变化后旧的缓存自动失效
+        :param max_size: 缓存大小上限(字节)，超出时按最近最少使用的顺序淘汰，0表示不限制
+        """
+        SqliteCache.__init__(self, db_name, 'parse_cache', max_size)
+        self.version = str(version)
+
+    def make_key(self, file_path):
+        """
+        计算文件对应的缓存键
+        :param file_path: html文件路径
+        :return: 文件内容的sha1与解析器版本组成的字符串
+        """
+        with open(file_path, 'rb') as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+        return '{0}:{1}'.format(digest, self.version)
+
+
+class FragmentCache(SqliteCache):
+    """
+    文档片段缓存，以类型信息的指纹作为键，缓存输出工具为该类型渲染的文档片段
+    """
+    def __init__(self, db_name, max_size=0):
+        """
+        构造函数，打开(或创建)缓存数据库
+        :param db_name: 缓存数据库文件路径或已打开的sqlite3连接
+        :param max_size: 缓存大小上限(字节)，超出时按最近最少使用的顺序淘汰，0表示不限制
+        """
+        SqliteCache.__init__(self, db_name, 'fragment_cache', max_size)
@@ -0,0 +1,129 @@
+import os
+import json
+import pickle
+import traceback
+from collections import namedtuple
+
+# 进度日志的格式版本，格式变化后旧的进度日志不能用于恢复
+JOURNAL_VERSION = 1
+
+
+class Failure(namedtuple('Failure', ['file', 'stage', 'error', 'detail'])):
+    """
+    处理失败的文件：文件路径，失败的阶段(解析、输出)，错误信息，完整的异常堆栈
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_error(cls, file_path, stage, error):
+        """
+        根据异常创建Failure对象，进程池中抛出的异常包含子进程中的堆栈
+        :param file_path: 文件路径
+        :param stage: 失败的阶段
+        :param error: 异常对象
+        :return: Failure对象
+        """
+        detail = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+        return cls(file_path, stage, '{0}: {1}'.format(type(error).__name__, error), detail)
+
+
+def save_failures(file_name, failures):
+    """
+    将处理失败的文件及错误信息保存为json文件
+    :param file_name: json文件路径
+    :param failures: Failure对象列表
+    :return: 无
+    """
+    with open(file_name, 'w', encoding='utf-8') as file:
+        json.dump([failure._asdict() for failure in failures], file, ensure_ascii=False, indent=2)
+
+
+def _stamp(file_path):
+    """
+    获取文件的修改时间及大小，用于判断上次运行后文件是否被修改
+    :param file_path: 文件路径
+    :return: (修改时间(纳秒), 文件大小)，文件不存在时返回None
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Journal:
+    """
+    进度日志，记录已完成(解析并输出)的文件及其解析结果，运行中断后据此恢复，已完成的文件无需重新解析
+    文件为pickle流，第一条记录为(格式版本, 运行参数)，之后每完成一个文件追加一条(文件路径, 修改时间及大小, DataType)
+    记录并立即刷新，进程被强制结束时最多丢失最后一条不完整的记录
+    """
+    def __init__(self, path, settings, resume=False):
+        """
+        构造函数，创建进度日志或打开已有的进度日志继续记录
+        :param path: 进度日志文件路径
+        :param settings: 影响输出结果的运行参数(如输出方式、标题级别)，恢复时须与上次运行一致
+        :param resume: 是否从已有的进度日志恢复，False时覆盖已有的进度日志
+        """
+        self.path = path
+        self.settings = settings
+        self.models = {}  # 上次运行已完成且之后未被修改的文件路径 -> DataType
+        self.resumed = resume and os.path.exists(path)  # 是否为上次运行保留的进度日志
+        if self.resumed:
+            end = self._load()
+            self.file = open(path, 'r+b')
+            # 去掉末尾不完整的记录，之后的记录追加在最后一条完整记录之后
+            self.file.truncate(end)
+            self.file.seek(end)
+        else:
+            self.file = open(path, 'wb')
+            pickle.dump((JOURNAL_VERSION, settings), self.file, pickle.HIGHEST_PROTOCOL)
+            self.file.flush()
+
+    def _load(self):
+        """
+        读取已有的进度日志，运行参数与本次不一致时抛出ValueError
+        :return: 最后一条完整记录的结束位置
+        """
+        entries = {}
+        with open(self.path, 'rb') as file:
+            try:
+                header = pickle.load(file)
+            except Exception:
+                raise ValueError('进度日志已损坏：{0}'.format(self.path))
+            if header != (JOURNAL_VERSION, self.settings):
+                raise ValueError('进度日志与本次运行的参数不一致，不能恢复：{0}'.format(self.path))
+            end = file.tell()
+            while True:
+                try:
+                    file_path, stamp, data_type = pickle.load(file)
+                except Exception:
+                    # 到达末尾，或最后一条记录因进程被结束而不完整
+                    break
+                entries[file_path] = (stamp, data_type)
+                end = file.tell()
+        for file_path, (stamp, data_type) in entries.items():
+            if _stamp(file_path) == stamp:
+                self.models[file_path] = data_type
+        return end
+
+    def record(self, file_path, data_type):
+        """
+        记录一个已完成的文件，从进度日志恢复的文件不重复记录
+        :param file_path: 文件路径
+        :param data_type: 文件的解析结果
+        :return: 无
+        """
+        if self.models.get(file_path) is data_type:
+            return
+        pickle.dump((file_path, _stamp(file_path), data_type), self.file, pickle.HIGHEST_PROTOCOL)
+        self.file.flush()
+
+    def close(self, remove=False):
+        """
+        关闭进度日志
+        :param remove: 是否删除进度日志文件，全部文件处理成功后删除
+        :return: 无
+        """
+        self.file.close()
+        if remove:
+            os.remove(self.path)
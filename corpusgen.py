@@ -0,0 +1,289 @@
+import os
+import random
+import optparse
+from xml.sax.saxutils import escape
+
+
+_TYPES = ['int', 'bool', 'void', 'double', 'std::string', 'unsigned int', 'const char *', 'std::vector&lt; int &gt;',
+          'size_t', 'float']
+_WORDS = ['数据', '配置', '状态', '缓存', '消息', '节点', '通道', '任务', '参数', '结果', '索引', '句柄']
+
+# 各可见性对应的doxygen分组锚点前缀及分组标题
+_SECTIONS = [('pub', 'Public'), ('pro', 'Protected'), ('pri', 'Private')]
+
+_PAGE_HEAD = """<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" \
+"https://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head>
+<meta http-equiv="Content-Type" content="text/xhtml;charset=UTF-8"/>
+<title>{project}: {title}</title>
+</head>
+<body>
+<div id="top"><div id="titlearea"><table cellspacing="0" cellpadding="0"><tbody><tr>
+<td id="projectalign"><div id="projectname">{project}</div></td></tr></tbody></table></div></div>
+"""
+
+_PAGE_TAIL = """</div><!-- contents -->
+</body>
+</html>
+"""
+
+
+def _words(rnd, count):
+    """
+    生成随机的中文描述
+    :param rnd: 随机数生成器
+    :param count: 词语数量
+    :return: 描述文本
+    """
+    return ''.join(rnd.choice(_WORDS) for _ in range(count))
+
+
+class _ClassPage:
+    """
+    生成一个doxygen风格的类描述html页面，页面结构与HtmlDocParser解析的doxygen(中文)输出一致
+    """
+    def __init__(self, rnd, class_id, options):
+        """
+        构造函数
+        :param rnd: 随机数生成器
+        :param class_id: 类序号，用于生成类名及锚点
+        :param options: 生成参数，见generate_corpus
+        """
+        self.rnd = rnd
+        self.class_id = class_id
+        self.name = 'Class{0}'.format(class_id)
+        self.file_name = 'class_class{0}.html'.format(class_id)
+        self.options = options
+        self.anchor_count = 0
+        self.decls = []  # 成员声明部分
+        self.details = []  # 成员详细说明部分
+
+    def _anchor(self):
+        """
+        生成页面内唯一的成员锚点id
+        :return: 锚点id
+        """
+        self.anchor_count += 1
+        return 'a{0:x}{1:04x}'.format(self.class_id, self.anchor_count)
+
+    def _heading(self, anchor, title):
+        """
+        生成成员分组表格的开始部分及分组标题
+        """
+        self.decls.append('<table class="memberdecls">\n'
+                          '<tr class="heading"><td colspan="2"><h2 class="groupheader"><a name="{0}"></a>\n'
+                          '{1}</h2></td></tr>\n'.format(anchor, title))
+
+    def _memitem(self, mem_id, left, right, brief, more, template=None):
+        """
+        生成成员声明行，包括模板参数行、声明行、简要说明行及分隔行
+        """
+        if template:
+            self.decls.append('<tr class="memitem:{0}"><td class="memTemplParams" colspan="2">{1} </td></tr>\n'
+                              '<tr class="memitem:{0}"><td class="memTemplItemLeft" align="right" valign="top">'
+                              '{2}&#160;</td><td class="memTemplItemRight" valign="bottom">{3}</td></tr>\n'.format(
+                                  mem_id, template, left, right))
+        else:
+            self.decls.append('<tr class="memitem:{0}"><td class="memItemLeft" align="right" valign="top">'
+                              '{1}&#160;</td><td class="memItemRight" valign="bottom">{2}</td></tr>\n'.format(
+                                  mem_id, left, right))
+        if brief is not None:
+            more_link = ' <a href="{0}#{1}">更多...</a>'.format(self.file_name, mem_id) if more else ''
+            self.decls.append('<tr class="memdesc:{0}"><td class="mdescLeft">&#160;</td>'
+                              '<td class="mdescRight">{1}{2}<br /></td></tr>\n'.format(mem_id, brief, more_link))
+        self.decls.append('<tr class="separator:{0}"><td class="memSeparator" colspan="2">&#160;</td></tr>\n'.format(
+            mem_id))
+
+    def _detail(self, mem_id, title, memname, body, template=None):
+        """
+        生成成员详细说明块
+        """
+        template_div = '<div class="memtemplate">\n{0} </div>\n'.format(template) if template else ''
+        self.details.append(
+            '<a id="{0}"></a>\n'
+            '<h2 class="memtitle"><span class="permalink"><a href="#{0}">&#9670;&nbsp;</a></span>{1}</h2>\n'
+            '<div class="memitem">\n<div class="memproto">\n{2}'
+            '      <table class="memname">\n        <tr>\n          <td class="memname">{3}</td>\n'
+            '        </tr>\n      </table>\n</div><div class="memdoc">\n{4}</div>\n</div>\n'.format(
+                mem_id, title, template_div, memname, body))
+
+    def _types(self, prefix):
+        """
+        生成typedef及枚举类型声明，以及枚举类型的详细说明
+        """
+        opts = self.options
+        self._heading('{0}-types'.format(prefix), dict(_SECTIONS)[prefix] + ' 类型')
+        for n in range(opts['typedef_count']):
+            mem_id = self._anchor()
+            self._memitem(mem_id, 'typedef {0}'.format(self.rnd.choice(_TYPES)),
+                          '<a class="el" href="{0}#{1}">Type{2}</a>'.format(self.file_name, mem_id, n),
+                          _words(self.rnd, 2), False)
+        for n in range(opts['enum_count']):
+            mem_id = self._anchor()
+            values = [('{0}{1}'.format(mem_id, v), 'Value{0}_{1}'.format(n, v))
+                      for v in range(opts['enum_value_count'])]
+            self._memitem(mem_id, 'enum ', '<a class="el" href="{0}#{1}">Enum{2}</a> {{ {3} }}'.format(
+                self.file_name, mem_id, n, ', '.join('<a class="el" href="#{0}">{1}</a>'.format(i, v)
+                                                     for i, v in values)),
+                _words(self.rnd, 2), True)
+            rows = ''.join('<tr><td class="fieldname"><a id="{0}"></a>{1}&#160;</td>'
+                           '<td class="fielddoc"><p>{2} </p>\n</td></tr>\n'.format(i, v, _words(self.rnd, 2))
+                           for i, v in values)
+            self._detail(mem_id, 'Enum{0}'.format(n),
+                         'enum <a class="el" href="#{0}">{1}::Enum{2}</a>'.format(mem_id, self.name, n),
+                         '<p>{0} </p>\n<table class="fieldtable">\n<tr><th colspan="2">枚举值</th></tr>{1}'
+                         '</table>\n'.format(_words(self.rnd, 3), rows))
+        self.decls.append('</table>\n')
+
+    def _methods(self, prefix, visiable, static=False):
+        """
+        生成成员函数声明及详细说明，部分函数为模板函数，部分函数带有参数、返回值说明
+        """
+        opts = self.options
+        rnd = self.rnd
+        anchor = '{0}-static-methods'.format(prefix) if static else '{0}-methods'.format(prefix)
+        self._heading(anchor, ('静态 ' if static else '') + visiable + ' 成员函数')
+        count = max(1, opts['fun_count'] // 4) if static else opts['fun_count']
+        for n in range(count):
+            mem_id = self._anchor()
+            ret_type = rnd.choice(_TYPES)
+            if static:
+                ret_type = 'static ' + ret_type
+            params = [(rnd.choice(_TYPES), 'arg{0}'.format(i)) for i in range(rnd.randint(0, 4))]
+            fun_name = '{0}{1}'.format('create' if static else 'method', n)
+            signature = '<a class="el" href="{0}#{1}">{2}</a> ({3})'.format(
+                self.file_name, mem_id, fun_name, ', '.join('{0} {1}'.format(t, a) for t, a in params))
+            template = 'template&lt;typename T &gt;' if rnd.random() < opts['template_ratio'] else None
+            has_detail = rnd.random() < opts['detail_ratio']
+            # 少量只有详细说明、没有简要说明的函数
+            brief = None if has_detail and rnd.random() < 0.1 else _words(rnd, 3)
+            self._memitem(mem_id, ret_type, signature, brief, has_detail, template)
+            if has_detail:
+                body = '<p>{0} </p>\n<p>{1} </p>\n'.format(_words(rnd, 3), _words(rnd, 8))
+                if params:
+                    body += ('<dl class="params"><dt>参数</dt><dd>\n  <table class="params">\n' +
+                             ''.join('    <tr><td class="paramdir">[in]</td><td class="paramname">{0}</td>'
+                                     '<td>{1} </td></tr>\n'.format(a, _words(rnd, 2)) for t, a in params) +
+                             '  </table>\n  </dd>\n</dl>\n')
+                if 'void' not in ret_type:
+                    body += '<dl class="section return"><dt>返回</dt><dd>{0} </dd></dl>\n'.format(_words(rnd, 2))
+                    if rnd.random() < 0.3:
+                        body += ('<dl class="retval"><dt>返回值</dt><dd>\n  <table class="retval">\n'
+                                 '    <tr><td class="paramname">0</td><td>{0} </td></tr>\n'
+                                 '  </table>\n  </dd>\n</dl>\n'.format(_words(rnd, 2)))
+                self._detail(mem_id, fun_name + '()', '{0} {1}::{2} '.format(ret_type, self.name, fun_name),
+                             body, template)
+        if not static and prefix == 'pub' and self.class_id > 0:
+            # 继承自基类的成员，解析时应被排除
+            base = 'class_class{0}.html'.format(self.class_id - 1)
+            group = 'pub_methods_class_class{0}'.format(self.class_id - 1)
+            self.decls.append('<tr class="inherit_header {0}"><td colspan="2" '
+                              'onclick="javascript:toggleInherit(\'{0}\')"><img src="closed.png" alt="-"/>&#160;'
+                              'Public 成员函数 继承自 <a class="el" href="{1}">Class{2}</a></td></tr>\n'.format(
+                                  group, base, self.class_id - 1))
+            self.decls.append('<tr class="memitem:b{0:x} inherit {1}"><td class="memItemLeft" align="right" '
+                              'valign="top">void&#160;</td><td class="memItemRight" valign="bottom">'
+                              '<a class="el" href="{2}#b{0:x}">method0</a> ()</td></tr>\n'.format(
+                                  self.class_id, group, base))
+        self.decls.append('</table>\n')
+
+    def _attribs(self, prefix, visiable):
+        """
+        生成成员变量声明
+        """
+        self._heading('{0}-attribs'.format(prefix), visiable + ' 属性')
+        for n in range(self.options['var_count']):
+            mem_id = self._anchor()
+            self._memitem(mem_id, self.rnd.choice(_TYPES),
+                          '<a class="el" href="{0}#{1}">m_var{2}</a>'.format(self.file_name, mem_id, n),
+                          _words(self.rnd, 2), False)
+        self.decls.append('</table>\n')
+
+    def render(self):
+        """
+        生成完整的页面
+        :return: html文本
+        """
+        title = '{0}类 参考'.format(self.name)
+        self._types('pub')
+        for prefix, visiable in _SECTIONS:
+            self._methods(prefix, visiable)
+            if prefix == 'pub':
+                self._methods(prefix, visiable, static=True)
+            self._attribs(prefix, visiable)
+        desc = _words(self.rnd, 10)
+        return ''.join([_PAGE_HEAD.format(project='Corpus', title=title),
+                        '<div class="header">\n  <div class="headertitle">\n<div class="title">{0}</div>  </div>\n'
+                        '</div><!--header-->\n<div class="contents">\n\n'
+                        '<p>{1} <a href="{2}#details">更多...</a></p>\n'.format(title, desc[:6], self.file_name),
+                        ''.join(self.decls),
+                        '<a name="details" id="details"></a><h2 class="groupheader">详细描述</h2>\n'
+                        '<div class="textblock"><p>{0} </p>\n</div>'.format(desc),
+                        '<h2 class="groupheader">成员函数说明</h2>\n',
+                        ''.join(self.details),
+                        _PAGE_TAIL])
+
+
+def generate_corpus(out_dir, class_count=100, var_count=5, fun_count=20, typedef_count=2, enum_count=2,
+                    enum_value_count=5, template_ratio=0.1, detail_ratio=0.5, seed=0):
+    """
+    生成doxygen风格的html测试语料，包括annotated.html及每个类的class*.html页面
+    :param out_dir: 输出目录
+    :param class_count: 类的数量
+    :param var_count: 每个类每种可见性的成员变量数量
+    :param fun_count: 每个类每种可见性的成员函数数量
+    :param typedef_count: 每个类的typedef数量
+    :param enum_count: 每个类的枚举类型数量
+    :param enum_value_count: 每个枚举类型的枚举值数量
+    :param template_ratio: 成员函数为模板函数的比例
+    :param detail_ratio: 成员函数带有详细说明(参数、返回值)的比例
+    :param seed: 随机数种子，相同参数及种子生成的语料完全相同
+    :return: 生成的类描述html文件路径列表
+    """
+    options = {'var_count': var_count, 'fun_count': fun_count, 'typedef_count': typedef_count,
+               'enum_count': enum_count, 'enum_value_count': enum_value_count,
+               'template_ratio': template_ratio, 'detail_ratio': detail_ratio}
+    rnd = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    rows = ['<tr id="row_0_"><td class="entry"><span class="icona"><span class="icon">N</span></span>'
+            '<a class="el" href="namespacecorpus.html" target="_self">corpus</a></td>'
+            '<td class="desc"></td></tr>\n']
+    file_list = []
+    for class_id in range(class_count):
+        page = _ClassPage(rnd, class_id, options)
+        file_name = os.path.join(out_dir, page.file_name)
+        with open(file_name, 'w', encoding='utf-8') as file:
+            file.write(page.render())
+        file_list.append(file_name)
+        rows.append('<tr id="row_{0}_"><td class="entry"><span class="icona"><span class="icon">C</span></span>'
+                    '<a class="el" href="{1}" target="_self">{2}</a></td><td class="desc">{3}</td></tr>\n'.format(
+                        class_id + 1, page.file_name, escape(page.name), _words(rnd, 2)))
+    with open(os.path.join(out_dir, 'annotated.html'), 'w', encoding='utf-8') as file:
+        file.write(_PAGE_HEAD.format(project='Corpus', title='类列表'))
+        file.write('<div class="header">\n  <div class="headertitle">\n<div class="title">类列表</div>  </div>\n'
+                   '</div><!--header-->\n<div class="contents">\n<div class="directory">\n'
+                   '<table class="directory">\n')
+        file.write(''.join(rows))
+        file.write('</table>\n</div><!-- directory -->\n')
+        file.write(_PAGE_TAIL)
+    return file_list
+
+
+if __name__ == '__main__':
+    opt_parser = optparse.OptionParser(usage='%prog [options] OUT_DIR\n生成doxygen风格的html测试语料')
+    opt_parser.add_option("-n", "--classes", dest="class_count", type="int", default=100, help="类的数量")
+    opt_parser.add_option("--vars", dest="var_count", type="int", default=5, help="每种可见性的成员变量数量")
+    opt_parser.add_option("--funs", dest="fun_count", type="int", default=20, help="每种可见性的成员函数数量")
+    opt_parser.add_option("--typedefs", dest="typedef_count", type="int", default=2, help="每个类的typedef数量")
+    opt_parser.add_option("--enums", dest="enum_count", type="int", default=2, help="每个类的枚举类型数量")
+    opt_parser.add_option("--templates", dest="template_ratio", type="float", default=0.1, help="模板函数比例")
+    opt_parser.add_option("--details", dest="detail_ratio", type="float", default=0.5, help="带详细说明的函数比例")
+    opt_parser.add_option("--seed", dest="seed", type="int", default=0, help="随机数种子")
+    opts, args = opt_parser.parse_args()
+    if len(args) != 1:
+        opt_parser.error('需要指定输出目录')
+    files = generate_corpus(args[0], opts.class_count, opts.var_count, opts.fun_count, opts.typedef_count,
+                            opts.enum_count, template_ratio=opts.template_ratio, detail_ratio=opts.detail_ratio,
+                            seed=opts.seed)
+    print('已生成{0}个类描述文件及annotated.html，输出目录：{1}'.format(len(files), args[0]))
@@ -1,17 +1,59 @@
+import sys
+from collections import namedtuple
+
+
+class VarInfo(namedtuple('VarInfo', ['type', 'name', 'desc'])):
+    """
+    成员变量信息：数据类型，变量名称，变量描述
+    """
+    __slots__ = ()
+
+    def __new__(cls, type, name, desc):
+        # 数据类型在各类型中大量重复(int、bool、std::string等)，驻留后同一字符串只保存一份
+        return super().__new__(cls, sys.intern(type), name, desc)
+
+
+class FunInfo(namedtuple('FunInfo', ['type', 'name', 'desc', 'params', 'ret', 'template'])):
+    """
+    成员函数信息：返回值类型，函数名称及参数，函数描述，参数说明元组，返回值说明，模板参数声明
+    """
+    __slots__ = ()
+
+    def __new__(cls, type, name, desc, params, ret, template):
+        return super().__new__(cls, sys.intern(type), name, desc, tuple(params), ret, sys.intern(template))
+
+
+class TypedefInfo(namedtuple('TypedefInfo', ['define', 'desc'])):
+    """
+    类型重定义信息：重定义语句，重定义描述
+    """
+    __slots__ = ()
+
+
+class EnumInfo(namedtuple('EnumInfo', ['name', 'desc'])):
+    """
+    枚举值信息：枚举值名称，枚举值描述
+    """
+    __slots__ = ()
+
 
 class DataType:
     """
     用于表示类或结构体类型的成员信息
     """
-    def __init__(self, name, desc, varinfo, funinfo, typedefs, enums):
+    __slots__ = ('name', 'desc', 'public_var_list', 'protected_var_list', 'private_var_list',
+                 'public_fun_list', 'protected_fun_list', 'private_fun_list', 'typedef_list', 'enum_list', 'bases')
+
+    def __init__(self, name, desc, varinfo, funinfo, typedefs, enums, bases=()):
         """
         构造数据类型描述信息
         :param name: 数据类型的名称，类名或结构体名称
         :param desc: 数据类型的描述信息，类或结构体的描述信息
-        :param varinfo: 描述类型成员变量信息的列表，列表元素依次为描述public，protected, private 成员的列表
-        :param funinfo: 描述类型成员函数信息的列表，列表元素依次为描述public，protected, private 方法的列表
-        :param typedefs: typedef 重定义类型列表
-        :param enums: 类型内的枚举变量列表
+        :param varinfo: 描述类型成员变量信息的列表，列表元素依次为描述public，protected, private 成员的VarInfo列表
+        :param funinfo: 描述类型成员函数信息的列表，列表元素依次为描述public，protected, private 方法的FunInfo列表
+        :param typedefs: typedef 重定义类型TypedefInfo列表
+        :param enums: 类型内的枚举变量EnumInfo列表
+        :param bases: 基类的完整名称元组，html文档中为提供了继承成员的全部祖先类，xml文档中为直接基类
         """
         self.name = name
         self.desc = desc
@@ -23,28 +65,24 @@ class DataType:
         self.private_fun_list = funinfo[2]
         self.typedef_list = typedefs
         self.enum_list = enums
+        self.bases = tuple(bases)
 
     def __str__(self):
         """
         输出自身表示的数据类型的信息
-        :return: 无
+        :return: 数据类型信息的文本描述
         """
-        print('类型名称：', self.name)
-        print('类型描述：', self.desc)
-        print('公有属性：')
-        print('  ', self.public_var_list)
-        print('保护属性：')
-        print('  ', self.protected_var_list)
-        print('私有属性：')
-        print('  ', self.private_var_list)
-        print('public 方法：')
-        print('  ', self.public_fun_list)
-        print('protected 方法：')
-        print('  ', self.protected_fun_list)
-        print('private 方法：')
-        print('  ', self.private_fun_list)
-        print('类型重定义：')
-        print('  ', self.typedef_list)
-        print('枚举类型定义：')
-        print('  ', self.enum_list)
-        return ''
+        lines = ['类型名称： ' + self.name,
+                 '类型描述： ' + self.desc]
+        for title, value in (('公有属性：', self.public_var_list),
+                             ('保护属性：', self.protected_var_list),
+                             ('私有属性：', self.private_var_list),
+                             ('public 方法：', self.public_fun_list),
+                             ('protected 方法：', self.protected_fun_list),
+                             ('private 方法：', self.private_fun_list),
+                             ('类型重定义：', self.typedef_list),
+                             ('枚举类型定义：', self.enum_list),
+                             ('基类：', list(self.bases))):
+            lines.append(title)
+            lines.append('   ' + str(value))
+        return '\n'.join(lines)
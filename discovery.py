@@ -0,0 +1,80 @@
+import os
+from fnmatch import fnmatchcase
+import util
+
+
+# 类型描述文件的扩展名，目录中的图片、css、js等文件不参与解析
+HTML_EXTS = ('.html', '.htm')
+
+
+def scan_dir(dir, exts=HTML_EXTS):
+    """
+    使用os.scandir逐个产生目录(包含子目录)中指定扩展名的文件，同一目录中按名称排序，结果顺序与文件系统无关
+    :param dir: 需要遍历的目录
+    :param exts: 文件扩展名(小写)，为空时产生全部文件
+    :return: 产生文件路径的生成器
+    """
+    stack = [dir]
+    visited = set()  # 已遍历目录的真实路径，避免符号链接造成重复遍历或死循环
+    while stack:
+        current = stack.pop()
+        real = os.path.realpath(current)
+        if real in visited:
+            continue
+        visited.add(real)
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as error:
+            print('无法读取目录：{0} ({1})'.format(current, error))
+            continue
+        sub_dirs = []
+        for entry in entries:
+            if entry.is_dir():
+                sub_dirs.append(entry.path)
+            elif not exts or os.path.splitext(entry.name)[1].lower() in exts:
+                yield entry.path
+        # 逆序入栈，使子目录按名称顺序遍历
+        stack.extend(reversed(sub_dirs))
+
+
+def match_name(name, include=(), exclude=()):
+    """
+    判断类型名称是否满足包含/排除规则，规则为作用于完整类型名称(含命名空间)的通配符，如 ns::*、*::detail::*、*Impl
+    :param name: 类型的完整名称
+    :param include: 包含规则列表，为空时包含全部类型
+    :param exclude: 排除规则列表，优先于包含规则
+    :return: 满足规则时返回True
+    """
+    if include and not any(fnmatchcase(name, pattern) for pattern in include):
+        return False
+    return not any(fnmatchcase(name, pattern) for pattern in exclude)
+
+
+def discover(sources, include=(), exclude=()):
+    """
+    合并多个来源的类型描述文件，按规范化的真实路径去重，并按包含/排除规则过滤
+    类型名称由doxygen文件名还原，无需解析文件；结果保持各来源的先后顺序及来源内的顺序
+    :param sources: 产生文件路径的可迭代对象列表，如scan_dir、HtmlDocParser.iter_data_files的结果
+    :param include: 包含规则列表
+    :param exclude: 排除规则列表
+    :return: 产生文件路径的生成器
+    """
+    seen = set()
+    for source in sources:
+        for file_path in source:
+            key = os.path.normcase(os.path.realpath(file_path))
+            if key in seen:
+                continue
+            seen.add(key)
+            if match_name(util.compound_name(file_path), include, exclude):
+                yield file_path
+
+
+def split_patterns(values):
+    """
+    将命令行中多次指定且以逗号分隔的规则展开为列表
+    :param values: 命令行参数值列表，可为None
+    :return: 规则列表
+    """
+    return [pattern.strip() for value in values or [] for pattern in value.split(',') if pattern.strip()]
@@ -1,69 +1,571 @@
 import os
+import sys
 import datetime
 import optparse
-import docwriter
-from htmldocparser import HtmlDocParser as HtmlDocParser
-from datatype import DataType as DataType
-import util
+import collections
+from tracer import Tracer, Progress, NULL_TRACER
+import backends
+import discovery
+
+# 子命令，未指定时为render
+SUBCOMMANDS = ('list', 'parse', 'export', 'render', 'diff', 'merge')
+
+
+def iter_data_types(file_iter, jobs=1, parse_cache=None, tracer=NULL_TRACER, doc_parser=None, models=None,
+                    on_error=None):
+    """
+    按顺序解析file_iter产生的html(或xml)文件，逐个产生解析结果
+    使用进程池时同时处理中的文件数量有上限，解析结果不会因输出较慢而在内存中堆积
+    :param file_iter: 产生html文件路径的可迭代对象
+    :param jobs: 解析使用的进程数，1表示在当前进程中串行解析，0表示使用全部CPU核心
+    :param parse_cache: 解析结果缓存ParseCache对象，为None时不使用缓存
+    :param tracer: 计时工具，记录缓存查询及各解析步骤(包括进程池中的解析)的耗时
+    :param doc_parser: 解析器类，HtmlDocParser 或 XmlDocParser，为None时使用HtmlDocParser
+    :param models: 已有的解析结果(如从进度日志恢复)，html文件路径 -> DataType对象，其中的文件不再解析
+    :param on_error: 解析失败时调用的函数，参数为(html文件路径, 异常对象)，指定时跳过该文件继续处理，为None时抛出异常
+    :return: 按文件顺序产生(html文件路径, DataType对象)二元组的生成器，跳过的文件不产生结果
+    """
+    if doc_parser is None:
+        doc_parser = backends.load_parser('html')
+    executor = None
+    window = 1
+    if jobs != 1:
+        from concurrent.futures import ProcessPoolExecutor
+        workers = jobs or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+        window = workers * 4
+    # 处理中的文件，元素为[文件路径, 缓存键, 解析结果, 进程池任务]
+    pending = collections.deque()
+
+    def resolve():
+        html_file, key, dt, future = pending.popleft()
+        if dt is None:
+            try:
+                if future is None:
+                    dt = doc_parser.parse(html_file, tracer)
+                elif tracer.enabled:
+                    dt, events = future.result()
+                    tracer.extend(events)
+                else:
+                    dt = future.result()
+            except Exception as error:
+                if on_error is None:
+                    raise
+                on_error(html_file, error)
+                return
+            if key is not None:
+                with tracer.span('cache_put', 'cache'):
+                    parse_cache.put(key, dt)
+        yield html_file, dt
+
+    try:
+        for html_file in file_iter:
+            key = None
+            dt = models.get(html_file) if models else None
+            if dt is None and parse_cache is not None:
+                # 只解析新增或内容发生变化的文件，其余从缓存读取
+                with tracer.span('cache_get', 'cache', file=html_file):
+                    try:
+                        key = parse_cache.make_key(html_file)
+                    except OSError:
+                        # 文件不可读时不使用缓存，由解析报告错误，不影响其他文件
+                        key = None
+                    else:
+                        dt = parse_cache.get(key)
+            future = None
+            if dt is None and executor is not None:
+                parse = doc_parser.parse_traced if tracer.enabled else doc_parser.parse
+                future = executor.submit(parse, html_file)
+            pending.append([html_file, key, dt, future])
+            if len(pending) >= window:
+                yield from resolve()
+        while pending:
+            yield from resolve()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
 
 if __name__ == '__main__':
-    usage = """
+    usage = """%prog [list|parse|export|render] [options]
+       %prog diff [options] OLD_DIR NEW_DIR
+       %prog merge [options] MODEL_FILE...
     软件：doccrawler v1.0.0
     作者：二部十五室 喻鹤
     说明：根据doxygen生成的html文档提取C++类型信息，将其转换未word文档
           [工作方式1]：通过-d或--html_dir指定doxygen生成的html目录(确保生成annotated.html)自动生成工程的类型描述信息，输出到word文档
           [工作方式2]：通过-f或--file_dir指定存放描述类型信息的html文档的目录，目录中的html文档将被解析，输出到word文档
-    注意：[工作方式1]和[工作方式2]可同时工作，但所有信息将被输出到同一个文件中
+          [工作方式3]：通过-x或--xml_dir指定doxygen生成的xml目录(GENERATE_XML，确保生成index.xml)，解析速度快于html
+    注意：[工作方式1]和[工作方式2]可同时工作，但所有信息将被输出到同一个文件中；[工作方式3]不能与其他方式同时使用
+    子命令：list   只输出文件列表，不解析文件
+            parse  解析文件并输出提取的类型信息
+            export 导出类型信息，-e指定导出格式，默认为jsonl
+            render 生成文档(默认)
+            merge  合并--shard生成的各分片中间模型文件，按原始顺序生成文档(-w)或导出(-e)
+            diff   比较两次doxygen输出(html或xml目录)，列出新增、删除及修改的类型和成员，-o指定报告文件(.json为json格式)
     """
     opt_parser = optparse.OptionParser(usage=usage)
     opt_parser.add_option("-f", "--file_dir", dest="file_dir",
                           help="FILE_DIR:doxygen生成的描述数据类型的html文件所在目录")
     opt_parser.add_option("-d", "--html_dir", dest="html_dir",
                           help="HTML_DIR:doxygen生成的html目录，其中需生成annotated.html文件")
+    opt_parser.add_option("-x", "--xml_dir", dest="xml_dir",
+                          help="XML_DIR:doxygen生成的xml目录，其中需生成index.xml文件")
+    opt_parser.add_option("--include", dest="include", action="append",
+                          help="INCLUDE:只处理完整名称(含命名空间)匹配指定通配符的类型，如 ns::*，多个规则以逗号分隔或多次指定")
+    opt_parser.add_option("--exclude", dest="exclude", action="append",
+                          help="EXCLUDE:不处理完整名称匹配指定通配符的类型，如 *::detail::*，优先于--include")
     opt_parser.add_option("-o", "--output", dest="outdoc_name",
-                          help="OUTDOC_NAME:生成的office word 文件名称(如：path/filename.doc)",
-                          default="{0}\类型文档说明_{1}.doc".format(os.getcwd(), datetime.datetime.now().strftime("%Y-%m-%d %H-%M-%S")))
+                          help="OUTDOC_NAME:生成的office word 文件名称(如：path/filename.doc)")
     opt_parser.add_option("-t", "--title", dest="start_title",
                           help="START_TITLE:生成的office word文件中类型描述信息的标题级别",
                           default=2)
+    opt_parser.add_option("-w", "--writer", dest="writer", type="choice", choices=backends.writer_names(),
+                          help="WRITER:文档输出方式，word 通过office word生成.doc文件(仅Windows)，"
+                               "docx 直接生成.docx文件(无需office)，markdown、html、asciidoc 生成对应的文本文件，"
+                               "默认为word",
+                          default="word")
+    opt_parser.add_option("-j", "--jobs", dest="jobs", type="int",
+                          help="JOBS:解析html文件的并行进程数，0表示使用全部CPU核心，默认为1(串行)",
+                          default=1)
+    opt_parser.add_option("-e", "--export", dest="export", type="choice", choices=backends.writer_names(export=True),
+                          help="EXPORT:不生成word文档，将提取的类型信息导出为JSON Lines(jsonl)或sqlite数据库(sqlite)")
+    opt_parser.add_option("-c", "--cache", dest="cache",
+                          help="CACHE:缓存数据库文件路径，html文件内容未变化时直接使用缓存的解析结果，"
+                               "docx输出方式下类型信息未变化时直接使用缓存的文档片段")
+    opt_parser.add_option("--cache_size", dest="cache_size", type="int",
+                          help="CACHE_SIZE:解析结果缓存及文档片段缓存各自的大小上限(MB)，超出时淘汰最近最少使用的缓存，0表示不限制，默认为1024",
+                          default=1024)
+    opt_parser.add_option("--trace", dest="trace",
+                          help="TRACE:记录各处理阶段的耗时，以Chrome trace格式保存到指定文件(chrome://tracing中查看)")
+    opt_parser.add_option("--summary", dest="summary",
+                          help="SUMMARY:记录各处理阶段的耗时，将各阶段汇总及耗时最长的文件、类保存到指定的json文件")
+    opt_parser.add_option("-p", "--progress", dest="progress", action="store_true", default=False,
+                          help="PROGRESS:以单行刷新的方式显示处理进度、速度及预计剩余时间")
+    opt_parser.add_option("--inherited", dest="inherited", action="store_true", default=False,
+                          help="INHERITED:输出继承自基类的public、protected成员，描述中注明所属基类")
+    opt_parser.add_option("--link_types", dest="link_types", action="store_true", default=False,
+                          help="LINK_TYPES:将成员的数据类型及函数原型中的工程内类型链接到该类型的标题(仅docx输出方式)")
+    opt_parser.add_option("--symbol_index", dest="symbol_index",
+                          help="SYMBOL_INDEX:符号索引文件路径，读取上次运行保存的索引并在本次运行后更新，"
+                               "本次未处理的类型(如被--exclude排除的基类)仍可被继承和链接")
+    opt_parser.add_option("--watch", dest="watch", action="store_true", default=False,
+                          help="WATCH:监视模式，常驻运行并监视输入目录，文件变化后只重新解析变化的文件并重新生成输出，"
+                               "安装watchdog时使用文件系统事件，否则定时轮询，按Ctrl+C退出")
+    opt_parser.add_option("--interval", dest="interval", type="float",
+                          help="INTERVAL:监视模式下轮询文件变化的间隔(秒)，默认为1",
+                          default=1.0)
+    opt_parser.add_option("--debounce", dest="debounce", type="float",
+                          help="DEBOUNCE:监视模式下最后一次文件变化后等待的时间(秒)，期间的变化合并为一次输出，默认为2",
+                          default=2.0)
+    opt_parser.add_option("--shard_by", dest="shard_by", type="choice", choices=["namespace", "directory", "size"],
+                          help="SHARD_BY:分片输出(仅docx输出方式)，按命名空间(namespace)、html文件所在目录(directory)"
+                               "或仅按数量(size)将类型划分为多个docx文档并行生成，-o指定的文件为链接各分片的索引文档，"
+                               "-j指定并行进程数")
+    opt_parser.add_option("--shard_size", dest="shard_size", type="int",
+                          help="SHARD_SIZE:每个分片文档的类型数量上限，0表示不限制，默认为500",
+                          default=500)
+    opt_parser.add_option("--shard", dest="shard",
+                          help="SHARD:多节点分片解析，格式为i/N(i从1开始)，只解析文件列表中分配给第i个分片的文件，"
+                               "解析结果写入中间模型文件(-o指定，默认为shard_i_of_N.models)而不生成文档，"
+                               "全部分片完成后使用merge子命令合并输出，各节点需使用相同的输入目录内容及--include、--exclude")
+    opt_parser.add_option("--shard_method", dest="shard_method", type="choice", choices=["hash", "size"],
+                          help="SHARD_METHOD:--shard的划分方式，hash 按文件名的稳定哈希值划分，"
+                               "size 按文件大小划分为总大小接近的连续区间，默认为hash",
+                          default="hash")
+    opt_parser.add_option("--resume", dest="resume", action="store_true", default=False,
+                          help="RESUME:从上次中断(或存在处理失败的文件)的运行恢复，已完成的文件直接使用进度日志"
+                               "(输出文件名.journal)中的解析结果，只处理失败及未完成的文件，需通过-o指定与上次相同的输出文件")
+    opt_parser.add_option("--failures", dest="failures",
+                          help="FAILURES:将处理失败的文件及错误信息(含异常堆栈)保存到指定的json文件")
+
+    argv = sys.argv[1:]
+    command = argv.pop(0) if argv and argv[0] in SUBCOMMANDS else None
+    opts, args = opt_parser.parse_args(argv)
+    if command == 'export':
+        opts.export = opts.export or 'jsonl'
+    elif command == 'render' and opts.export:
+        opt_parser.error('render 子命令不支持 -e，请使用 export 子命令')
+    # 未指定子命令时与以前的用法一致，指定-e时导出，否则生成文档
+    command = command or 'render'
+    if opts.shard_by and (opts.export or opts.writer != 'docx'):
+        opt_parser.error('分片输出仅支持docx输出方式(-w docx)')
+    if opts.link_types and (opts.export or opts.writer != 'docx'):
+        opt_parser.error('--link_types 仅支持docx输出方式(-w docx)')
+    if opts.shard_by and opts.watch:
+        opt_parser.error('分片输出不支持 --watch')
+    if opts.shard_by and (opts.inherited or opts.link_types):
+        opt_parser.error('分片输出不支持 --inherited、--link_types')
+    if opts.resume and (opts.watch or opts.shard_by):
+        opt_parser.error('--resume 不支持 --watch、分片输出')
+    if opts.shard:
+        import modelfile
+        try:
+            shard_index, shard_count = modelfile.parse_shard(opts.shard)
+        except ValueError as error:
+            opt_parser.error(str(error))
+        if command not in ('list', 'parse', 'render') or opts.export or opts.shard_by or opts.watch or opts.resume:
+            opt_parser.error('--shard 只生成中间模型文件，只能与 list、parse、render 子命令同时使用或不指定子命令，'
+                             '且不能与 -e、--shard_by、--watch、--resume 同时使用')
+    if command == 'merge':
+        if not args:
+            opt_parser.error('merge 子命令需要指定各分片的中间模型文件')
+        if opts.file_dir or opts.html_dir or opts.xml_dir or opts.shard_by or opts.watch or opts.resume:
+            opt_parser.error('merge 子命令从中间模型文件读取类型信息，不能与 -f、-d、-x、--shard_by、--watch、--resume 同时使用')
+    if opts.resume and not opts.outdoc_name:
+        opt_parser.error('--resume 需要通过 -o 指定与上次运行相同的输出文件')
+    if opts.xml_dir and (opts.file_dir or opts.html_dir):
+        opt_parser.error('-x/--xml_dir 不能与 -f/--file_dir、-d/--html_dir 同时使用')
+    input_format = 'xml' if opts.xml_dir else 'html'
+
+    def find_files():
+        """
+        获取文件列表，仅保存文件路径用于统计总数，html文本、文档树及解析结果均逐个处理后即释放
+        两种工作方式得到的文件按真实路径去重，同一类型只输出一次
+        """
+        sources = []
+        if opts.file_dir:
+            sources.append(discovery.scan_dir(opts.file_dir))
+        if opts.html_dir:
+            sources.append(backends.load_lister('html')(opts.html_dir))
+        if opts.xml_dir:
+            sources.append(backends.load_lister('xml')(opts.xml_dir))
+        return list(discovery.discover(sources, discovery.split_patterns(opts.include),
+                                       discovery.split_patterns(opts.exclude)))
+
+    failures = []
+
+    def on_error(html_file, error, stage='解析'):
+        """
+        记录处理失败的文件，跳过该文件继续处理其他文件
+        """
+        import checkpoint
+        failure = checkpoint.Failure.from_error(html_file, stage, error)
+        failures.append(failure)
+        print('处理失败:[{0}]{1}，{2}'.format(stage, html_file, failure.error))
+
+    def report_failures():
+        """
+        输出处理失败的文件列表，指定--failures时保存到json文件
+        """
+        print('{0}个文件处理失败：'.format(len(failures)))
+        for failure in failures:
+            print('  [{0}]{1}  {2}'.format(failure.stage, failure.file, failure.error))
+        if opts.failures:
+            import checkpoint
+            checkpoint.save_failures(opts.failures, failures)
+            print('失败报告已保存到：{0}'.format(opts.failures))
+
+    if command == 'diff':
+        # 比较两次doxygen输出，每个目录按其中的index.xml或annotated.html确定输入格式，可通过-c复用缓存的解析结果
+        import apidiff
+        if len(args) != 2:
+            opt_parser.error('diff 子命令需要指定新旧两个doxygen输出目录')
+        include = discovery.split_patterns(opts.include)
+        exclude = discovery.split_patterns(opts.exclude)
+        prints = []
+        for tree_dir in args:
+            if os.path.exists(os.path.join(tree_dir, 'index.xml')):
+                tree_format, source = 'xml', backends.load_lister('xml')(tree_dir)
+            elif os.path.exists(os.path.join(tree_dir, 'annotated.html')):
+                tree_format, source = 'html', backends.load_lister('html')(tree_dir)
+            else:
+                tree_format, source = 'html', discovery.scan_dir(tree_dir)
+            try:
+                tree_parser = backends.load_parser(tree_format)
+            except ImportError as error:
+                opt_parser.error('缺少依赖：{0}'.format(error))
+            parse_cache = None
+            if opts.cache:
+                from cache import ParseCache
+                parse_cache = ParseCache(opts.cache, tree_parser.cache_version, opts.cache_size * 1024 * 1024)
+            tree_files = list(discovery.discover([source], include, exclude))
+            print('解析：{0}，共{1}个文件'.format(tree_dir, len(tree_files)))
+            prints.append(apidiff.snapshot(iter_data_types(tree_files, opts.jobs, parse_cache, doc_parser=tree_parser,
+                                                           on_error=on_error)))
+            if parse_cache is not None:
+                parse_cache.close()
+        changes = apidiff.diff(prints[0], prints[1])
+        if opts.outdoc_name and opts.outdoc_name.endswith('.json'):
+            apidiff.save_json(opts.outdoc_name, changes)
+        elif opts.outdoc_name:
+            with open(opts.outdoc_name, 'w', encoding='utf-8') as report:
+                for line in apidiff.format_report(changes):
+                    report.write(line + '\n')
+        else:
+            for line in apidiff.format_report(changes):
+                print(line)
+        if opts.outdoc_name:
+            print('变化报告已保存到：{0}'.format(opts.outdoc_name))
+        if failures:
+            # 解析失败的文件中的类型会被报告为删除或新增
+            report_failures()
+        sys.exit(1 if changes or failures else 0)
+
+    if command == 'list':
+        # 只获取文件列表，不导入解析器及输出工具，指定--shard时只列出本分片的文件
+        file_list = find_files()
+        if opts.shard:
+            file_list = [file_list[index] for index in modelfile.partition(file_list, shard_index, shard_count,
+                                                                           opts.shard_method)]
+        for file_path in file_list:
+            print(file_path)
+        print('共{0}个文件'.format(len(file_list)))
+        sys.exit(0)
+
+    # 仅导入所选的解析器及输出工具，如docx方式无需安装pywin32，缺少依赖时在解析前即报错
+    writer_name = opts.export or opts.writer
+    try:
+        # merge子命令读取中间模型文件，无需解析器；--shard只生成中间模型文件，无需输出工具
+        doc_parser = backends.load_parser(input_format) if command != 'merge' else None
+        writer_class = backends.load_writer(writer_name) if command != 'parse' and not opts.shard else None
+    except ImportError as error:
+        opt_parser.error('缺少依赖：{0}'.format(error))
+
+    if opts.shard:
+        # 多节点分片：只解析分配给本分片的文件，解析结果按原始序号写入中间模型文件，由merge子命令合并后输出
+        file_list = find_files()
+        indexes = modelfile.partition(file_list, shard_index, shard_count, opts.shard_method)
+        positions = {file_list[index]: index for index in indexes}
+        model_name = opts.outdoc_name or os.path.join(os.getcwd(), 'shard_{0}_of_{1}{2}'.format(
+            shard_index, shard_count, modelfile.MODEL_EXT))
+        print('分片{0}/{1}：共{2}个文件，本分片{3}个文件'.format(shard_index, shard_count, len(file_list), len(indexes)))
+        parse_cache = None
+        if opts.cache:
+            from cache import ParseCache
+            parse_cache = ParseCache(opts.cache, doc_parser.cache_version, opts.cache_size * 1024 * 1024)
+        model_writer = modelfile.ModelWriter(model_name, {
+            'shard': shard_index, 'count': shard_count, 'total': len(file_list), 'method': opts.shard_method,
+            'parser': doc_parser.cache_version, 'listing': modelfile.listing_checksum(file_list)})
+        progress = Progress(len(indexes)) if opts.progress else None
+        data_types = iter_data_types([file_list[index] for index in indexes], opts.jobs, parse_cache,
+                                     doc_parser=doc_parser, on_error=on_error)
+        for n, (html_file, dt) in enumerate(data_types):
+            if progress is not None:
+                progress.update(n + 1, html_file)
+            else:
+                print('处理文件:[{0}/{1}]'.format(n + 1, len(indexes)) + html_file)
+            model_writer.write(positions[html_file], html_file, dt)
+        if progress is not None:
+            progress.finish()
+        model_writer.save()
+        if parse_cache is not None:
+            parse_cache.close()
+        if failures:
+            report_failures()
+        print('处理完毕，中间模型文件路径：{0}'.format(model_name))
+        sys.exit(1 if failures else 0)
+
+    if command == 'parse':
+        # 解析文件并输出提取的类型信息，不生成文档
+        parse_cache = None
+        if opts.cache:
+            from cache import ParseCache
+            parse_cache = ParseCache(opts.cache, doc_parser.cache_version, opts.cache_size * 1024 * 1024)
+        for html_file, dt in iter_data_types(find_files(), opts.jobs, parse_cache, doc_parser=doc_parser,
+                                             on_error=on_error):
+            print('文件：' + html_file)
+            print(dt)
+        if parse_cache is not None:
+            parse_cache.close()
+        if failures:
+            report_failures()
+        sys.exit(1 if failures else 0)
 
-    opts, args = opt_parser.parse_args()
     # 获取输出的word文件名称
     doc_name = opts.outdoc_name
+    if not doc_name:
+        doc_name = os.path.join(os.getcwd(), "类型文档说明_{0}{1}".format(
+            datetime.datetime.now().strftime("%Y-%m-%d %H-%M-%S"), backends.writer_ext(writer_name)))
     print("获取输出文件名称" + doc_name)
 
-    # DocWriter对象
+    if opts.shard_by:
+        # 分片输出，各分片进程自行解析并生成分片文档，最后生成索引文档
+        import sharding
+        file_list = find_files()
+        shards = sharding.partition(file_list, opts.shard_by, opts.shard_size)
+        print('共{0}个文件，划分为{1}个分片'.format(len(file_list), len(shards)))
+
+        def shard_done(count, result):
+            print('完成分片:[{0}/{1}]{2}，{3}个类型，输出文件：{4}'.format(
+                count, len(shards), result.name, len(result.classes), result.doc_name))
+            for failure in result.failures:
+                failures.append(failure)
+                print('处理失败:[{0}]{1}，{2}'.format(failure.stage, failure.file, failure.error))
+        results = sharding.render_shards(shards, doc_name, iter_data_types, int(opts.start_title), opts.jobs,
+                                         opts.cache, opts.cache_size * 1024 * 1024, shard_done, doc_parser)
+        sharding.write_index(doc_name, results, int(opts.start_title))
+        if failures:
+            report_failures()
+        print('处理完毕，索引文件路径：{0}'.format(doc_name))
+        sys.exit(1 if failures else 0)
+
+    parse_cache = None
+    fragment_cache = None
+    if opts.cache:
+        from cache import ParseCache, FragmentCache
+        # merge子命令不解析文件，只使用文档片段缓存
+        if command != 'merge':
+            parse_cache = ParseCache(opts.cache, doc_parser.cache_version, opts.cache_size * 1024 * 1024)
+        if opts.writer == 'docx' and not opts.export:
+            fragment_cache = FragmentCache(parse_cache.conn if parse_cache is not None else opts.cache,
+                                           opts.cache_size * 1024 * 1024)
+
+    symbol_index = None
+    if opts.inherited or opts.link_types or opts.symbol_index:
+        from symbolindex import SymbolIndex as SymbolIndex
+        symbol_index = SymbolIndex.load(opts.symbol_index) if opts.symbol_index else SymbolIndex()
+
     print("标题级别：{0}".format(opts.start_title))
-    doc_writer = docwriter.DocWriter(doc_name, start_title=int(opts.start_title))
-
-    # 获取文件列表
-    file_list =[]
-    if opts.file_dir:
-        file_list += util.get_file_list(opts.file_dir)
-    if opts.html_dir:
-        file_list += HtmlDocParser.get_data_files(opts.html_dir)
-
-    # 开始处理文件
-    total_count = len(file_list)
-    for n, html_file in enumerate(file_list):
-        print('处理文件:[{0}/{1}]'.format(n + 1, total_count) + html_file)
-        doc_parser = HtmlDocParser(html_file)
-        name = doc_parser.get_class_name()
-        desc = doc_parser.get_class_desc()
-        public_var_list = doc_parser.get_var_info('Public')
-        protected_var_list = doc_parser.get_var_info('Protected')
-        private_var_list = doc_parser.get_var_info('Private')
-        public_fun_list = doc_parser.get_fun_info('Public')
-        protected_fun_list = doc_parser.get_fun_info('Protected')
-        private_fun_list = doc_parser.get_fun_info('Private')
-        typedef_list = doc_parser.get_typedefs()
-        enum_list = doc_parser.get_enums()
-        dt = DataType(name, desc,
-                      [public_var_list, protected_var_list, private_var_list],
-                      [public_fun_list, protected_fun_list, private_fun_list],
-                      typedef_list, enum_list)
-        doc_writer.write(dt)
-    doc_writer.save()
+
+    def create_writer(out_name):
+        """
+        创建DocWriter对象
+        """
+        if opts.export:
+            return writer_class(out_name)
+        if opts.writer == 'docx':
+            return writer_class(out_name, start_title=int(opts.start_title), fragment_cache=fragment_cache,
+                                symbol_index=symbol_index if opts.link_types else None)
+        return writer_class(out_name, start_title=int(opts.start_title))
+
+    tracer = Tracer() if opts.trace or opts.summary else NULL_TRACER
+
+    def write_all(doc_writer, data_types, total_count, journal=None):
+        """
+        依次输出解析结果并保存，输出失败的类型记录后跳过，指定journal时将输出完成的文件记录到进度日志
+        """
+        progress = Progress(total_count) if opts.progress else None
+        for n, (html_file, dt) in enumerate(data_types):
+            model = dt
+            if symbol_index is not None:
+                symbol_index.add(dt)
+                if opts.inherited:
+                    dt = symbol_index.with_inherited(dt)
+            if progress is not None:
+                progress.update(n + 1, html_file)
+            else:
+                print('处理文件:[{0}/{1}]'.format(n + 1, total_count) + html_file)
+            try:
+                with tracer.span('write', 'writer', file=html_file, **{'class': dt.name}):
+                    doc_writer.write(dt)
+            except Exception as error:
+                on_error(html_file, error, '输出')
+                continue
+            if journal is not None:
+                journal.record(html_file, model)
+        if progress is not None:
+            progress.finish()
+        with tracer.span('save', 'writer'):
+            doc_writer.save()
+
+    if opts.watch:
+        # 监视模式，解析结果常驻内存，文件变化后只重新解析变化的文件，一批变化结束后重新输出
+        import watcher
+        stem, ext = os.path.splitext(doc_name)
+
+        def emit(models):
+            # 先输出到临时文件再替换，输出过程中原文件始终完整可用
+            tmp_name = stem + '.tmp' + ext
+            if symbol_index is not None:
+                for html_file, dt in models:
+                    symbol_index.add(dt)
+            failure_count = len(failures)
+            write_all(create_writer(tmp_name), models, len(models))
+            os.replace(tmp_name, doc_name)
+            if parse_cache is not None:
+                parse_cache.conn.commit()
+            print('已更新输出文件：{0}，共{1}个类型'.format(doc_name, len(models)))
+            if len(failures) > failure_count:
+                report_failures()
+
+        watch_dirs = [path for path in (opts.file_dir, opts.html_dir, opts.xml_dir) if path]
+        marker_files = []
+        if opts.html_dir:
+            marker_files.append(os.path.join(opts.html_dir, 'annotated.html'))
+        if opts.xml_dir:
+            marker_files.append(os.path.join(opts.xml_dir, 'index.xml'))
+
+        def parse(files, on_parse_error):
+            """
+            解析一批变化的文件，失败的文件记录到失败列表并通知监视器保留原解析结果，解析结束后输出本批的失败列表
+            """
+            del failures[:]
+
+            def on_file_error(html_file, error):
+                on_error(html_file, error)
+                on_parse_error(html_file, error)
+            yield from iter_data_types(files, opts.jobs, parse_cache, tracer, doc_parser, on_error=on_file_error)
+            if failures:
+                report_failures()
+
+        file_watcher = watcher.Watcher(find_files, parse, emit, watch_dirs, marker_files, opts.interval, opts.debounce)
+        file_watcher.run()
+    elif command == 'merge':
+        # 合并各分片的中间模型文件，按原始文件顺序输出，结果与单机处理全部文件一致
+        import modelfile
+        try:
+            total_count, data_types = modelfile.merge(args)
+        except (ValueError, OSError) as error:
+            opt_parser.error(str(error))
+        if opts.inherited or opts.link_types:
+            print('建立符号索引...')
+            data_types = symbol_index.spool(data_types)
+        try:
+            write_all(create_writer(doc_name), data_types, total_count)
+        except ValueError as error:
+            # 中间模型文件不完整(如分片节点中途退出)时，输出文件不完整，不能使用
+            sys.exit('合并失败：{0}'.format(error))
+    else:
+        # 开始处理文件，每完成一个文件即记录到进度日志，运行中断后可通过--resume恢复
+        import checkpoint
+        journal_name = doc_name + '.journal'
+        settings = {'writer': writer_name, 'start_title': int(opts.start_title), 'parser': doc_parser.cache_version,
+                    'inherited': opts.inherited, 'link_types': opts.link_types}
+        if opts.resume and not os.path.exists(journal_name):
+            print('未找到进度日志：{0}，将处理全部文件'.format(journal_name))
+        try:
+            journal = checkpoint.Journal(journal_name, settings, opts.resume)
+        except ValueError as error:
+            opt_parser.error(str(error))
+        if journal.models:
+            print('从进度日志恢复：{0}个文件已完成，不再解析'.format(len(journal.models)))
+        try:
+            doc_writer = create_writer(doc_name)
+        except BaseException:
+            # 未能创建输出文件时不保留本次新建的进度日志，上次运行保留的进度日志仍可用于恢复
+            journal.close(remove=not journal.resumed)
+            raise
+        file_list = find_files()
+        data_types = iter_data_types(file_list, opts.jobs, parse_cache, tracer, doc_parser, journal.models, on_error)
+        if opts.inherited or opts.link_types:
+            # 先解析全部文件建立符号索引，再依次输出，输出每个类型时均可引用其他全部类型
+            print('建立符号索引...')
+            data_types = symbol_index.spool(data_types)
+        write_all(doc_writer, data_types, len(file_list), journal)
+        # 全部成功时删除进度日志，否则保留，修复后通过--resume只处理失败的文件
+        journal.close(remove=not failures)
+    if opts.trace:
+        tracer.export_chrome(opts.trace)
+        print('耗时记录已保存到：{0}'.format(opts.trace))
+    if opts.summary:
+        summary = tracer.export_summary(opts.summary)
+        print('耗时汇总已保存到：{0}，耗时最长的文件：'.format(opts.summary))
+        for item in summary['slowest_files'][:10]:
+            print('  {0:8.1f} ms  {1}  {2}'.format(item['parse'] * 1000.0, item['class'], item['file']))
+    if opts.symbol_index:
+        symbol_index.save(opts.symbol_index)
+        print('符号索引已保存到：{0}，共{1}个类型'.format(opts.symbol_index, len(symbol_index)))
+    if fragment_cache is not None:
+        fragment_cache.close()
+        print('文档片段缓存：命中{0}个，未命中{1}个'.format(fragment_cache.hits, fragment_cache.misses))
+    if parse_cache is not None:
+        parse_cache.close()
+        print('解析缓存：命中{0}个，未命中{1}个'.format(parse_cache.hits, parse_cache.misses))
+    if failures:
+        report_failures()
+        if not opts.watch and command != 'merge':
+            print('进度日志已保留：{0}，修复后使用 --resume 只处理失败及未完成的文件'.format(doc_name + '.journal'))
     print('处理完毕，输出文件路径：{0}'.format(doc_name))
     print('等待程序退出...')
+    sys.exit(1 if failures else 0)
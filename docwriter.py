@@ -1,44 +1,115 @@
-import win32com
-from win32com.client import Dispatch, constants
+import wdconst as constants
+
+# 每个文档注册一次的样式，段落、题注及表格只需设置一次样式，无需逐项设置字体、行距、缩进等格式
+BODY_STYLE = '类型说明正文'  # 中文宋体，英文Times New Roman，小四，行距1.5，首行缩进2字符
+CAPTION_STYLE = '类型说明题注'  # 黑体，小四，居中，行距1.5
+TABLE_STYLE = '类型说明表格'  # 外边框1.5磅，表格居中，首行为表头(黑体)
+FUN_TABLE_STYLE = '函数说明表格'  # 同TABLE_STYLE，首列为表头(黑体)
 
 
 class DocWriter:
     """
     office word 写入工具类
     """
-    def __init__(self, doc_name, start_title=1):
+    def __init__(self, doc_name, start_title=1, word_app=None):
         """
         构造函数,创建word文档对象
         :param doc_name: 包含文件名称的完整路径
         :param start_title: 类型名称对应的起始标题级别
+        :param word_app: Word.Application对象，为None时启动office word，测试时可传入fakeword模拟的对象
         """
         self.doc_name = doc_name
         self.start_title = start_title
-        self.word_app = win32com.client.gencache.EnsureDispatch('Word.Application')
+        if word_app is None:
+            # 仅在创建文档时加载pywin32，未安装pywin32时其他输出方式不受影响
+            import win32com.client
+            word_app = win32com.client.gencache.EnsureDispatch('Word.Application')
+        self.word_app = word_app
         self.word_app.Visible = True
         self.word_app.DisplayAlerts = 0
         self.doc = self.word_app.Documents.Add()
+        self.paragraphs = self.doc.Paragraphs  # 段落集合只获取一次，每添加一个段落少一次跨进程调用
         self.word_app.CaptionLabels.Add('表')  # 增加一个标签
+        self._add_styles()
+        self.table_count = 0  # 已输出的表格数量，即最近一个表格题注的编号
+
+    def _add_styles(self):
+        """
+        在文档中注册正文、题注及表格样式
+        :return: 无
+        """
+        styles = self.doc.Styles
+        body = styles.Add(BODY_STYLE, constants.wdStyleTypeParagraph)
+        font = body.Font
+        font.Name = 'Times New Roman'
+        font.NameFarEast = '宋体'
+        font.Size = 12  # 小四
+        paragraph = body.ParagraphFormat
+        paragraph.LineSpacing = 1.5 * 12  # 设置行距1.5
+        paragraph.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
+
+        caption = styles.Add(CAPTION_STYLE, constants.wdStyleTypeParagraph)
+        font = caption.Font
+        font.Name = '黑体'
+        font.NameFarEast = '黑体'
+        font.Size = 12
+        paragraph = caption.ParagraphFormat
+        paragraph.LineSpacing = 1.5 * 12
+        paragraph.Alignment = constants.wdAlignParagraphCenter
 
-    def _fix_table(self):
+        for name, header in ((TABLE_STYLE, constants.wdFirstRow), (FUN_TABLE_STYLE, constants.wdFirstColumn)):
+            table_style = styles.Add(name, constants.wdStyleTypeTable)
+            font = table_style.Font
+            font.Name = 'Times New Roman'
+            font.NameFarEast = '宋体'
+            table = table_style.Table
+            table.Alignment = constants.wdAlignRowCenter
+            borders = table.Borders
+            borders.Enable = True
+            borders.OutsideLineWidth = constants.wdLineWidth150pt
+            font = table.Condition(header).Font
+            font.Name = '黑体'
+            font.NameFarEast = '黑体'
+
+    def _add_body(self, text):
+        """
+        在文档末尾添加正文段落
+        :param text: 段落文本
+        :return: 段落对象
+        """
+        pha = self.paragraphs.Add()
+        pha.Style = BODY_STYLE
+        pha.Range.InsertBefore(text)
+        return pha
+
+    def _insert_table_caption(self, table_heading_pha, title):
         """
-        将表格中的"表xx"替换为引用
+        插入表格题注，并记录表格编号
+        :param table_heading_pha: 题注所在段落
+        :param title: 表格标题
         :return: 无
         """
-        for i in range(1, self.doc.Tables.Count + 1):
-            self.doc.Tables(i).Select()
-            desc_pha = self.word_app.Selection.Previous(constants.wdParagraph, 2)  # 找到"表XX所在的段落，表格上方第2个"
-            if desc_pha:
-                desc_pha.Select()
-                if self.word_app.Selection.Find.Execute(FindText='表XX'):
-                    self.word_app.Selection.Range.InsertCrossReference(
-                        ReferenceType='表',
-                        ReferenceKind=constants.wdOnlyLabelAndNumber,
-                        ReferenceItem='{0}'.format(i),
-                        InsertAsHyperlink=True,
-                        IncludePosition=False,
-                        SeparateNumbers=False,
-                        SeparatorString=' ')
+        table_heading_pha.Range.InsertCaption("表", '', '', constants.wdCaptionPositionAbove)
+        table_heading_pha.Range.InsertBefore(title)
+        self.table_count += 1
+
+    def _insert_table_ref(self, contents_pha, offset):
+        """
+        在表格的引出段落中插入指向最近一个表格题注的交叉引用，如"Public属性如表1所示。"中的"表1"
+        题注在写入时即已编号，无需保存前再遍历全部表格查找"表XX"替换
+        :param contents_pha: 引出段落
+        :param offset: 交叉引用在段落中的插入位置(字符数)
+        :return: 无
+        """
+        pos = contents_pha.Range.Start + offset
+        self.doc.Range(pos, pos).InsertCrossReference(
+            ReferenceType='表',
+            ReferenceKind=constants.wdOnlyLabelAndNumber,
+            ReferenceItem='{0}'.format(self.table_count),
+            InsertAsHyperlink=True,
+            IncludePosition=False,
+            SeparateNumbers=False,
+            SeparatorString=' ')
 
     def _get_title_(self, title_level):
         """
@@ -63,19 +134,50 @@ class DocWriter:
             heading_style = constants.wdStyleHeading7
         return heading_style
 
-    def _set_table_border(self, table, left, top, right, bottom):
+    @staticmethod
+    def _cell_text(text):
+        """
+        转换单元格文本，制表符、段落标记用于分隔单元格及行，单元格内的换行使用手动换行符
+        :param text: 单元格文本
+        :return: 转换后的文本
+        """
+        return text.replace('\t', ' ').replace('\r\n', '\x0b').replace('\r', '\x0b').replace('\n', '\x0b')
+
+    def _add_table(self, rows, widths, style=TABLE_STYLE):
+        """
+        在文档末尾添加表格：全部单元格的内容以制表符分隔的文本一次插入，再一次转换为表格，
+        不逐个单元格设置内容，调用次数与行数无关
+        边框、字体及对齐方式由表格样式设置，只需单独设置列宽
+        :param rows: 各行单元格文本列表
+        :param widths: 各列宽度(cm)
+        :param style: 表格样式，TABLE_STYLE 首行为表头，FUN_TABLE_STYLE 首列为表头
+        :return: 表格对象
         """
-        设置表格边框线宽
-        :param left: 左边框宽度
-        :param top: 上边框宽度
-        :param right: 右边框宽度
-        :param bottom: 下边框宽度
+        table_pha = self.paragraphs.Add()
+        table_pha.Style = constants.wdStyleNormal  # 不沿用题注段落的格式，使表格样式生效
+        table_range = table_pha.Range
+        table_range.InsertBefore('\r'.join('\t'.join(self._cell_text(cell) for cell in row) for row in rows))
+        table = table_range.ConvertToTable(Separator=constants.wdSeparateByTabs, NumRows=len(rows),
+                                           NumColumns=len(widths))
+        for index, width in enumerate(widths):
+            table.Columns(index + 1).SetWidth(width * 28.35, 0)  # 1cm = 28.35磅
+        table.Style = style
+        if style == FUN_TABLE_STYLE:
+            table.ApplyStyleFirstColumn = True
+        else:
+            table.ApplyStyleHeadingRows = True
+        return table
+
+    def _finish_caption(self, table, table_heading_pha):
+        """
+        删除题注末尾的换行符，并设置表格题注的样式
+        :param table: 表格对象
+        :param table_heading_pha: 题注所在段落
         :return: 无
         """
-        table.Borders(constants.wdBorderLeft).LineWidth = left
-        table.Borders(constants.wdBorderTop).LineWidth = top
-        table.Borders(constants.wdBorderRight).LineWidth = right
-        table.Borders(constants.wdBorderBottom).LineWidth = bottom
+        ref = table.Range.Previous(constants.wdParagraph, 2)
+        ref.Find.Execute(FindText='^p', ReplaceWith=' ', Replace=constants.wdReplaceOne)
+        table_heading_pha.Style = CAPTION_STYLE
 
     def _write_type_title(self, type_name):
         """
@@ -84,7 +186,7 @@ class DocWriter:
         :return: 无
         """
         # 创建类型名称标题对应的段落
-        type_title = self.doc.Paragraphs.Add()  # 将类型名称作为标题
+        type_title = self.paragraphs.Add()  # 将类型名称作为标题
         type_title.Range.InsertBefore(type_name)
         # type_title.Range.Select()
         type_title.Style = self._get_title_(self.start_title)
@@ -96,15 +198,7 @@ class DocWriter:
         :return: 无
         """
         # 创建类型描述对应的段落
-        desc_pha = self.doc.Paragraphs.Add()  # 将类型名称作为标题
-        # desc_pha.LineSpacingRule = constants.wdLineSpaceExactly
-        desc_pha.LineSpacing = 1.5 * 12  # 设置行距1.5
-        desc_pha.Range.Font.Name = 'Times New Roman'
-        desc_pha.Range.Font.NameFarEast = '宋体'
-        desc_pha.Range.Font.Size = 12  # 小四
-
-        desc_pha.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
-        desc_pha.Range.InsertBefore(desc)
+        self._add_body(desc)
         # desc_ph.Range.Select()
         # desc_ph.Style = self._get_title_(self.start_title)
 
@@ -117,57 +211,24 @@ class DocWriter:
         :return: 无
         """
         # 输出属性标题
-        var_heading_pha = self.doc.Paragraphs.Add()
+        var_heading_pha = self.paragraphs.Add()
         var_heading_pha.Range.InsertBefore(visiable + '属性')
         # var_heading_pha.Range.Select()
         var_heading_pha.Style = self._get_title_(self.start_title + 1)
         # 输出描述
-        var_contents_pha = self.doc.Paragraphs.Add()
-        var_contents_pha.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
-        var_contents_pha.LineSpacing = 1.5 * 12  # 设置行距1.5
-        var_contents_pha.Range.Font.Size = 12  # 小四
-        var_contents_pha.Range.Font.Name = 'Times New Roman'
-        var_contents_pha.Range.Font.NameFarEast = '宋体'
         if len(var_list):
-            var_contents_pha.Range.InsertBefore(visiable + '属性如表XX所示。')
+            var_contents_pha = self._add_body(visiable + '属性如所示。')
             # 输出表题
-            table_heading_pha = self.doc.Paragraphs.Add()
-            table_heading_pha.LineSpacing = 1.5*12
-            table_heading_pha.Alignment = constants.wdAlignParagraphCenter
-            table_heading_pha.Range.InsertCaption("表", '', '', constants.wdCaptionPositionAbove)
-            table_heading_pha.Range.InsertBefore('{0}属性列表'.format(visiable))
-            table_pha = self.doc.Paragraphs.Add()
+            table_heading_pha = self.paragraphs.Add()
+            self._insert_table_caption(table_heading_pha, '{0}属性列表'.format(visiable))
             # 输出属性表格 共3列，分别为类型名称，数据类型，描述，外边框1.5磅
-            var_table = table_pha.Range.Tables.Add(table_pha.Range, len(var_list) + 1, 3)
-            var_table.Columns(1).SetWidth(4*28.35, 0)  # 1cm = 28.35磅
-            var_table.Columns(2).SetWidth(4*28.35, 0)  # 1cm = 28.35磅
-            var_table.Columns(3).SetWidth(6.5*28.35, 0)  # 1cm = 28.35磅
-            var_table.Borders.Enable = True
-            self._set_table_border(var_table, constants.wdLineWidth150pt, constants.wdLineWidth150pt,
-                                   constants.wdLineWidth150pt, constants.wdLineWidth150pt)
-            var_table.Cell(1, 1).Range.Text = '属性名称'
-            var_table.Cell(1, 2).Range.Text = '数据类型'
-            var_table.Cell(1, 3).Range.Text = '数据描述'
-            for index, var in enumerate(var_list):
-                var_table.Cell(index + 2, 1).Range.Text = var[1]
-                var_table.Cell(index + 2, 2).Range.Text = var[0]
-                var_table.Cell(index + 2, 3).Range.Text = var[2]
-            # var_table.Range.Select()
-            var_table.Range.Font.Name = '宋体'
-            var_table.Range.Font.Name = 'Times New Roman'
-            var_table.Rows(1).Range.Font.Name = '黑体'
-            var_table.Select()
-            self.word_app.Selection.Tables(1).Rows.Alignment = constants.wdAlignRowCenter
-            # 删除题注末尾的换行符
-            var_table.Select()
-            ref = self.word_app.Selection.Previous(constants.wdParagraph, 2)
-            ref.Select()
-            self.word_app.Selection.Find.Execute(FindText='^p', ReplaceWith=' ', Replace=constants.wdReplaceOne)
-            # 设置表格题注的字体
-            table_heading_pha.Range.Font.Size = 12
-            table_heading_pha.Range.Font.Name = '黑体'
+            rows = [['属性名称', '数据类型', '数据描述']] + [[var[1], var[0], var[2]] for var in var_list]
+            var_table = self._add_table(rows, [4, 4, 6.5])
+            self._finish_caption(var_table, table_heading_pha)
+            # 在"表"所在位置插入引用
+            self._insert_table_ref(var_contents_pha, len(visiable + '属性如'))
         else:
-            var_contents_pha.Range.InsertBefore('无。')
+            self._add_body('无。')
 
 
     def _write_fun_list(self, fun_list, visiable):
@@ -178,7 +239,7 @@ class DocWriter:
         :return: 无
         """
         # 输出成员函数标题
-        fun_pha = self.doc.Paragraphs.Add()
+        fun_pha = self.paragraphs.Add()
         fun_pha.Range.InsertBefore(visiable + '方法')
         # fun_pha.Range.Select()
         fun_pha.Style = self._get_title_(self.start_title + 1)
@@ -186,66 +247,27 @@ class DocWriter:
             for index, fun in enumerate(fun_list):
                 # 函数名作为标题
                 fun_name = fun[1].split(' ')[0]
-                fun_heading_pha = self.doc.Paragraphs.Add()
+                fun_heading_pha = self.paragraphs.Add()
                 fun_heading_pha.Range.InsertBefore(fun_name + '方法')
                 fun_heading_pha.Style = self._get_title_(self.start_title + 2)
                 # 输出描述
-                fun_contents_pha = self.doc.Paragraphs.Add()
-                fun_contents_pha.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
-                fun_contents_pha.LineSpacing = 1.5 * 12  # 设置行距1.5
-                fun_contents_pha.Range.Font.Size = 12  # 小四
-                fun_contents_pha.Range.Font.Name = 'Times New Roman'
-                fun_contents_pha.Range.Font.NameFarEast = '宋体'
-                fun_contents_pha.Range.InsertBefore(fun_name + '方法说明如表XX所示。')
+                fun_contents_pha = self._add_body(fun_name + '方法说明如所示。')
                 # 输出表题
-                table_heading_pha = self.doc.Paragraphs.Add()
-                table_heading_pha.LineSpacing = 1.5 * 12
-                table_heading_pha.Alignment = constants.wdAlignParagraphCenter
-                table_heading_pha.Range.InsertCaption("表", '', '', constants.wdCaptionPositionAbove)
-                table_heading_pha.Range.InsertBefore('{0}方法'.format(fun_name))
-                table_pha = self.doc.Paragraphs.Add()
-                # 输出属性表格 4行，2列，分别为函数原型，函数描述，参数说明，返回值，流程图，外边框1.5磅
-                fun_table = table_pha.Range.Tables.Add(table_pha.Range, 5, 2)
-                fun_table.Borders.Enable = True
-                self._set_table_border(fun_table, constants.wdLineWidth150pt, constants.wdLineWidth150pt,
-                                       constants.wdLineWidth150pt, constants.wdLineWidth150pt)
-                fun_table.Columns(1).SetWidth(3*28.35, 0)  # 1cm = 28.35磅
-                fun_table.Columns(2).SetWidth(12*28.35, 0)  # 1cm = 28.35磅
-                fun_table.Cell(1, 1).Range.Text = '函数原型'
-                fun_table.Cell(2, 1).Range.Text = '函数描述'
-                fun_table.Cell(3, 1).Range.Text = '参数说明'
-                fun_table.Cell(4, 1).Range.Text = '返 回 值'
-                fun_table.Cell(5, 1).Range.Text = '流 程 图'
+                table_heading_pha = self.paragraphs.Add()
+                self._insert_table_caption(table_heading_pha, '{0}方法'.format(fun_name))
+                # 输出属性表格 5行，2列，分别为函数原型，函数描述，参数说明，返回值，流程图，外边框1.5磅
                 template_desc = fun[5] + '\n' if fun[5] else ''
-                fun_table.Cell(1, 2).Range.Text = template_desc + ((fun[0] + ' ' + fun[1]) if len(fun[0]) else fun[1])  # 函数声明
-                fun_table.Cell(2, 2).Range.Text = fun[2]  # 函数描述
-                fun_table.Cell(3, 2).Range.Text = '\n'.join(fun[3]) if len(fun[3]) else '无'  # 参数说明
-                fun_table.Cell(4, 2).Range.Text = fun[4] if len(fun[4]) else '无'  # 返回值说明
-                fun_table.Cell(5, 2).Range.Text = '无'  # 流程图
-                fun_table.Range.Font.Name = '宋体'
-                fun_table.Range.Font.Name = 'Times New Roman'
-                fun_table.Cell(1, 1).Range.Font.Name = '黑体'
-                fun_table.Cell(2, 1).Range.Font.Name = '黑体'
-                fun_table.Cell(3, 1).Range.Font.Name = '黑体'
-                fun_table.Cell(4, 1).Range.Font.Name = '黑体'
-                fun_table.Cell(5, 1).Range.Font.Name = '黑体'
-                fun_table.Select()
-                self.word_app.Selection.Tables(1).Rows.Alignment = constants.wdAlignRowCenter
-                # 删除题注末尾的换行符
-                fun_table.Select()
-                ref = self.word_app.Selection.Previous(constants.wdParagraph, 2)
-                ref.Select()
-                self.word_app.Selection.Find.Execute(FindText='^p', ReplaceWith=' ', Replace=constants.wdReplaceOne)
-                # 设置表格题注字体
-                table_heading_pha.Range.Font.Size = 12
-                table_heading_pha.Range.Font.Name = '黑体'
+                rows = [['函数原型', template_desc + ((fun[0] + ' ' + fun[1]) if len(fun[0]) else fun[1])],  # 函数声明
+                        ['函数描述', fun[2]],
+                        ['参数说明', '\n'.join(fun[3]) if len(fun[3]) else '无'],
+                        ['返 回 值', fun[4] if len(fun[4]) else '无'],
+                        ['流 程 图', '无']]
+                fun_table = self._add_table(rows, [3, 12], FUN_TABLE_STYLE)
+                self._finish_caption(fun_table, table_heading_pha)
+                # 在"表"所在位置插入引用
+                self._insert_table_ref(fun_contents_pha, len(fun_name + '方法说明如'))
         else:
-            no_fun_pha = self.doc.Paragraphs.Add()
-            no_fun_pha.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
-            no_fun_pha.LineSpacing = 1.5 * 12  # 设置行距1.5
-            no_fun_pha.Range.Font.Size = 12  # 小四
-            no_fun_pha.Range.Font.Name = '宋体'
-            no_fun_pha.Range.InsertBefore('无。')
+            self._add_body('无。')
 
     def _write_typedefs(self, typedef_list):
         """
@@ -254,62 +276,25 @@ class DocWriter:
         :return: 无
         """
         # 输出类型重定义标题
-        typedef_pha = self.doc.Paragraphs.Add()
+        typedef_pha = self.paragraphs.Add()
         typedef_pha.Range.InsertBefore('类型重定义')
         # fun_pha.Range.Select()
         typedef_pha.Style = self._get_title_(self.start_title + 1)
         if len(typedef_list):
             # 输出描述
-            typedef_contents_pha = self.doc.Paragraphs.Add()
-            typedef_contents_pha.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
-            typedef_contents_pha.LineSpacing = 1.5 * 12  # 设置行距1.5
-            typedef_contents_pha.Range.Font.Size = 12  # 小四
-            typedef_contents_pha.Range.Font.Name = 'Times New Roman'
-            typedef_contents_pha.Range.Font.NameFarEast = '宋体'
-            typedef_contents_pha.Range.InsertBefore('类型重定义如表XX所示。')
+            typedef_contents_pha = self._add_body('类型重定义如所示。')
             # 输出标题
-            table_heading_pha = self.doc.Paragraphs.Add()
-            table_heading_pha.LineSpacing = 1.5 * 12
-            table_heading_pha.Alignment = constants.wdAlignParagraphCenter
-            table_heading_pha.Range.InsertCaption("表", '', '', constants.wdCaptionPositionAbove)
-            table_heading_pha.Range.InsertBefore('数据类型重定义说明')
-            table_pha = self.doc.Paragraphs.Add()
+            table_heading_pha = self.paragraphs.Add()
+            self._insert_table_caption(table_heading_pha, '数据类型重定义说明')
             # 输出属性表格 多行，2列，分别为重定义描述/重定义说明，外边框1.5磅
-            typedef_table = table_pha.Range.Tables.Add(table_pha.Range, len(typedef_list) + 1, 2)
-            typedef_table.Borders.Enable = True
-            self._set_table_border(typedef_table, constants.wdLineWidth150pt, constants.wdLineWidth150pt,
-                                   constants.wdLineWidth150pt, constants.wdLineWidth150pt)
-            typedef_table.Columns(1).SetWidth(10 * 28.35, 0)  # 1cm = 28.35磅
-            typedef_table.Columns(2).SetWidth(5 * 28.35, 0)  # 1cm = 28.35磅
-            typedef_table.Cell(1, 1).Range.Text = '类型定义'
-            typedef_table.Cell(1, 2).Range.Text = '类型描述'
-            # 填充表格内容
-            for index, type_item in enumerate(typedef_list):
-                typedef_table.Cell(index + 2, 1).Range.Text = type_item[0]
-                typedef_table.Cell(index + 2, 2).Range.Text = type_item[1] if len(type_item[1]) else '无'
-            # 设置表格字体，中文，英文，表头
-            typedef_table.Range.Font.Name = '宋体'
-            typedef_table.Range.Font.Name = 'Times New Roman'
-            typedef_table.Cell(1, 1).Range.Font.Name = '黑体'
-            typedef_table.Cell(1, 2).Range.Font.Name = '黑体'
-            typedef_table.Select()
-            self.word_app.Selection.Tables(1).Rows.Alignment = constants.wdAlignRowCenter
-            # 删除题注末尾的换行符
-            typedef_table.Select()
-            ref = self.word_app.Selection.Previous(constants.wdParagraph, 2)
-            ref.Select()
-            self.word_app.Selection.Find.Execute(FindText='^p', ReplaceWith=' ', Replace=constants.wdReplaceOne)
-
-            # 设置表格题注字体
-            table_heading_pha.Range.Font.Size = 12
-            table_heading_pha.Range.Font.Name = '黑体'
+            rows = [['类型定义', '类型描述']]
+            rows += [[type_item[0], type_item[1] if len(type_item[1]) else '无'] for type_item in typedef_list]
+            typedef_table = self._add_table(rows, [10, 5])
+            self._finish_caption(typedef_table, table_heading_pha)
+            # 在"表"所在位置插入引用
+            self._insert_table_ref(typedef_contents_pha, len('类型重定义如'))
         else:
-            no_def_pha = self.doc.Paragraphs.Add()
-            no_def_pha.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
-            no_def_pha.LineSpacing = 1.5 * 12  # 设置行距1.5
-            no_def_pha.Range.Font.Size = 12  # 小四
-            no_def_pha.Range.Font.Name = '宋体'
-            no_def_pha.Range.InsertBefore('无。')
+            self._add_body('无。')
 
     def _write_enums(self, enum_list):
         """
@@ -318,60 +303,24 @@ class DocWriter:
         :return: 无
         """
         # 输出枚举标题
-        enum_pha = self.doc.Paragraphs.Add()
+        enum_pha = self.paragraphs.Add()
         enum_pha.Range.InsertBefore('枚举值定义')
         enum_pha.Style = self._get_title_(self.start_title + 1)
         if len(enum_list):
             # 输出描述
-            enum_contents_pha = self.doc.Paragraphs.Add()
-            enum_contents_pha.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
-            enum_contents_pha.LineSpacing = 1.5 * 12  # 设置行距1.5
-            enum_contents_pha.Range.Font.Size = 12  # 小四
-            enum_contents_pha.Range.Font.Name = 'Times New Roman'
-            enum_contents_pha.Range.Font.NameFarEast = '宋体'
-            enum_contents_pha.Range.InsertBefore('枚举值定义如表XX所示。')
+            enum_contents_pha = self._add_body('枚举值定义如所示。')
             # 输出标题
-            table_heading_pha = self.doc.Paragraphs.Add()
-            table_heading_pha.LineSpacing = 1.5 * 12
-            table_heading_pha.Alignment = constants.wdAlignParagraphCenter
-            table_heading_pha.Range.InsertCaption("表", '', '', constants.wdCaptionPositionAbove)
-            table_heading_pha.Range.InsertBefore('枚举值定义说明')
-            table_pha = self.doc.Paragraphs.Add()
+            table_heading_pha = self.paragraphs.Add()
+            self._insert_table_caption(table_heading_pha, '枚举值定义说明')
             # 输出属性表格 多行，2列，分别为枚举值/枚举值说明，外边框1.5磅
-            enum_table = table_pha.Range.Tables.Add(table_pha.Range, len(enum_list) + 1, 2)
-            enum_table.Borders.Enable = True
-            self._set_table_border(enum_table, constants.wdLineWidth150pt, constants.wdLineWidth150pt,
-                                   constants.wdLineWidth150pt, constants.wdLineWidth150pt)
-            enum_table.Columns(1).SetWidth(5 * 28.35, 0)  # 1cm = 28.35磅
-            enum_table.Columns(2).SetWidth(10 * 28.35, 0)  # 1cm = 28.35磅
-            enum_table.Cell(1, 1).Range.Text = '枚举值'
-            enum_table.Cell(1, 2).Range.Text = '说明'
-            # 填充表格内容
-            for index, type_item in enumerate(enum_list):
-                enum_table.Cell(index + 2, 1).Range.Text = type_item[0]
-                enum_table.Cell(index + 2, 2).Range.Text = type_item[1] if len(type_item[1]) else '无'
-            # 设置表格字体，中文，英文，表头
-            enum_table.Range.Font.Name = '宋体'
-            enum_table.Range.Font.Name = 'Times New Roman'
-            enum_table.Cell(1, 1).Range.Font.Name = '黑体'
-            enum_table.Cell(1, 2).Range.Font.Name = '黑体'
-            enum_table.Select()
-            self.word_app.Selection.Tables(1).Rows.Alignment = constants.wdAlignRowCenter
-            # 删除题注末尾的换行符
-            enum_table.Select()
-            ref = self.word_app.Selection.Previous(constants.wdParagraph, 2)
-            ref.Select()
-            self.word_app.Selection.Find.Execute(FindText='^p', ReplaceWith=' ', Replace=constants.wdReplaceOne)
-            # 设置表格题注字体
-            table_heading_pha.Range.Font.Size = 12
-            table_heading_pha.Range.Font.Name = '黑体'
+            rows = [['枚举值', '说明']]
+            rows += [[type_item[0], type_item[1] if len(type_item[1]) else '无'] for type_item in enum_list]
+            enum_table = self._add_table(rows, [5, 10])
+            self._finish_caption(enum_table, table_heading_pha)
+            # 在"表"所在位置插入引用
+            self._insert_table_ref(enum_contents_pha, len('枚举值定义如'))
         else:
-            no_def_pha = self.doc.Paragraphs.Add()
-            no_def_pha.CharacterUnitFirstLineIndent = 2  # 首行缩进2字符
-            no_def_pha.LineSpacing = 1.5 * 12  # 设置行距1.5
-            no_def_pha.Range.Font.Size = 12  # 小四
-            no_def_pha.Range.Font.Name = '宋体'
-            no_def_pha.Range.InsertBefore('无。')
+            self._add_body('无。')
 
 
     def write(self, data_type):
@@ -413,10 +362,9 @@ class DocWriter:
 
     def save(self):
         """
-        保存并关闭文件
+        保存并关闭文件，表格的交叉引用已在写入时插入
         :return: 无
         """
-        self._fix_table()
         self.doc.SaveAs(self.doc_name)
         self.doc.Close()
 
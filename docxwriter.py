@@ -0,0 +1,497 @@
+import hashlib
+import pickle
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+
+# 1cm = 567 twips（1磅 = 20 twips）
+CM = 567
+
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+# XML 1.0 不允许出现的控制字符
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# 渲染版本，生成的xml片段发生变化时需递增，使已缓存的片段失效
+RENDER_VERSION = 1
+
+# 类型片段中的表格编号占位符，写入文档时替换为全文档范围内的编号；文本中的同一字符在转义时会被替换为字符引用
+_NUMBER_MARK = '\ue000'
+_NUMBER_PLACEHOLDER = re.compile('\ue000(\\d+)\ue000')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/word/settings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+    '</Types>')
+
+_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>')
+
+_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" '
+    'Target="settings.xml"/>'
+    '{0}'
+    '</Relationships>')
+
+_HYPERLINK_REL = (
+    '<Relationship Id="{0}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink" '
+    'Target="{1}" TargetMode="External"/>')
+
+_SETTINGS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:settings xmlns:w="{0}"><w:defaultTabStop w:val="420"/></w:settings>'.format(_W_NS))
+
+
+def _styles_xml():
+    """
+    生成styles.xml，包含正文及1~7级标题样式
+    :return: styles.xml 的内容
+    """
+    headings = []
+    for level in range(1, 8):
+        headings.append(
+            '<w:style w:type="paragraph" w:styleId="Heading{0}">'
+            '<w:name w:val="heading {0}"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:qFormat/>'
+            '<w:pPr><w:keepNext/><w:keepLines/><w:spacing w:before="260" w:after="260"/>'
+            '<w:outlineLvl w:val="{1}"/></w:pPr>'
+            '<w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:eastAsia="黑体"/>'
+            '<w:b/><w:sz w:val="{2}"/></w:rPr></w:style>'.format(level, level - 1, max(24, 36 - 2 * level)))
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:styles xmlns:w="{0}">'
+        '<w:docDefaults><w:rPrDefault><w:rPr>'
+        '<w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:eastAsia="宋体" w:cs="Times New Roman"/>'
+        '<w:sz w:val="21"/><w:szCs w:val="21"/><w:lang w:val="en-US" w:eastAsia="zh-CN"/>'
+        '</w:rPr></w:rPrDefault><w:pPrDefault/></w:docDefaults>'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/>'
+        '<w:pPr><w:widowControl w:val="0"/><w:jc w:val="both"/></w:pPr></w:style>'
+        '{1}'
+        '<w:style w:type="paragraph" w:styleId="Caption"><w:name w:val="caption"/>'
+        '<w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:qFormat/></w:style>'
+        '<w:style w:type="character" w:styleId="Hyperlink"><w:name w:val="Hyperlink"/>'
+        '<w:rPr><w:color w:val="0000FF"/><w:u w:val="single"/></w:rPr></w:style>'
+        '<w:style w:type="table" w:default="1" w:styleId="TableNormal"><w:name w:val="Normal Table"/>'
+        '<w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblCellMar>'
+        '<w:left w:w="108" w:type="dxa"/><w:right w:w="108" w:type="dxa"/>'
+        '</w:tblCellMar></w:tblPr></w:style>'
+        '</w:styles>').format(_W_NS, ''.join(headings))
+
+
+def _text(text):
+    """
+    对写入文档的文本进行转义
+    :param text: 原始文本
+    :return: 可直接写入xml的文本
+    """
+    return escape(_INVALID_XML_CHARS.sub('', text)).replace(_NUMBER_MARK, '&#xe000;')
+
+
+def _number(n):
+    """
+    生成类型片段内第n个表格的编号占位符
+    :param n: 表格在类型片段内的序号，从1开始
+    :return: 占位符
+    """
+    return '{0}{1}{0}'.format(_NUMBER_MARK, n)
+
+
+def _run(text, font=None, size=None, escaped=False, style=None):
+    """
+    生成文本块(w:r)
+    :param text: 文本内容
+    :param escaped: text是否已经转义(包含编号占位符的文本不能再次转义)
+    :param font: 中英文字体，为None时使用默认字体(Times New Roman/宋体)
+    :param size: 字号(磅)，为None时使用默认字号
+    :param style: 字符样式ID，如Hyperlink
+    :return: w:r 元素
+    """
+    rpr = ''
+    if style:
+        rpr += '<w:rStyle w:val="{0}"/>'.format(style)
+    if font:
+        rpr += '<w:rFonts w:ascii="{0}" w:hAnsi="{0}" w:eastAsia="{0}"/>'.format(font)
+    if size:
+        rpr += '<w:sz w:val="{0}"/><w:szCs w:val="{0}"/>'.format(int(size * 2))
+    if rpr:
+        rpr = '<w:rPr>' + rpr + '</w:rPr>'
+    return '<w:r>{0}<w:t xml:space="preserve">{1}</w:t></w:r>'.format(rpr, text if escaped else _text(text))
+
+
+def _class_bookmark(class_name):
+    """
+    获取类型标题的书签，Word书签名称最长40个字符，以下划线开头的书签为隐藏书签
+    :param class_name: 类型完整名称
+    :return: 书签id及书签名称组成的二元组，书签id与表格题注书签(表格编号)不冲突
+    """
+    digest = hashlib.sha1(class_name.encode('utf-8')).hexdigest()
+    return 100000000 + int(digest[:7], 16), '_Class_' + digest[:24]
+
+
+def _field(instr, result, font=None, size=None):
+    """
+    生成域(题注编号、交叉引用)，result为域的缓存结果，Word打开后无需更新域即可正确显示
+    :param instr: 域代码，不进行转义
+    :param result: 域结果，不进行转义
+    :return: 域对应的若干w:r 元素
+    """
+    return ('<w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+            '<w:r><w:instrText xml:space="preserve"> {0} </w:instrText></w:r>'
+            '<w:r><w:fldChar w:fldCharType="separate"/></w:r>'
+            '{1}'
+            '<w:r><w:fldChar w:fldCharType="end"/></w:r>').format(instr, _run(result, font, size, escaped=True))
+
+
+class DocxWriter:
+    """
+    office word(.docx) 写入工具类，直接生成OOXML，无需安装office
+    与DocWriter具有相同的write/save接口，每个类型写入后立即压缩输出，内存占用不随类型数量增长
+    每个类型渲染为表格编号可重定位的xml片段，可通过fragment_cache缓存，类型信息未变化时直接拼接缓存的片段
+    """
+    def __init__(self, doc_name, start_title=1, fragment_cache=None, symbol_index=None):
+        """
+        构造函数,创建docx文档
+        :param doc_name: 包含文件名称的完整路径
+        :param start_title: 类型名称对应的起始标题级别
+        :param fragment_cache: 类型片段缓存FragmentCache对象，为None时不使用缓存
+        :param symbol_index: 符号索引SymbolIndex对象，指定时类型标题添加书签，
+                             成员变量的数据类型及函数原型中的工程内类型链接到该类型的标题
+        """
+        self.doc_name = doc_name
+        self.start_title = start_title
+        self.fragment_cache = fragment_cache
+        self.symbol_index = symbol_index
+        self._scope = ''  # 正在渲染的类型的完整名称，用于查找成员中引用的类型
+        self.table_count = 0  # 已输出的表格数量，用于题注编号
+        self._fragment_tables = 0  # 正在渲染的类型片段中的表格数量
+        self._links = []  # 文档中超链接的目标地址，依次对应关系rId3、rId4...
+        self.zip_file = zipfile.ZipFile(doc_name, 'w', zipfile.ZIP_DEFLATED)
+        self.body = self.zip_file.open('word/document.xml', 'w')
+        self.body.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                         '<w:document xmlns:w="{0}" xmlns:r="{1}"><w:body>'.format(_W_NS, _R_NS)).encode('utf-8'))
+
+    def _get_title_(self, title_level):
+        """
+        获取标题样式
+        :param title_level: 标题级别
+        :return: 标题样式ID
+        """
+        if title_level not in range(1, 8):
+            title_level = 1
+        return 'Heading{0}'.format(title_level)
+
+    def _heading(self, text, title_level, bookmark=None):
+        """
+        生成标题段落
+        :param text: 标题文本
+        :param title_level: 标题级别
+        :param bookmark: 标题的书签id及书签名称，为None时不添加书签
+        :return: w:p 元素
+        """
+        runs = _run(text)
+        if bookmark is not None:
+            runs = '<w:bookmarkStart w:id="{0}" w:name="{1}"/>{2}<w:bookmarkEnd w:id="{0}"/>'.format(
+                bookmark[0], bookmark[1], runs)
+        return '<w:p><w:pPr><w:pStyle w:val="{0}"/></w:pPr>{1}</w:p>'.format(self._get_title_(title_level), runs)
+
+    def _linked_runs(self, text, font=None):
+        """
+        生成类型文本的文本块，其中的工程内类型链接到该类型的标题
+        :param text: 类型文本，如数据类型或函数原型
+        :param font: 字体
+        :return: 若干w:r、w:hyperlink 元素
+        """
+        if self.symbol_index is None:
+            return _run(text, font)
+        runs = []
+        for segment, target in self.symbol_index.split_links(text, self._scope):
+            if target is None:
+                runs.append(_run(segment, font))
+            else:
+                runs.append('<w:hyperlink w:anchor="{0}" w:history="1">{1}</w:hyperlink>'.format(
+                    _class_bookmark(target)[1], _run(segment, font, style='Hyperlink')))
+        return ''.join(runs)
+
+    def _content(self, text, font=None):
+        """
+        生成正文段落，首行缩进2字符，1.5倍行距，小四
+        :param text: 段落文本，或已生成的文本块(w:r)列表
+        :param font: 字体，为None时中文宋体，英文Times New Roman
+        :return: w:p 元素
+        """
+        runs = _run(text, font, 12) if isinstance(text, str) else ''.join(text)
+        return ('<w:p><w:pPr><w:spacing w:line="360" w:lineRule="auto"/>'
+                '<w:ind w:firstLineChars="200" w:firstLine="480"/></w:pPr>{0}</w:p>').format(runs)
+
+    def _hyperlink(self, text, target, size=None):
+        """
+        生成指向外部文件或网址的超链接
+        :param text: 超链接文本
+        :param target: 超链接目标，如另一个文档的相对路径
+        :param size: 字号(磅)，为None时使用默认字号
+        :return: w:hyperlink 元素
+        """
+        self._links.append(target)
+        return '<w:hyperlink r:id="rId{0}" w:history="1">{1}</w:hyperlink>'.format(
+            len(self._links) + 2, _run(text, size=size, style='Hyperlink'))
+
+    def _none(self):
+        """
+        生成内容为"无。"的段落
+        :return: w:p 元素
+        """
+        return self._content('无。', font='宋体')
+
+    def _table_lead(self, prefix, suffix='所示。'):
+        """
+        生成表格的引出段落，如"Public属性如表1所示。"，其中"表1"为指向下一个表格题注的交叉引用
+        :param prefix: 引用前的文本
+        :param suffix: 引用后的文本
+        :return: w:p 元素
+        """
+        number = _number(self._fragment_tables + 1)
+        ref = _field('REF _Ref_Table{0} \\h'.format(number), '表 {0}'.format(number), size=12)
+        return self._content([_run(prefix, size=12), ref, _run(suffix, size=12)])
+
+    def _caption(self, title):
+        """
+        生成表格题注，格式为"表 n 标题"，编号使用SEQ域并添加书签供引出段落引用
+        :param title: 表格标题
+        :return: w:p 元素
+        """
+        self._fragment_tables += 1
+        number = _number(self._fragment_tables)
+        return ('<w:p><w:pPr><w:pStyle w:val="Caption"/><w:keepNext/><w:spacing w:line="360" w:lineRule="auto"/>'
+                '<w:jc w:val="center"/></w:pPr>'
+                '<w:bookmarkStart w:id="{0}" w:name="_Ref_Table{0}"/>{1}{2}<w:bookmarkEnd w:id="{0}"/>'
+                '{3}</w:p>').format(number, _run('表 ', '黑体', 12),
+                                    _field('SEQ 表 \\* ARABIC', number, '黑体', 12),
+                                    _run(' ' + title, '黑体', 12))
+
+    def _table(self, widths, rows, header_row=True, header_col=False, linked=()):
+        """
+        生成表格，外边框1.5磅，内边框0.5磅，表格居中
+        :param widths: 各列宽度(cm)
+        :param rows: 行列表，每行为单元格文本的列表
+        :param header_row: 第一行是否为表头(黑体)
+        :param header_col: 第一列是否为表头(黑体)
+        :param linked: 内容为类型文本的单元格(行号, 列号)集合，其中的工程内类型链接到该类型的标题
+        :return: w:tbl 元素，以及表格后的空段落
+        """
+        outer = 'w:val="single" w:sz="12" w:space="0" w:color="auto"'
+        inner = 'w:val="single" w:sz="4" w:space="0" w:color="auto"'
+        xml = ['<w:tbl><w:tblPr><w:tblW w:w="0" w:type="auto"/><w:jc w:val="center"/><w:tblBorders>'
+               '<w:top {0}/><w:left {0}/><w:bottom {0}/><w:right {0}/>'
+               '<w:insideH {1}/><w:insideV {1}/></w:tblBorders>'
+               '<w:tblLayout w:type="fixed"/></w:tblPr><w:tblGrid>'.format(outer, inner)]
+        for width in widths:
+            xml.append('<w:gridCol w:w="{0}"/>'.format(int(width * CM)))
+        xml.append('</w:tblGrid>')
+        for r, row in enumerate(rows):
+            xml.append('<w:tr>')
+            for c, cell in enumerate(row):
+                font = '黑体' if (header_row and r == 0) or (header_col and c == 0) else None
+                xml.append('<w:tc><w:tcPr><w:tcW w:w="{0}" w:type="dxa"/></w:tcPr>'.format(int(widths[c] * CM)))
+                for line in cell.split('\n'):
+                    runs = self._linked_runs(line, font) if (r, c) in linked else _run(line, font)
+                    xml.append('<w:p>{0}</w:p>'.format(runs))
+                xml.append('</w:tc>')
+            xml.append('</w:tr>')
+        xml.append('</w:tbl><w:p/>')
+        return ''.join(xml)
+
+    def _write_type_title(self, type_name):
+        """
+        写入类型名称标题
+        :param type_name: 类型名称
+        :return: xml片段
+        """
+        bookmark = _class_bookmark(type_name) if self.symbol_index is not None else None
+        return self._heading(type_name, self.start_title, bookmark)
+
+    def _write_type_desc(self, desc):
+        """
+        写入类型描述
+        :param desc: 类型描述
+        :return: xml片段
+        """
+        return self._content(desc)
+
+    def _write_var_list(self, type_name, var_list, visiable):
+        """
+        写入类型的成员变量
+        :param type_name: 类型名称
+        :param var_list: 成员变量列表
+        :param visiable: 成员变量列表中成员的可见性
+        :return: xml片段
+        """
+        xml = [self._heading(visiable + '属性', self.start_title + 1)]
+        if len(var_list):
+            xml.append(self._table_lead(visiable + '属性如'))
+            xml.append(self._caption('{0}属性列表'.format(visiable)))
+            rows = [['属性名称', '数据类型', '数据描述']]
+            rows += [[var[1], var[0], var[2]] for var in var_list]
+            xml.append(self._table([4, 4, 6.5], rows, linked={(r, 1) for r in range(1, len(rows))}))
+        else:
+            xml.append(self._content('无。'))
+        return ''.join(xml)
+
+    def _write_fun_list(self, fun_list, visiable):
+        """
+        写入类型的成员函数
+        :param fun_list: 成员函数列表
+        :param visiable: 成员变量列表中成员的可见性
+        :return: xml片段
+        """
+        xml = [self._heading(visiable + '方法', self.start_title + 1)]
+        if len(fun_list):
+            for fun in fun_list:
+                # 函数名作为标题
+                fun_name = fun[1].split(' ')[0]
+                xml.append(self._heading(fun_name + '方法', self.start_title + 2))
+                xml.append(self._table_lead(fun_name + '方法说明如'))
+                xml.append(self._caption('{0}方法'.format(fun_name)))
+                template_desc = fun[5] + '\n' if fun[5] else ''
+                rows = [['函数原型', template_desc + ((fun[0] + ' ' + fun[1]) if len(fun[0]) else fun[1])],
+                        ['函数描述', fun[2]],
+                        ['参数说明', '\n'.join(fun[3]) if len(fun[3]) else '无'],
+                        ['返 回 值', fun[4] if len(fun[4]) else '无'],
+                        ['流 程 图', '无']]
+                xml.append(self._table([3, 12], rows, header_row=False, header_col=True, linked={(0, 1)}))
+        else:
+            xml.append(self._none())
+        return ''.join(xml)
+
+    def _write_typedefs(self, typedef_list):
+        """
+        写入类型内部的重定义类型列表
+        :param typedef_list:重定义类型列表
+        :return: xml片段
+        """
+        xml = [self._heading('类型重定义', self.start_title + 1)]
+        if len(typedef_list):
+            xml.append(self._table_lead('类型重定义如'))
+            xml.append(self._caption('数据类型重定义说明'))
+            rows = [['类型定义', '类型描述']]
+            rows += [[item[0], item[1] if len(item[1]) else '无'] for item in typedef_list]
+            xml.append(self._table([10, 5], rows))
+        else:
+            xml.append(self._none())
+        return ''.join(xml)
+
+    def _write_enums(self, enum_list):
+        """
+        写入类型内部的枚举值列表
+        :param enum_list:枚举类型类型列表
+        :return: xml片段
+        """
+        xml = [self._heading('枚举值定义', self.start_title + 1)]
+        if len(enum_list):
+            xml.append(self._table_lead('枚举值定义如'))
+            xml.append(self._caption('枚举值定义说明'))
+            rows = [['枚举值', '说明']]
+            rows += [[item[0], item[1] if len(item[1]) else '无'] for item in enum_list]
+            xml.append(self._table([5, 10], rows))
+        else:
+            xml.append(self._none())
+        return ''.join(xml)
+
+    def _fingerprint(self, data_type):
+        """
+        计算类型片段的缓存键，由类型信息、起始标题级别和渲染版本共同决定
+        :param data_type: 数据类型信息
+        :return: 缓存键
+        """
+        links = None
+        if self.symbol_index is not None:
+            # 片段中的链接取决于成员引用的类型是否在索引中
+            texts = [var.type for var_list in (data_type.public_var_list, data_type.protected_var_list,
+                                               data_type.private_var_list) for var in var_list]
+            texts += [' '.join((fun.template, fun.type, fun.name)) for fun_list in (
+                data_type.public_fun_list, data_type.protected_fun_list, data_type.private_fun_list)
+                for fun in fun_list]
+            links = sorted({target for text in texts
+                            for segment, target in self.symbol_index.split_links(text, data_type.name) if target})
+        data = pickle.dumps((RENDER_VERSION, self.start_title, data_type, links), pickle.HIGHEST_PROTOCOL)
+        return hashlib.sha1(data).hexdigest()
+
+    def _render(self, data_type):
+        """
+        将数据类型信息渲染为xml片段，片段中的表格编号为占位符
+        :param data_type: 数据类型信息
+        :return: xml片段及其中的表格数量组成的二元组
+        """
+        self._fragment_tables = 0
+        self._scope = data_type.name
+        xml = [self._write_type_title(data_type.name),
+               self._write_type_desc(data_type.desc + '。'),
+               self._write_typedefs(data_type.typedef_list),
+               self._write_enums(data_type.enum_list),
+               self._write_var_list(data_type.name, data_type.public_var_list, 'Public'),
+               self._write_var_list(data_type.name, data_type.protected_var_list, 'Protected'),
+               self._write_var_list(data_type.name, data_type.private_var_list, 'Private'),
+               self._write_fun_list(data_type.public_fun_list, 'Public'),
+               self._write_fun_list(data_type.protected_fun_list, 'Protected'),
+               self._write_fun_list(data_type.private_fun_list, 'Private')]
+        return ''.join(xml), self._fragment_tables
+
+    def write(self, data_type):
+        """
+        将data_type表示的数据类型信息写入文档
+        :param data_type: 数据类型信息
+        :return: 无
+        """
+        fragment = None
+        if self.fragment_cache is not None:
+            key = self._fingerprint(data_type)
+            fragment = self.fragment_cache.get(key)
+        if fragment is None:
+            fragment = self._render(data_type)
+            if self.fragment_cache is not None:
+                self.fragment_cache.put(key, fragment)
+        xml, table_count = fragment
+        # 将片段内的表格编号替换为全文档范围内的编号
+        base = self.table_count
+        xml = _NUMBER_PLACEHOLDER.sub(lambda m: str(base + int(m.group(1))), xml)
+        self.table_count += table_count
+        self.body.write(xml.encode('utf-8'))
+
+    def save(self):
+        """
+        保存并关闭文件
+        :return: 无
+        """
+        self.body.write(('<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+                         '<w:pgMar w:top="1440" w:right="1800" w:bottom="1440" w:left="1800" '
+                         'w:header="851" w:footer="992" w:gutter="0"/></w:sectPr>'
+                         '</w:body></w:document>').encode('utf-8'))
+        self.body.close()
+        self.zip_file.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        self.zip_file.writestr('_rels/.rels', _PACKAGE_RELS)
+        links = ''.join(_HYPERLINK_REL.format('rId{0}'.format(n + 3), escape(target, {'"': '&quot;'}))
+                        for n, target in enumerate(self._links))
+        self.zip_file.writestr('word/_rels/document.xml.rels', _DOCUMENT_RELS.format(links))
+        self.zip_file.writestr('word/styles.xml', _styles_xml())
+        self.zip_file.writestr('word/settings.xml', _SETTINGS)
+        self.zip_file.close()
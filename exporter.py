@@ -0,0 +1,123 @@
+import json
+import os
+import sqlite3
+
+# 导出格式版本，jsonl每行的version字段及sqlite数据库的user_version，2 增加了基类(bases)
+EXPORT_VERSION = 2
+
+
+def iter_members(data_type):
+    """
+    将数据类型的各类成员展开为统一格式的字典
+    :param data_type: 数据类型信息
+    :return: 产生成员字典的生成器，字典包含kind(var/fun/typedef/enum)、visibility、type、name、signature、
+             desc、params、ret、template
+    """
+    for visiable, var_list in (('public', data_type.public_var_list),
+                               ('protected', data_type.protected_var_list),
+                               ('private', data_type.private_var_list)):
+        for var in var_list:
+            yield {'kind': 'var', 'visibility': visiable, 'type': var[0], 'name': var[1], 'signature': var[1],
+                   'desc': var[2], 'params': [], 'ret': '', 'template': ''}
+    for visiable, fun_list in (('public', data_type.public_fun_list),
+                               ('protected', data_type.protected_fun_list),
+                               ('private', data_type.private_fun_list)):
+        for fun in fun_list:
+            yield {'kind': 'fun', 'visibility': visiable, 'type': fun[0], 'name': fun[1].split(' ')[0],
+                   'signature': fun[1], 'desc': fun[2], 'params': list(fun[3]), 'ret': fun[4], 'template': fun[5]}
+    for typedef in data_type.typedef_list:
+        yield {'kind': 'typedef', 'visibility': '', 'type': '', 'name': typedef[0], 'signature': typedef[0],
+               'desc': typedef[1], 'params': [], 'ret': '', 'template': ''}
+    for enum in data_type.enum_list:
+        yield {'kind': 'enum', 'visibility': '', 'type': '', 'name': enum[0], 'signature': enum[0],
+               'desc': enum[1], 'params': [], 'ret': '', 'template': ''}
+
+
+class JsonLinesExporter:
+    """
+    将数据类型信息导出为JSON Lines文件，每行一个类型，与DocWriter具有相同的write/save接口
+    每行包含version、name、desc、bases(基类完整名称列表)及members
+    """
+    def __init__(self, file_name):
+        """
+        构造函数，创建输出文件
+        :param file_name: 输出文件路径
+        """
+        self.file_name = file_name
+        self.file = open(file_name, 'w', encoding='utf-8')
+
+    def write(self, data_type):
+        """
+        将data_type表示的数据类型信息写入文件
+        :param data_type: 数据类型信息
+        :return: 无
+        """
+        record = {'version': EXPORT_VERSION, 'name': data_type.name, 'desc': data_type.desc,
+                  'bases': list(data_type.bases), 'members': list(iter_members(data_type))}
+        self.file.write(json.dumps(record, ensure_ascii=False))
+        self.file.write('\n')
+
+    def save(self):
+        """
+        保存并关闭文件
+        :return: 无
+        """
+        self.file.close()
+
+
+class SqliteExporter:
+    """
+    将数据类型信息导出为sqlite数据库，与DocWriter具有相同的write/save接口
+    classes 表保存类型，bases 表保存各类型的基类(按声明顺序)，members 表保存各类成员，均在名称上建立索引
+    """
+    def __init__(self, file_name):
+        """
+        构造函数，创建数据库，已存在的同名文件将被覆盖
+        :param file_name: 数据库文件路径
+        """
+        self.file_name = file_name
+        if os.path.exists(file_name):
+            os.remove(file_name)
+        self.conn = sqlite3.connect(file_name)
+        self.conn.execute('PRAGMA journal_mode = OFF')
+        self.conn.execute('PRAGMA synchronous = OFF')
+        self.conn.execute('PRAGMA user_version = {0}'.format(EXPORT_VERSION))
+        self.conn.execute('CREATE TABLE classes (id INTEGER PRIMARY KEY, name TEXT NOT NULL, desc TEXT NOT NULL)')
+        self.conn.execute('CREATE TABLE bases ('
+                          'class_id INTEGER NOT NULL REFERENCES classes(id), position INTEGER NOT NULL, '
+                          'name TEXT NOT NULL)')
+        self.conn.execute('CREATE TABLE members ('
+                          'id INTEGER PRIMARY KEY, class_id INTEGER NOT NULL REFERENCES classes(id), '
+                          'kind TEXT NOT NULL, visibility TEXT NOT NULL, type TEXT NOT NULL, name TEXT NOT NULL, '
+                          'signature TEXT NOT NULL, desc TEXT NOT NULL, params TEXT NOT NULL, ret TEXT NOT NULL, '
+                          'template TEXT NOT NULL)')
+
+    def write(self, data_type):
+        """
+        将data_type表示的数据类型信息写入数据库
+        :param data_type: 数据类型信息
+        :return: 无
+        """
+        class_id = self.conn.execute('INSERT INTO classes (name, desc) VALUES (?, ?)',
+                                     (data_type.name, data_type.desc)).lastrowid
+        self.conn.executemany('INSERT INTO bases (class_id, position, name) VALUES (?, ?, ?)',
+                              [(class_id, position, base) for position, base in enumerate(data_type.bases)])
+        self.conn.executemany(
+            'INSERT INTO members (class_id, kind, visibility, type, name, signature, desc, params, ret, template) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(class_id, m['kind'], m['visibility'], m['type'], m['name'], m['signature'], m['desc'],
+              '\n'.join(m['params']), m['ret'], m['template']) for m in iter_members(data_type)])
+
+    def save(self):
+        """
+        建立索引，提交并关闭数据库
+        :return: 无
+        """
+        # 全部数据写入后再建立索引，避免逐行插入时维护索引
+        self.conn.execute('CREATE INDEX classes_name ON classes(name)')
+        self.conn.execute('CREATE INDEX bases_class_id ON bases(class_id)')
+        self.conn.execute('CREATE INDEX bases_name ON bases(name)')
+        self.conn.execute('CREATE INDEX members_class_id ON members(class_id)')
+        self.conn.execute('CREATE INDEX members_name ON members(name)')
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,81 @@
+from collections import Counter
+
+
+class CallRecorder:
+    """
+    模拟office word的COM对象，不执行任何操作，只统计跨进程调用(属性读取、属性设置、方法调用)的次数
+    用于在没有office的环境中测试DocWriter，衡量输出一个类型需要的COM调用次数
+    """
+    def __init__(self):
+        """
+        构造函数
+        """
+        self.count = 0  # 调用总次数
+        self.members = Counter()  # 成员名称 -> 调用次数
+
+    def record(self, name):
+        """
+        记录一次调用
+        :param name: 被读取、设置或调用的成员名称
+        :return: 无
+        """
+        self.count += 1
+        self.members[name] += 1
+
+    def application(self):
+        """
+        获取模拟的Word.Application对象，作为DocWriter的word_app参数
+        :return: _Proxy对象
+        """
+        return _Proxy(self, 'Application', True)
+
+
+class _Proxy:
+    """
+    模拟的COM对象，读取任意属性均得到新的_Proxy对象
+    读取属性后若直接调用(方法调用)只记为一次调用，否则在继续使用该属性时记为一次属性读取
+    参与加法或转换为整数时(如Range.Start)按0处理
+    """
+    def __init__(self, recorder, name, resolved=False):
+        object.__setattr__(self, '_recorder', recorder)
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_resolved', resolved)
+
+    def _resolve(self):
+        """
+        将尚未计数的属性读取记为一次调用
+        """
+        if not self._resolved:
+            object.__setattr__(self, '_resolved', True)
+            self._recorder.record(self._name)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        self._resolve()
+        return _Proxy(self._recorder, name)
+
+    def __setattr__(self, name, value):
+        self._resolve()
+        self._recorder.record(name)
+
+    def __call__(self, *args, **kwargs):
+        if self._resolved:
+            # 已读取的集合对象按默认方法Item调用
+            self._recorder.record(self._name + '()')
+        else:
+            object.__setattr__(self, '_resolved', True)
+            self._recorder.record(self._name)
+        return _Proxy(self._recorder, self._name, True)
+
+    def __add__(self, other):
+        self._resolve()
+        return other
+
+    __radd__ = __add__
+
+    def __int__(self):
+        self._resolve()
+        return 0
+
+    __index__ = __int__
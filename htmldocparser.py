@@ -1,21 +1,177 @@
-import pathlib
+import re
 from pyquery import PyQuery as pq
+from datatype import DataType, VarInfo, FunInfo, TypedefInfo, EnumInfo
+from tracer import Tracer, NULL_TRACER
+from htmlreader import read_html, iter_annotated
+import util
+
+# 解析器版本，提取结果的内容或格式发生变化时需递增，使解析缓存失效
+PARSER_VERSION = 4
+
+# 可见性对应的doxygen成员分组锚点前缀，如pub-attribs、pro-methods、pri-static-attribs
+VISIABLE_PREFIX = {'Public': 'pub', 'Protected': 'pro', 'Private': 'pri'}
+
+# 中文doxygen标题中紧跟类名的类型种类，如"Foo类 参考"、"Bar结构体 参考"、"Baz< T > 模板类 参考"
+_KIND_SUFFIX = re.compile('(模板)?(类|结构体|联合体|接口|异常)$')
 
 
 class HtmlDocParser:
     """
     用于解析docxygen生成的html文档，生成类信息
     """
-    def __init__(self, file_path):
+    cache_version = 'html:{0}'.format(PARSER_VERSION)
+
+    def __init__(self, file_path, tracer=NULL_TRACER):
         """
         构造函数
         :param file_path: 需要解析的html文件的路径
-        :param src_encoding: 解析的html文件的原始编码
+        :param tracer: 计时工具，记录读取文件及构造文档树的耗时
+        """
+        # 文件内容以字节形式直接构造lxml.html文档树(可识别原生的html标签)，不保留原始内容
+        with tracer.span('read'):
+            root = read_html(file_path)
+        with tracer.span('pyquery'):
+            self.doc = pq(root)
+        self._sections = None  # 成员分组锚点 -> 分组内memitem行列表，由_scan一次遍历生成
+        self._titles = []
+        self._desc_block = None
+        self._typedef_items = []
+        self._enum_tables = []
+        self._details = {}  # 成员锚点id -> 成员详细说明块(div.memitem)
+        self._bases = []  # 继承成员分组(inherit_header)所指向的基类html文件
+
+    def release(self):
+        """
+        释放文档树及由其建立的索引，提取完成后调用以尽早回收内存
+        :return: 无
+        """
+        self.doc = None
+        self._sections = None
+        self._titles = []
+        self._desc_block = None
+        self._typedef_items = []
+        self._enum_tables = []
+        self._details = {}
+        self._bases = []
+
+    def _scan(self):
+        """
+        单次遍历整个文档树，收集各get_*方法所需的节点：
+        memitem行按其所在分组的锚点(pub-attribs、pub-methods等)归类，同时记录标题、详细描述、typedef行及枚举值表格，
+        分组依据doxygen生成的锚点而非本地化的分组标题文字；
+        并建立成员锚点id到成员详细说明块的索引，供get_fun_info查找函数的详细说明、参数及返回值
+        :return: 无
+        """
+        if self._sections is not None:
+            return
+        self._sections = {}
+        section = None
+        in_enum = False  # 当前成员详细说明块是否为枚举类型
+        for el in self.doc[0].iter():
+            tag = el.tag
+            if not isinstance(tag, str):  # 注释等非元素节点
+                continue
+            cls = el.get('class') or ''
+            if tag == 'tr':
+                if cls.startswith('memitem'):
+                    self._sections.setdefault(section, []).append(el)
+                    if 'typedef' in el.text_content():
+                        self._typedef_items.append(el)
+                elif cls.startswith('inherit_header'):
+                    # <tr class="inherit_header pub_methods_classBase"><td>... 继承自 <a class="el" href="classBase.html">
+                    for a in el.iter('a'):
+                        href = (a.get('href') or '').split('#')[0]
+                        if href and href not in self._bases:
+                            self._bases.append(href)
+            elif tag == 'a':
+                anchor = el.get('name') or el.get('id')
+                if anchor == 'details':
+                    # <a name="details"></a><h2>详细描述</h2><div class="textblock">...
+                    h2 = el.getnext()
+                    if h2 is not None:
+                        self._desc_block = h2.getnext()
+                elif anchor and el.getparent().get('class') == 'groupheader':
+                    section = anchor
+            elif tag == 'div' and cls == 'memitem':
+                # <a id="..."></a><h2 class="memtitle">...</h2><div class="memitem">，旧版本doxygen无memtitle
+                anchor = el.getprevious()
+                if anchor is not None and anchor.get('class') == 'memtitle':
+                    anchor = anchor.getprevious()
+                if anchor is not None and anchor.tag == 'a' and anchor.get('id'):
+                    self._details[anchor.get('id')] = el
+            elif cls == 'memname':
+                in_enum = el.text_content().strip().startswith('enum')
+            elif tag == 'table' and 'fieldtable' in cls.split():
+                if in_enum:
+                    self._enum_tables.append(el)
+            elif 'title' in cls.split():
+                self._titles.append(el)
+
+    def _section_items(self, visiable, kind):
+        """
+        获取指定可见性与种类的成员分组中的memitem行，包含静态成员分组
+        :param visiable: 成员可见性，取值:Public Protected Private
+        :param kind: 成员种类，attribs 表示成员变量，methods 表示成员函数
+        :return: 按文档顺序排列的memitem行的PyQuery对象列表
+        """
+        self._scan()
+        prefix = VISIABLE_PREFIX[visiable]
+        anchors = ('{0}-{1}'.format(prefix, kind), '{0}-static-{1}'.format(prefix, kind))
+        return [pq(row) for anchor, rows in self._sections.items() if anchor in anchors for row in rows]
+
+    @staticmethod
+    def parse(file_path, tracer=NULL_TRACER):
+        """
+        解析file_path指定的html文件，提取其中的数据类型信息
+        该方法为静态方法且返回值可被pickle，可直接提交给进程池执行
+        :param file_path: 需要解析的html文件的路径
+        :param tracer: 计时工具，记录各解析步骤的耗时
+        :return: 数据类型信息DataType对象
         """
-        with open(file_path, encoding='utf-8') as file:
-            self.utf8_html = file.read()
-        # 创建pyQuery对象，parser采用html否则无法识别原生的html标签
-        self.doc = pq(self.utf8_html, parser='html')
+        step = tracer.span
+        with step('parse', file=file_path) as parse_span:
+            doc_parser = HtmlDocParser(file_path, tracer)
+            with step('_scan'):
+                doc_parser._scan()
+            with step('get_class_name'):
+                name = doc_parser.get_class_name()
+            with step('get_class_desc'):
+                desc = doc_parser.get_class_desc()
+            with step('get_var_info', visiable='Public'):
+                public_var_list = doc_parser.get_var_info('Public')
+            with step('get_var_info', visiable='Protected'):
+                protected_var_list = doc_parser.get_var_info('Protected')
+            with step('get_var_info', visiable='Private'):
+                private_var_list = doc_parser.get_var_info('Private')
+            with step('get_fun_info', visiable='Public'):
+                public_fun_list = doc_parser.get_fun_info('Public')
+            with step('get_fun_info', visiable='Protected'):
+                protected_fun_list = doc_parser.get_fun_info('Protected')
+            with step('get_fun_info', visiable='Private'):
+                private_fun_list = doc_parser.get_fun_info('Private')
+            with step('get_typedefs'):
+                typedef_list = doc_parser.get_typedefs()
+            with step('get_enums'):
+                enum_list = doc_parser.get_enums()
+            with step('get_bases'):
+                bases = doc_parser.get_bases()
+            doc_parser.release()
+            parse_span.set(**{'class': name})
+        return DataType(name, desc,
+                        [public_var_list, protected_var_list, private_var_list],
+                        [public_fun_list, protected_fun_list, private_fun_list],
+                        typedef_list, enum_list, bases)
+
+    @staticmethod
+    def parse_traced(file_path):
+        """
+        解析file_path指定的html文件并记录各解析步骤的耗时，供进程池中的解析进程使用
+        :param file_path: 需要解析的html文件的路径
+        :return: DataType对象及计时区间列表组成的二元组
+        """
+        tracer = Tracer()
+        data_type = HtmlDocParser.parse(file_path, tracer)
+        return data_type, tracer.events
 
     @staticmethod
     def get_data_files(html_dir):
@@ -24,22 +180,16 @@ class HtmlDocParser:
         :param html_dir: 搜索根目录
         :return: 数据类型定义html文件名定义列表
         """
-        # 从annotated.html中提取所有class属性为el且href属性为class或struct开头的标签a的href属性即为类型描述所在的html文件
-        if not pathlib.Path(html_dir).exists():
-            print(html_dir + ' 目录不存在 !')
-            exit(-1)
-        filename = html_dir + '/annotated.html'
-        if not pathlib.Path(filename).exists():
-            print('在目录：{0}中未找到 annotated.html '.format(html_dir))
-            exit(-1)
-        print('找到annotated.html 在：{0}'.format(html_dir))
-        with open(filename, encoding='utf-8') as file:
-            utf8_html = file.read()
-        doc = pq(utf8_html)
-        a = doc('.directory .el').not_('[href^=namespace]')
-        file_list = ['{0}/{1}'.format(html_dir, item.attr.href) for item in a.items()]
-        # print(file_list)
-        return file_list
+        return list(HtmlDocParser.iter_data_files(html_dir))
+
+    @staticmethod
+    def iter_data_files(html_dir):
+        """
+        从dir制定的目录中查找annotated.html文件，逐个产生其中各数据类型的html文件名
+        :param html_dir: 搜索根目录
+        :return: 产生数据类型定义html文件名的生成器
+        """
+        return iter_annotated(html_dir)
 
     def get_class_name(self):
         """
@@ -47,7 +197,10 @@ class HtmlDocParser:
         :return:类的名称
         """
         # 利用正则表达式提取类名
-        class_name = self.doc('.title').text().split(' ')[0]
+        self._scan()
+        class_name = pq(self._titles).text().split(' ')[0]
+        # 去掉标题中的类型种类，使类名与基类链接、交叉引用中的名称一致
+        class_name = _KIND_SUFFIX.sub('', class_name) or class_name
         # result = re.search('\w+\s', class_name)
         # if result:
         #     class_name = result.group()
@@ -59,8 +212,10 @@ class HtmlDocParser:
         获取类的描述信息
         :return: 类的描述信息
         """
-        h2 = self.doc('h2:contains(详细描述)')
-        class_desc = h2.next().text().strip()
+        self._scan()
+        if self._desc_block is None:
+            return ''
+        class_desc = pq(self._desc_block).text().strip()
         # print('描述：', '\n', '  ', h2.next().text().replace('\n', '。'))
         return class_desc
 
@@ -68,12 +223,10 @@ class HtmlDocParser:
         """
         根据visiable获取成员变量列表
         :param visiable: 成员变量可见性，取值:Public Protected Private
-        :return: 对应可见性的成员变量列表
+        :return: 对应可见性的成员变量VarInfo列表
         """
         var_list = []
-        attr_table = self.doc("table:contains('{0} 属性')".format(visiable))
-        mem_items = attr_table('tr[class^="memitem"]')
-        for item in mem_items.items():
+        for item in self._section_items(visiable, 'attribs'):
             # 排除继承自基类的成员
             if item.attr('class').find('inherit') > 0:
                 continue
@@ -85,7 +238,7 @@ class HtmlDocParser:
             desc = item.next()
             if desc.attr('class') == 'memdesc:{0}'.format(mem_id):
                 mem_desc = desc('.mdescRight').text()
-            var_list.append((mem_type, mem_name, mem_desc))
+            var_list.append(VarInfo(mem_type, mem_name, mem_desc))
             # print('  ', mem_type, mem_name, mem_desc)
         return var_list
 
@@ -93,14 +246,12 @@ class HtmlDocParser:
         """
         根据visiable获取成员函数列表
         :param visiable: 成员函数可见性，取值:Public Protected Private
-        :return: 对应可见性的函数描述列表
+        :return: 对应可见性的函数描述FunInfo列表
         """
         # previous_is_template = False  # 表示上一个memitem节点是否为模板参数节点
         fun_list = []
-        fun_table = self.doc("table:contains('{0} 成员函数')".format(visiable))
-        fun_items = fun_table('tr[class^="memitem"]')
         previous_is_template = False
-        for fun_item in fun_items.items():
+        for fun_item in self._section_items(visiable, 'methods'):
             # 排除基类对象
             if fun_item.attr('class').find('inherit') > 0:
                 continue
@@ -118,53 +269,76 @@ class HtmlDocParser:
                 fun_type = fun_item('.memItemLeft').text()
                 fun_name = fun_item('.memItemRight').text()
             previous_is_template = False
-            fun_desc = ''
             fun_param_list = []
             fun_ret = ''
             desc = fun_item.next()
             if desc.attr('class') == 'memdesc:{0}'.format(fun_id):
                 if desc('.mdescRight a').text() == '更多...':
-                    fun_detail_table = self.doc('a[id={0}]'.format(fun_id)).next().next()
-                    plist = []
-                    for p in fun_detail_table('.memdoc p').items():
-                        plist.append(p.text())
-                    fun_desc = '。'.join(plist)
-                    trs = fun_detail_table('.memdoc .params .params tr')  # 参数说明tr
-                    for tr in trs.items():
-                        fun_param_list.append(
-                            ' '.join([tr('.paramdir').text(), tr('.paramname').text(), tr('td:last-child').text()]))
-                    # html中的返回
-                    fun_ret = fun_detail_table('.memdoc .section.return dd').text()
-
-                    #html中的返回值
-                    fun_ret = [fun_ret]
-                    for tr in fun_detail_table('.memdoc .retval tr').items():
-                        fun_ret.append(tr('td').text())
-                    fun_ret = '\n'.join(fun_ret)
+                    fun_desc, fun_param_list, fun_ret = self._get_fun_detail(fun_id)
                 else:
                     fun_desc = desc('.mdescRight').text()
-                fun_list.append((fun_type, fun_name, fun_desc, fun_param_list, fun_ret, template_desc))
+            elif fun_id in self._details:
+                # 没有简要说明但有详细说明的函数
+                fun_desc, fun_param_list, fun_ret = self._get_fun_detail(fun_id)
+            else:
+                continue
+            fun_list.append(FunInfo(fun_type, fun_name, fun_desc, fun_param_list, fun_ret, template_desc))
         return fun_list
 
+    def _get_fun_detail(self, fun_id):
+        """
+        从成员详细说明块中获取函数的描述、参数说明及返回值
+        :param fun_id: 函数的锚点id
+        :return: 函数描述、参数说明列表、返回值说明组成的三元组
+        """
+        fun_detail_table = pq(self._details.get(fun_id, []))
+        plist = []
+        for p in fun_detail_table('.memdoc p').items():
+            plist.append(p.text())
+        fun_desc = '。'.join(plist)
+        fun_param_list = []
+        trs = fun_detail_table('.memdoc .params .params tr')  # 参数说明tr
+        for tr in trs.items():
+            fun_param_list.append(
+                ' '.join([tr('.paramdir').text(), tr('.paramname').text(), tr('td:last-child').text()]))
+        # html中的返回
+        fun_ret = fun_detail_table('.memdoc .section.return dd').text()
+
+        #html中的返回值
+        fun_ret = [fun_ret]
+        for tr in fun_detail_table('.memdoc .retval tr').items():
+            fun_ret.append(tr('td').text())
+        fun_ret = '\n'.join(fun_ret)
+        return fun_desc, fun_param_list, fun_ret
+
     def get_typedefs(self):
         """
         获取数据类型中的数据类型重定义列表
-        :return: 重定义变量的二元组列表，每个元组内容为重定义后的类型名称和类型描述
+        :return: 重定义变量的TypedefInfo列表，每个元组内容为重定义后的类型名称和类型描述
         """
+        self._scan()
         typedef_list = []
-        mem_items = self.doc('tr[class^="memitem"]:contains(typedef)')
-        for item in mem_items.items():
-            typedef_list.append((item.text().replace('\n', ' '), item.next().text()))
+        for item in map(pq, self._typedef_items):
+            typedef_list.append(TypedefInfo(item.text().replace('\n', ' '), item.next().text()))
         return typedef_list
 
     def get_enums(self):
         """
         获取类型中定义的枚举类型列表
-        :return:枚举类型的二元组列表，每个二元组内容分别为枚举类型名称和枚举类型描述
+        :return:枚举类型的EnumInfo列表，每个二元组内容分别为枚举类型名称和枚举类型描述
         """
-        ths = self.doc('tr th:contains(枚举值)')
+        self._scan()
         enum_list = []
-        for th in ths.items():
-            for tr in th.parent().siblings().items():
-                enum_list.append((tr('.fieldname').text(), tr('.fielddoc').text()))
+        for table in self._enum_tables:
+            # 跳过表头行(th)，其余每行为一个枚举值
+            for tr in [pq(row) for row in table.iterchildren('tr') if row.find('th') is None]:
+                enum_list.append(EnumInfo(tr('.fieldname').text(), tr('.fielddoc').text()))
         return enum_list
+
+    def get_bases(self):
+        """
+        获取类型的基类，即继承成员分组所指向的类型，由基类html文件名还原完整名称
+        :return: 基类完整名称列表
+        """
+        self._scan()
+        return [util.compound_name(href) for href in self._bases]
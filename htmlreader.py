@@ -0,0 +1,73 @@
+import re
+import mmap
+import pathlib
+import lxml.html
+
+# 文档开头声明的字符集，如<meta http-equiv="Content-Type" content="text/xhtml;charset=UTF-8"/>
+_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+# 字节顺序标记对应的编码
+_BOMS = ((b'\xef\xbb\xbf', 'utf-8'), (b'\xff\xfe', 'utf-16-le'), (b'\xfe\xff', 'utf-16-be'))
+
+# annotated.html中的类型链接：directory表格中class为el且不指向命名空间的元素，即css选择器 .directory .el
+_ANNOTATED_LINKS = ("//*[contains(concat(' ', normalize-space(@class), ' '), ' directory ')]"
+                    "//*[contains(concat(' ', normalize-space(@class), ' '), ' el ')][not(starts-with(@href, 'namespace'))]")
+
+# 各编码对应的lxml html解析器
+_PARSERS = {}
+
+
+def _detect_encoding(buffer):
+    """
+    由字节顺序标记或文档开头的meta标签确定文档编码，均未声明时按doxygen的默认编码UTF-8处理
+    :param buffer: 文档的字节内容
+    :return: 编码名称
+    """
+    head = buffer[:1024]
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = _CHARSET.search(head)
+    return match.group(1).decode('ascii').lower() if match else 'utf-8'
+
+
+def read_html(file_path):
+    """
+    以内存映射的方式读取html文件，字节内容直接交给lxml解析，不解码为字符串，构造文档树后即释放映射
+    :param file_path: html文件的路径
+    :return: 文档树的根元素
+    """
+    with open(file_path, 'rb') as file:
+        if not pathlib.Path(file_path).stat().st_size:
+            buffer = b''  # 空文件无法映射
+        else:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            encoding = _detect_encoding(buffer)
+            parser = _PARSERS.get(encoding)
+            if parser is None:
+                parser = _PARSERS[encoding] = lxml.html.HTMLParser(encoding=encoding)
+            return lxml.html.document_fromstring(buffer, parser=parser)
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+
+
+def iter_annotated(html_dir):
+    """
+    从dir制定的目录中查找annotated.html文件，逐个产生其中各数据类型的html文件名
+    只使用lxml，获取文件列表时无需加载pyquery及解析器
+    :param html_dir: 搜索根目录
+    :return: 产生数据类型定义html文件名的生成器
+    """
+    # 从annotated.html中提取所有class属性为el且href属性为class或struct开头的标签a的href属性即为类型描述所在的html文件
+    if not pathlib.Path(html_dir).exists():
+        print(html_dir + ' 目录不存在 !')
+        exit(-1)
+    filename = html_dir + '/annotated.html'
+    if not pathlib.Path(filename).exists():
+        print('在目录：{0}中未找到 annotated.html '.format(html_dir))
+        exit(-1)
+    print('找到annotated.html 在：{0}'.format(html_dir))
+    for href in read_html(filename).xpath(_ANNOTATED_LINKS + '/@href'):
+        yield '{0}/{1}'.format(html_dir, href)
@@ -0,0 +1,159 @@
+import os
+import gzip
+import zlib
+import heapq
+import pickle
+
+# 中间模型文件的格式版本，格式变化后旧文件不能合并
+MODEL_VERSION = 1
+
+# 中间模型文件的默认扩展名
+MODEL_EXT = '.models'
+
+
+def parse_shard(text):
+    """
+    解析--shard参数
+    :param text: "i/N"形式的字符串，i从1开始
+    :return: (分片序号i, 分片数量N)
+    """
+    try:
+        shard, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise ValueError('--shard 的格式应为 i/N，如 1/4')
+    if count < 1 or not 1 <= shard <= count:
+        raise ValueError('--shard 的分片序号应在1到{0}之间'.format(count))
+    return shard, count
+
+
+def listing_checksum(file_list):
+    """
+    计算文件列表的校验值，只使用文件名，不同节点上输入目录的位置不同时结果一致
+    合并时用于确认各分片是基于同一份文件列表划分的
+    :param file_list: 文件路径列表
+    :return: 校验值
+    """
+    return zlib.crc32('\n'.join(os.path.basename(path) for path in file_list).encode('utf-8'))
+
+
+def partition(file_list, shard, count, method='hash'):
+    """
+    确定性地划分文件列表，各节点对同一份文件列表得到相同的划分结果
+    :param file_list: 文件路径列表
+    :param shard: 分片序号，从1开始
+    :param count: 分片数量
+    :param method: hash 按文件名的稳定哈希值(crc32)划分，与输入目录的位置无关；
+                   size 按文件大小将列表划分为总大小接近的连续区间
+    :return: 分配给该分片的文件在file_list中的序号列表，升序
+    """
+    if method == 'hash':
+        return [index for index, path in enumerate(file_list)
+                if zlib.crc32(os.path.basename(path).encode('utf-8')) % count == shard - 1]
+    sizes = [os.path.getsize(path) for path in file_list]
+    total = float(sum(sizes)) or 1.0
+    indexes = []
+    offset = 0
+    for index, size in enumerate(sizes):
+        # 按文件中点所在的位置确定分片，每个文件只属于一个分片，各分片为连续的区间
+        if min(int((offset + size / 2.0) * count / total), count - 1) == shard - 1:
+            indexes.append(index)
+        offset += size
+    return indexes
+
+
+class ModelWriter:
+    """
+    中间模型文件写入工具，文件为gzip压缩的pickle流
+    第一条记录为(格式版本, 分片信息)，之后每个类型一条(文件列表中的序号, 文件路径, DataType)记录，最后为结束标记None
+    """
+    def __init__(self, file_name, info):
+        """
+        构造函数，创建中间模型文件
+        :param file_name: 文件路径
+        :param info: 分片信息字典，包含shard、count、total、method、parser、listing
+        """
+        self.file_name = file_name
+        self.file = gzip.open(file_name, 'wb', compresslevel=1)
+        pickle.dump((MODEL_VERSION, info), self.file, pickle.HIGHEST_PROTOCOL)
+
+    def write(self, index, file_path, data_type):
+        """
+        写入一个类型
+        :param index: 文件在完整文件列表中的序号
+        :param file_path: 文件路径
+        :param data_type: 数据类型信息
+        :return: 无
+        """
+        pickle.dump((index, file_path, data_type), self.file, pickle.HIGHEST_PROTOCOL)
+
+    def save(self):
+        """
+        写入结束标记并关闭文件，没有结束标记的文件(如节点中途退出)不能合并
+        :return: 无
+        """
+        pickle.dump(None, self.file, pickle.HIGHEST_PROTOCOL)
+        self.file.close()
+
+
+def _read_header(file_name):
+    """
+    打开中间模型文件并读取分片信息
+    :param file_name: 文件路径
+    :return: (已打开的文件, 分片信息字典)
+    """
+    file = gzip.open(file_name, 'rb')
+    try:
+        version, info = pickle.load(file)
+    except Exception:
+        file.close()
+        raise ValueError('不是有效的中间模型文件：{0}'.format(file_name))
+    if version != MODEL_VERSION:
+        file.close()
+        raise ValueError('中间模型文件的格式版本不一致：{0}'.format(file_name))
+    return file, info
+
+
+def _iter_records(file_name, file):
+    """
+    逐个产生中间模型文件中的(序号, 文件路径, DataType)记录
+    """
+    with file:
+        while True:
+            try:
+                record = pickle.load(file)
+            except (EOFError, OSError, zlib.error, pickle.UnpicklingError):
+                raise ValueError('中间模型文件不完整：{0}'.format(file_name))
+            if record is None:
+                return
+            yield record
+
+
+def merge(file_names):
+    """
+    合并各分片的中间模型文件，按类型在原始文件列表中的顺序逐个产生，同时打开的文件数量为分片数量，不在内存中堆积
+    合并前检查各文件属于同一次划分且分片齐全
+    :param file_names: 中间模型文件路径列表，顺序任意
+    :return: (原始文件列表中的文件数量, 产生(文件路径, DataType对象)二元组的生成器)
+    """
+    opened = []
+    try:
+        for file_name in file_names:
+            file, info = _read_header(file_name)
+            opened.append((file_name, file, info))
+        first = opened[0][2]
+        for file_name, file, info in opened:
+            for key in ('count', 'total', 'method', 'parser', 'listing'):
+                if info[key] != first[key]:
+                    raise ValueError('中间模型文件不属于同一次分片：{0}'.format(file_name))
+        shards = sorted(info['shard'] for file_name, file, info in opened)
+        if shards != list(range(1, first['count'] + 1)):
+            missing = sorted(set(range(1, first['count'] + 1)) - set(shards))
+            raise ValueError('分片不完整或重复，共{0}个分片，缺少：{1}，已有：{2}'.format(
+                first['count'], missing, shards))
+    except Exception:
+        for file_name, file, info in opened:
+            file.close()
+        raise
+    streams = [_iter_records(file_name, file) for file_name, file, info in opened]
+    merged = heapq.merge(*streams, key=lambda record: record[0])
+    return first['total'], ((file_path, data_type) for index, file_path, data_type in merged)
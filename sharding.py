@@ -0,0 +1,202 @@
+import os
+import re
+import sqlite3
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import quote
+from checkpoint import Failure as Failure
+import backends
+import util
+
+
+# 分片方式：按命名空间、按html文件所在目录、仅按数量上限
+SHARD_MODES = ('namespace', 'directory', 'size')
+
+# 分片文件名中不允许出现的字符
+_UNSAFE_CHARS = re.compile(r'[^\w.-]+')
+
+
+class Shard(namedtuple('Shard', ['name', 'file_list'])):
+    """
+    分片：分片名称，分片包含的html文件列表
+    """
+    __slots__ = ()
+
+
+class ShardResult(namedtuple('ShardResult', ['name', 'doc_name', 'classes', 'table_count', 'failures'])):
+    """
+    分片输出结果：分片名称，分片文档路径，分片包含的类型名称列表，分片文档中的表格数量，处理失败的文件(Failure列表)
+    """
+    __slots__ = ()
+
+
+def _shard_key(file_path, mode):
+    """
+    获取html文件所属的分组
+    :param file_path: 类型描述html文件路径
+    :param mode: 分片方式
+    :return: 分组名称
+    """
+    if mode == 'namespace':
+        # 由doxygen文件名还原类型的完整名称，无需解析html
+        return util.compound_name(file_path).rpartition('::')[0]
+    if mode == 'directory':
+        return os.path.dirname(file_path)
+    return ''
+
+
+def partition(file_list, mode='size', budget=0):
+    """
+    将文件列表划分为若干分片，分组按名称排序，组内保持file_list中的顺序
+    :param file_list: 类型描述html文件列表
+    :param mode: 分片方式，取值：namespace directory size
+    :param budget: 每个分片的类型数量上限，超出时同一分组拆分为多个分片，0表示不限制
+    :return: Shard列表
+    """
+    if mode not in SHARD_MODES:
+        raise ValueError('未知的分片方式：' + mode)
+    groups = {}
+    for file_path in file_list:
+        groups.setdefault(_shard_key(file_path, mode), []).append(file_path)
+    shards = []
+    for key in sorted(groups):
+        files = groups[key]
+        if mode == 'directory':
+            key = os.path.basename(os.path.normpath(key)) if key else ''
+        key = key or ('part' if mode == 'size' else 'global')
+        step = budget or len(files)
+        for start in range(0, len(files), step):
+            name = key if len(files) <= step else '{0}_{1}'.format(key, start // step + 1)
+            shards.append(Shard(name, files[start:start + step]))
+    return shards
+
+
+def shard_doc_name(doc_name, index, shard):
+    """
+    获取分片文档路径，与索引文档位于同一目录
+    :param doc_name: 索引文档路径
+    :param index: 分片序号，从1开始
+    :param shard: 分片
+    :return: 分片文档路径
+    """
+    stem = os.path.splitext(doc_name)[0]
+    return '{0}_{1:03d}_{2}.docx'.format(stem, index, _UNSAFE_CHARS.sub('_', shard.name))
+
+
+def render_shard(shard, doc_name, iter_models, start_title=1, cache_name=None, cache_size=0, doc_parser=None):
+    """
+    解析分片中的文件并输出为独立的docx文档，在进程池中执行
+    :param shard: 分片
+    :param doc_name: 分片文档路径
+    :param iter_models: 按顺序解析文件的函数，参数及返回值同doccrawler中的iter_data_types
+    :param start_title: 类型名称对应的起始标题级别
+    :param cache_name: 缓存数据库文件路径，为None时不使用缓存
+    :param cache_size: 解析结果缓存及文档片段缓存各自的大小上限(字节)，0表示不限制
+    :param doc_parser: 解析器类，HtmlDocParser 或 XmlDocParser，为None时使用HtmlDocParser
+    :return: ShardResult对象，处理失败的文件被跳过并记录在结果中，不影响其他文件及分片
+    """
+    from docxwriter import DocxWriter
+    if doc_parser is None:
+        doc_parser = backends.load_parser('html')
+    conn = None
+    parse_cache = None
+    fragment_cache = None
+    if cache_name:
+        # 多个分片进程共用同一个缓存数据库，每个文件处理后即提交，避免长时间占用写锁
+        from cache import ParseCache, FragmentCache
+        conn = sqlite3.connect(cache_name, timeout=60)
+        parse_cache = ParseCache(conn, doc_parser.cache_version, cache_size)
+        fragment_cache = FragmentCache(conn, cache_size)
+    doc_writer = DocxWriter(doc_name, start_title=start_title, fragment_cache=fragment_cache)
+    classes = []
+    failures = []
+
+    def on_error(html_file, error, stage='解析'):
+        """
+        记录处理失败的文件，跳过该文件继续处理分片中的其他文件
+        """
+        failures.append(Failure.from_error(html_file, stage, error))
+
+    for html_file, dt in iter_models(shard.file_list, 1, parse_cache, doc_parser=doc_parser, on_error=on_error):
+        try:
+            doc_writer.write(dt)
+        except Exception as error:
+            on_error(html_file, error, '输出')
+            continue
+        classes.append(dt.name)
+        if conn is not None:
+            conn.commit()
+    doc_writer.save()
+    if conn is not None:
+        fragment_cache.close()
+        parse_cache.close()
+        conn.close()
+    return ShardResult(shard.name, doc_name, classes, doc_writer.table_count, failures)
+
+
+def render_shards(shards, doc_name, iter_models, start_title=1, jobs=1, cache_name=None, cache_size=0,
+                  callback=None, doc_parser=None):
+    """
+    并行输出各分片文档
+    :param shards: Shard列表
+    :param doc_name: 索引文档路径，分片文档以其为前缀命名
+    :param iter_models: 按顺序解析文件的函数，参数及返回值同doccrawler中的iter_data_types，使用进程池时须可被pickle
+    :param start_title: 类型名称对应的起始标题级别
+    :param jobs: 并行进程数，1表示在当前进程中依次输出，0表示使用全部CPU核心
+    :param cache_name: 缓存数据库文件路径，为None时不使用缓存
+    :param cache_size: 解析结果缓存及文档片段缓存各自的大小上限(字节)，0表示不限制
+    :param callback: 每个分片完成后以(已完成数量, ShardResult)调用
+    :param doc_parser: 解析器类，HtmlDocParser 或 XmlDocParser，为None时使用HtmlDocParser
+    :return: 按分片顺序排列的ShardResult列表
+    """
+    results = [None] * len(shards)
+    args = [(shard, shard_doc_name(doc_name, n + 1, shard), iter_models, start_title, cache_name, cache_size,
+             doc_parser) for n, shard in enumerate(shards)]
+    if jobs == 1:
+        for n, arg in enumerate(args):
+            results[n] = render_shard(*arg)
+            if callback is not None:
+                callback(n + 1, results[n])
+        return results
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        futures = {executor.submit(render_shard, *arg): n for n, arg in enumerate(args)}
+        for count, future in enumerate(as_completed(futures)):
+            results[futures[future]] = future.result()
+            if callback is not None:
+                callback(count + 1, results[futures[future]])
+    return results
+
+
+def write_index(doc_name, results, start_title=1):
+    """
+    生成链接各分片文档的索引文档
+    :param doc_name: 索引文档路径
+    :param results: ShardResult列表
+    :param start_title: 分片标题的标题级别
+    :return: 无
+    """
+    from docxwriter import DocxWriter
+
+    class IndexWriter(DocxWriter):
+        """
+        分片索引文档写入工具，每个分片一节，包含指向分片文档的超链接及分片中的类型列表
+        分片标题与分片文档中的类型标题使用相同的标题级别
+        """
+        def write(self, result):
+            """
+            写入一个分片的索引
+            :param result: ShardResult对象
+            :return: 无
+            """
+            file_name = os.path.basename(result.doc_name)
+            xml = [self._heading(result.name, self.start_title),
+                   self._content([self._hyperlink(file_name, quote(file_name), size=12)]),
+                   self._content('包含{0}个类型，{1}个表格。'.format(len(result.classes), result.table_count))]
+            if result.classes:
+                xml.append(self._table([15], [['类型名称']] + [[name] for name in result.classes]))
+            self.body.write(''.join(xml).encode('utf-8'))
+
+    index_writer = IndexWriter(doc_name, start_title=start_title)
+    for result in results:
+        index_writer.write(result)
+    index_writer.save()
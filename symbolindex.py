@@ -0,0 +1,274 @@
+import os
+import re
+import pickle
+import tempfile
+from collections import namedtuple, deque
+from datatype import DataType as DataType
+
+
+# 索引文件格式版本，ClassSymbol的内容发生变化时需递增，使已保存的索引失效
+INDEX_VERSION = 1
+
+# 类型文本中的标识符，可带命名空间，如 const ns::Foo & 中的 ns::Foo
+_IDENTIFIER = re.compile(r'[A-Za-z_]\w*(?:::[A-Za-z_]\w*)*')
+
+# 函数签名的词法单元：标识符、作用域运算符或单个符号
+_TOKEN = re.compile(r'[A-Za-z_]\w*|::|\S')
+
+# 不影响覆盖关系的函数限定符
+_FUN_QUALIFIERS = {'virtual', 'override', 'final', 'inline', 'explicit'}
+
+# 可由多个单词组成的内置类型名称，位于参数末尾时不是参数名
+_BUILTIN_TYPES = {'char', 'short', 'int', 'long', 'float', 'double', 'bool', 'void',
+                  'signed', 'unsigned', 'wchar_t', 'auto'}
+
+
+def _split_params(text):
+    """
+    按最外层的逗号拆分参数列表，模板参数、函数指针参数及默认值字符串中的逗号不拆分
+    :param text: 括号内的参数列表文本
+    :return: 参数文本列表
+    """
+    params = []
+    depth = 0
+    start = 0
+    quote = None
+    for pos, char in enumerate(text):
+        if quote:
+            if char == quote and text[pos - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '(<[':
+            depth += 1
+        elif char in ')>]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            params.append(text[start:pos])
+            start = pos + 1
+    params.append(text[start:])
+    return [param for param in params if param.strip()]
+
+
+def _param_type(param):
+    """
+    获取参数的类型，去掉参数名、默认值及多余的空白
+    :param param: 参数文本，如 const Point &pt = Point()
+    :return: 类型文本，如 const Point &
+    """
+    tokens = _TOKEN.findall(param)
+    if '=' in tokens:
+        tokens = tokens[:tokens.index('=')]
+    if (len(tokens) > 1 and re.match(r'[A-Za-z_]', tokens[-1]) and tokens[-1] not in _BUILTIN_TYPES
+            and tokens[-2] != '::'):
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def _override_key(fun_name):
+    """
+    获取判断函数覆盖关系的键，派生类中名称及参数类型相同的函数覆盖基类的函数
+    参数名、默认值、空白及virtual、override、const等限定符不影响结果
+    :param fun_name: 函数名称及参数，如 draw (const Point &pt) const override
+    :return: (函数名称, 参数类型元组)
+    """
+    match = re.match(r'\s*((?:[^(]*\boperator\s*\(\s*\))?[^(]*)\((.*)\)', fun_name)
+    if match is None:
+        return fun_name.strip(), ()
+    words = [word for word in match.group(1).split() if word not in _FUN_QUALIFIERS]
+    name = ''.join(words)
+    # 去掉参数列表之后的const、noexcept等限定符，只保留与左括号匹配的参数列表
+    text = match.group(2)
+    depth = 0
+    for pos, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            if depth == 0:
+                text = text[:pos]
+                break
+            depth -= 1
+    params = tuple(_param_type(param) for param in _split_params(text))
+    return name, () if params == ('void',) else params
+
+
+class ClassSymbol(namedtuple('ClassSymbol', ['bases', 'public_var_list', 'protected_var_list',
+                                             'public_fun_list', 'protected_fun_list'])):
+    """
+    类型符号：基类完整名称元组，可被派生类继承的public、protected成员变量及成员函数列表
+    """
+    __slots__ = ()
+
+
+class SymbolIndex:
+    """
+    工程范围的符号索引，记录各类型的基类及可继承的成员，每次运行只需建立一次，可保存供下次运行使用
+    用于在输出时补充继承自基类的成员，以及将成员的数据类型链接到该类型的章节，均无需重复解析文件
+    """
+    def __init__(self):
+        """
+        构造函数，创建空索引
+        """
+        self.classes = {}  # 类型完整名称 -> ClassSymbol
+        self._short_names = None  # 不含命名空间的名称 -> 完整名称列表，查找时生成
+
+    def __len__(self):
+        return len(self.classes)
+
+    def __contains__(self, name):
+        return name in self.classes
+
+    def add(self, data_type):
+        """
+        将类型加入索引，同名类型被替换
+        :param data_type: 数据类型信息
+        :return: 无
+        """
+        if data_type.name not in self.classes:
+            self._short_names = None
+        self.classes[data_type.name] = ClassSymbol(tuple(data_type.bases),
+                                                   data_type.public_var_list, data_type.protected_var_list,
+                                                   data_type.public_fun_list, data_type.protected_fun_list)
+
+    def resolve(self, name, scope=''):
+        """
+        按C++名称查找规则，由内向外在scope的各级作用域中查找类型
+        :param name: 类型名称，可带命名空间
+        :param scope: 引用该名称的作用域，如所在类的完整名称 ns::Foo
+        :return: 类型的完整名称，未找到时返回None
+        """
+        parts = scope.split('::') if scope else []
+        while True:
+            candidate = '::'.join(parts + [name])
+            if candidate in self.classes:
+                return candidate
+            if not parts:
+                break
+            parts.pop()
+        if '::' in name:
+            return None
+        # 不在任何外层作用域中时(如通过using引入)，名称在工程中唯一则使用该类型
+        if self._short_names is None:
+            self._short_names = {}
+            for full_name in self.classes:
+                self._short_names.setdefault(full_name.rpartition('::')[2], []).append(full_name)
+        full_names = self._short_names.get(name, [])
+        return full_names[0] if len(full_names) == 1 else None
+
+    def split_links(self, text, scope=''):
+        """
+        将类型文本拆分为普通文本和指向工程内类型的片段
+        :param text: 类型文本，如 const std::vector< Foo > &
+        :param scope: 引用该类型的作用域
+        :return: (文本片段, 类型完整名称或None)列表
+        """
+        segments = []
+        last = 0
+        for match in _IDENTIFIER.finditer(text):
+            target = self.resolve(match.group(), scope)
+            if target is None or target == scope:
+                continue
+            if match.start() > last:
+                segments.append((text[last:match.start()], None))
+            segments.append((match.group(), target))
+            last = match.end()
+        if last < len(text):
+            segments.append((text[last:], None))
+        return segments
+
+    def ancestors(self, name, bases=None):
+        """
+        按广度优先顺序获取类型的全部祖先类，每个祖先类只出现一次
+        :param name: 类型完整名称
+        :param bases: 类型的基类，为None时从索引中获取
+        :return: 祖先类完整名称列表，只包含索引中存在的类型
+        """
+        if bases is None:
+            bases = self.classes[name].bases if name in self.classes else ()
+        result = []
+        seen = {name}
+        queue = deque((base, name) for base in bases)
+        while queue:
+            base, scope = queue.popleft()
+            base = self.resolve(base, scope.rpartition('::')[0])
+            if base is None or base in seen:
+                continue
+            seen.add(base)
+            result.append(base)
+            queue.extend((parent, base) for parent in self.classes[base].bases)
+        return result
+
+    def with_inherited(self, data_type):
+        """
+        生成包含继承成员的数据类型，继承的public、protected成员追加到对应可见性的列表末尾，
+        描述中注明所属的基类；被派生类同名成员(函数为名称及参数类型相同)覆盖的成员及基类的构造、析构函数不重复列出
+        :param data_type: 数据类型信息
+        :return: 新的DataType对象，data_type不变
+        """
+        var_lists = [list(data_type.public_var_list), list(data_type.protected_var_list)]
+        fun_lists = [list(data_type.public_fun_list), list(data_type.protected_fun_list)]
+        var_names = {var.name for var_list in var_lists for var in var_list}
+        var_names.update(var.name for var in data_type.private_var_list)
+        fun_keys = {_override_key(fun.name) for fun_list in fun_lists for fun in fun_list}
+        fun_keys.update(_override_key(fun.name) for fun in data_type.private_fun_list)
+        for base in self.ancestors(data_type.name, data_type.bases):
+            symbol = self.classes[base]
+            note = '(继承自{0})'.format(base)
+            short_name = base.rpartition('::')[2]
+            for var_list, inherited in zip(var_lists, (symbol.public_var_list, symbol.protected_var_list)):
+                for var in inherited:
+                    if var.name not in var_names:
+                        var_names.add(var.name)
+                        var_list.append(var._replace(desc=var.desc + note))
+            for fun_list, inherited in zip(fun_lists, (symbol.public_fun_list, symbol.protected_fun_list)):
+                for fun in inherited:
+                    fun_key = _override_key(fun.name)
+                    if fun_key in fun_keys or fun_key[0] in (short_name, '~' + short_name):
+                        continue
+                    fun_keys.add(fun_key)
+                    fun_list.append(fun._replace(desc=fun.desc + note))
+        return DataType(data_type.name, data_type.desc,
+                        var_lists + [data_type.private_var_list], fun_lists + [data_type.private_fun_list],
+                        data_type.typedef_list, data_type.enum_list, data_type.bases)
+
+    def spool(self, models):
+        """
+        先读取全部解析结果建立索引，再依次产生这些解析结果，使输出第一个类型时即可引用所有类型
+        解析结果暂存在临时文件中，不在内存中堆积，也无需重新解析
+        :param models: 产生(文件路径, DataType对象)二元组的可迭代对象
+        :return: 产生(文件路径, DataType对象)二元组的生成器
+        """
+        with tempfile.TemporaryFile() as file:
+            count = 0
+            for html_file, dt in models:
+                self.add(dt)
+                pickle.dump((html_file, dt), file, pickle.HIGHEST_PROTOCOL)
+                count += 1
+            file.seek(0)
+            for n in range(count):
+                yield pickle.load(file)
+
+    def save(self, file_name):
+        """
+        保存索引
+        :param file_name: 索引文件路径
+        :return: 无
+        """
+        with open(file_name, 'wb') as file:
+            pickle.dump((INDEX_VERSION, self.classes), file, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(file_name):
+        """
+        读取保存的索引，文件不存在或版本不一致时返回空索引
+        本次运行解析的类型将替换索引中的同名类型，未参与本次运行的类型(如被--exclude排除的基类)仍可被引用
+        :param file_name: 索引文件路径
+        :return: SymbolIndex对象
+        """
+        index = SymbolIndex()
+        if os.path.exists(file_name):
+            with open(file_name, 'rb') as file:
+                version, classes = pickle.load(file)
+            if version == INDEX_VERSION:
+                index.classes = classes
+        return index
@@ -0,0 +1,48 @@
+import pytest
+
+from datatype import DataType, VarInfo, FunInfo, TypedefInfo, EnumInfo
+from docwriter import DocWriter
+from fakeword import CallRecorder
+
+
+def _data_type(rows):
+    """
+    生成每个表格包含rows行数据的类型
+    """
+    return DataType('ns::Foo', '测试类型',
+                    [[VarInfo('int', 'var{0}'.format(n), '变量') for n in range(rows)], [], []],
+                    [[FunInfo('void', 'fun{0} (int arg)'.format(n), '函数', ('arg 参数',), '', '') for n in range(2)],
+                     [], []],
+                    [TypedefInfo('typedef int Id{0}'.format(n), '') for n in range(rows)],
+                    [EnumInfo('VALUE{0}'.format(n), '') for n in range(rows)])
+
+
+def _count_calls(data_type):
+    """
+    输出一个类型，返回其中的COM调用次数
+    """
+    recorder = CallRecorder()
+    doc_writer = DocWriter('test.doc', word_app=recorder.application())
+    start = recorder.count
+    doc_writer.write(data_type)
+    return recorder.count - start, doc_writer.table_count
+
+
+@pytest.mark.parametrize('rows', [10, 300])
+def test_table_calls_do_not_grow_with_rows(rows):
+    small, small_tables = _count_calls(_data_type(1))
+    large, large_tables = _count_calls(_data_type(rows))
+    assert large_tables == small_tables
+    assert large == small
+
+
+def test_formatting_comes_from_styles():
+    recorder = CallRecorder()
+    doc_writer = DocWriter('test.doc', word_app=recorder.application())
+    recorder.members.clear()
+    doc_writer.write(_data_type(3))
+    members = recorder.members
+    # 每个段落(Paragraphs.Add)及每个表格只设置一次样式
+    assert members['Style'] == members['Add'] + doc_writer.table_count
+    for name in ('Font', 'ParagraphFormat', 'LineSpacing', 'LineSpacingRule', 'Selection'):
+        assert members[name] == 0, name
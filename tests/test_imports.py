@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 只在实际使用时才加载的依赖，导入命令行入口及库模块时不应加载
+HEAVY_MODULES = ('pyquery', 'lxml', 'win32com', 'docxwriter')
+
+
+def _loaded_modules(module):
+    """
+    在新的解释器中导入模块，返回其中已加载的重量级依赖
+    :param module: 模块名称
+    :return: 已加载的模块名称列表
+    """
+    code = 'import sys, {0}; print(",".join(m for m in {1!r} if m in sys.modules))'.format(module, HEAVY_MODULES)
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT, universal_newlines=True)
+    return [name for name in output.strip().split(',') if name]
+
+
+@pytest.mark.parametrize('module', ['doccrawler', 'sharding'])
+def test_import_is_lazy(module):
+    assert _loaded_modules(module) == []
@@ -0,0 +1,326 @@
+import html
+import os
+import re
+
+
+# 输出文件的写缓冲区大小，每个类型渲染为一个字符串后一次写入
+_BUFFER_SIZE = 1024 * 1024
+
+# Markdown中可能触发行内格式、链接或表格分隔的字符使用反斜杠转义，html字符转换为字符引用，换行转换为<br>
+_MD_SPECIAL = {ord(c): '\\' + c for c in '\\`*_[]|~'}
+_MD_SPECIAL.update({ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;', ord('\n'): '<br>'})
+
+# Markdown中位于行首时表示标题或列表的字符，换行已转换为<br>，只需检查文本开头；">"转换为字符引用后不再表示引用
+_MD_BLOCK = ('#', '+', '-')
+
+# AsciiDoc中可能触发格式、宏、属性引用或交叉引用的字符，以及位于行首时表示标题、列表或块标题的字符，
+# 包含时使用pass:c[]宏原样输出
+_ADOC_SPECIAL = re.compile(r'[*_`^~#+\[\]{}<>]|^[=\-.:/]')
+
+
+class TextWriter:
+    """
+    轻量文本格式写入工具的基类，与DocWriter具有相同的write/save接口，文档结构与DocxWriter一致
+    每个类型渲染为一个字符串后立即写入文件，单次遍历、不保留已输出的内容，内存占用不随类型数量增长
+    子类实现_escape、_ref、_heading、_paragraph、_table及_begin、_end
+    """
+    def __init__(self, doc_name, start_title=1):
+        """
+        构造函数，创建输出文件
+        :param doc_name: 包含文件名称的完整路径
+        :param start_title: 类型名称对应的起始标题级别
+        """
+        self.doc_name = doc_name
+        self.start_title = start_title
+        self.table_count = 0  # 已输出的表格数量，用于题注编号
+        self.file = open(doc_name, 'w', encoding='utf-8', newline='\n', buffering=_BUFFER_SIZE)
+        self.file.write(self._begin())
+
+    def _begin(self):
+        """
+        生成文件头
+        :return: 文本
+        """
+        return ''
+
+    def _end(self):
+        """
+        生成文件尾
+        :return: 文本
+        """
+        return ''
+
+    def _escape(self, text):
+        """
+        转义文本中的特殊字符，换行转换为该格式的换行
+        :param text: 原始文本
+        :return: 转义后的文本
+        """
+        raise NotImplementedError
+
+    def _ref(self, number):
+        """
+        生成指向表格的引用，如"表1"
+        :param number: 表格编号
+        :return: 文本
+        """
+        raise NotImplementedError
+
+    def _heading(self, text, title_level):
+        """
+        生成标题
+        :param text: 标题文本
+        :param title_level: 标题级别，超出格式支持的级别时使用最低一级
+        :return: 文本
+        """
+        raise NotImplementedError
+
+    def _paragraph(self, markup):
+        """
+        生成段落
+        :param markup: 已转义的段落内容
+        :return: 文本
+        """
+        raise NotImplementedError
+
+    def _table(self, number, title, widths, rows, header_row=True, header_col=False):
+        """
+        生成带题注的表格
+        :param number: 表格编号
+        :param title: 表格标题
+        :param widths: 各列宽度(cm)
+        :param rows: 行列表，每行为单元格文本的列表
+        :param header_row: 第一行是否为表头
+        :param header_col: 第一列是否为表头
+        :return: 文本
+        """
+        raise NotImplementedError
+
+    def _content(self, text):
+        """
+        生成正文段落
+        :param text: 段落文本
+        :return: 文本
+        """
+        return self._paragraph(self._escape(text))
+
+    def _table_with_lead(self, prefix, title, widths, rows, header_row=True, header_col=False):
+        """
+        生成表格的引出段落(如"Public属性如表1所示。")及表格
+        :param prefix: 引出段落中表格引用之前的文本
+        :return: 文本
+        """
+        self.table_count += 1
+        lead = self._paragraph(self._escape(prefix) + self._ref(self.table_count) + self._escape('所示。'))
+        return lead + self._table(self.table_count, title, widths, rows, header_row, header_col)
+
+    def _write_var_list(self, var_list, visiable):
+        """
+        生成类型的成员变量
+        :param var_list: 成员变量列表
+        :param visiable: 成员变量列表中成员的可见性
+        :return: 文本
+        """
+        text = [self._heading(visiable + '属性', self.start_title + 1)]
+        if len(var_list):
+            rows = [['属性名称', '数据类型', '数据描述']]
+            rows += [[var[1], var[0], var[2]] for var in var_list]
+            text.append(self._table_with_lead(visiable + '属性如', '{0}属性列表'.format(visiable),
+                                              [4, 4, 6.5], rows))
+        else:
+            text.append(self._content('无。'))
+        return ''.join(text)
+
+    def _write_fun_list(self, fun_list, visiable):
+        """
+        生成类型的成员函数
+        :param fun_list: 成员函数列表
+        :param visiable: 成员函数列表中成员的可见性
+        :return: 文本
+        """
+        text = [self._heading(visiable + '方法', self.start_title + 1)]
+        if len(fun_list):
+            for fun in fun_list:
+                # 函数名作为标题
+                fun_name = fun[1].split(' ')[0]
+                text.append(self._heading(fun_name + '方法', self.start_title + 2))
+                template_desc = fun[5] + '\n' if fun[5] else ''
+                rows = [['函数原型', template_desc + ((fun[0] + ' ' + fun[1]) if len(fun[0]) else fun[1])],
+                        ['函数描述', fun[2]],
+                        ['参数说明', '\n'.join(fun[3]) if len(fun[3]) else '无'],
+                        ['返 回 值', fun[4] if len(fun[4]) else '无'],
+                        ['流 程 图', '无']]
+                text.append(self._table_with_lead(fun_name + '方法说明如', '{0}方法'.format(fun_name), [3, 12], rows,
+                                                  header_row=False, header_col=True))
+        else:
+            text.append(self._content('无。'))
+        return ''.join(text)
+
+    def _write_typedefs(self, typedef_list):
+        """
+        生成类型内部的重定义类型列表
+        :param typedef_list: 重定义类型列表
+        :return: 文本
+        """
+        text = [self._heading('类型重定义', self.start_title + 1)]
+        if len(typedef_list):
+            rows = [['类型定义', '类型描述']]
+            rows += [[item[0], item[1] if len(item[1]) else '无'] for item in typedef_list]
+            text.append(self._table_with_lead('类型重定义如', '数据类型重定义说明', [10, 5], rows))
+        else:
+            text.append(self._content('无。'))
+        return ''.join(text)
+
+    def _write_enums(self, enum_list):
+        """
+        生成类型内部的枚举值列表
+        :param enum_list: 枚举值列表
+        :return: 文本
+        """
+        text = [self._heading('枚举值定义', self.start_title + 1)]
+        if len(enum_list):
+            rows = [['枚举值', '说明']]
+            rows += [[item[0], item[1] if len(item[1]) else '无'] for item in enum_list]
+            text.append(self._table_with_lead('枚举值定义如', '枚举值定义说明', [5, 10], rows))
+        else:
+            text.append(self._content('无。'))
+        return ''.join(text)
+
+    def write(self, data_type):
+        """
+        将data_type表示的数据类型信息写入文件
+        :param data_type: 数据类型信息
+        :return: 无
+        """
+        text = [self._heading(data_type.name, self.start_title),
+                self._content(data_type.desc + '。'),
+                self._write_typedefs(data_type.typedef_list),
+                self._write_enums(data_type.enum_list),
+                self._write_var_list(data_type.public_var_list, 'Public'),
+                self._write_var_list(data_type.protected_var_list, 'Protected'),
+                self._write_var_list(data_type.private_var_list, 'Private'),
+                self._write_fun_list(data_type.public_fun_list, 'Public'),
+                self._write_fun_list(data_type.protected_fun_list, 'Protected'),
+                self._write_fun_list(data_type.private_fun_list, 'Private')]
+        self.file.write(''.join(text))
+
+    def save(self):
+        """
+        保存并关闭文件
+        :return: 无
+        """
+        self.file.write(self._end())
+        self.file.close()
+
+
+class MarkdownWriter(TextWriter):
+    """
+    Markdown(GFM)写入工具，表格使用管道表格，单元格内的换行使用<br>
+    """
+    def _escape(self, text):
+        text = text.translate(_MD_SPECIAL)
+        return '\\' + text if text.startswith(_MD_BLOCK) else text
+
+    def _ref(self, number):
+        return '[表{0}](#table-{0})'.format(number)
+
+    def _heading(self, text, title_level):
+        return '{0} {1}\n\n'.format('#' * max(1, min(title_level, 6)), self._escape(text))
+
+    def _paragraph(self, markup):
+        return markup + '\n\n'
+
+    def _table(self, number, title, widths, rows, header_row=True, header_col=False):
+        lines = ['<a id="table-{0}"></a>**表 {0} {1}**\n\n'.format(number, self._escape(title))]
+        cells = [[self._escape(cell) for cell in row] for row in rows]
+        if header_col:
+            cells = [['**{0}**'.format(row[0])] + row[1:] for row in cells]
+        if not header_row:
+            # 管道表格必须有表头行，首列为表头的表格使用空的表头行
+            cells.insert(0, [''] * len(widths))
+        lines.append('| {0} |\n'.format(' | '.join(cells[0])))
+        lines.append('|{0}|\n'.format('|'.join(['---'] * len(widths))))
+        lines.extend('| {0} |\n'.format(' | '.join(row)) for row in cells[1:])
+        lines.append('\n')
+        return ''.join(lines)
+
+
+class HtmlWriter(TextWriter):
+    """
+    html写入工具，生成单个自包含的html文件，表格带题注，引出段落中的表格引用为页内链接
+    """
+    def _begin(self):
+        title = html.escape(os.path.splitext(os.path.basename(self.doc_name))[0])
+        return ('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{0}</title>\n<style>\n'
+                'body {{ font-family: "Times New Roman", "宋体", serif; }}\n'
+                'p {{ text-indent: 2em; line-height: 1.5; }}\n'
+                'table {{ border-collapse: collapse; margin: 0 auto 1em auto; border: 1.5pt solid; }}\n'
+                'td, th {{ border: 0.5pt solid; padding: 2px 6px; vertical-align: top; }}\n'
+                'th, caption {{ font-family: "黑体", sans-serif; font-weight: normal; }}\n'
+                'th {{ text-align: left; }}\n'
+                '</style>\n</head>\n<body>\n').format(title)
+
+    def _end(self):
+        return '</body>\n</html>\n'
+
+    def _escape(self, text):
+        return html.escape(text, quote=False).replace('\n', '<br>')
+
+    def _ref(self, number):
+        return '<a href="#table-{0}">表{0}</a>'.format(number)
+
+    def _heading(self, text, title_level):
+        level = max(1, min(title_level, 6))
+        return '<h{0}>{1}</h{0}>\n'.format(level, self._escape(text))
+
+    def _paragraph(self, markup):
+        return '<p>{0}</p>\n'.format(markup)
+
+    def _table(self, number, title, widths, rows, header_row=True, header_col=False):
+        total = float(sum(widths))
+        lines = ['<table id="table-{0}">\n<caption>表 {0} {1}</caption>\n<colgroup>'.format(number, self._escape(title))]
+        lines.extend('<col style="width: {0:.0f}%">'.format(width * 100 / total) for width in widths)
+        lines.append('</colgroup>\n')
+        for r, row in enumerate(rows):
+            lines.append('<tr>')
+            for c, cell in enumerate(row):
+                tag = 'th' if (header_row and r == 0) or (header_col and c == 0) else 'td'
+                lines.append('<{0}>{1}</{0}>'.format(tag, self._escape(cell)))
+            lines.append('</tr>\n')
+        lines.append('</table>\n')
+        return ''.join(lines)
+
+
+class AsciiDocWriter(TextWriter):
+    """
+    AsciiDoc写入工具，表格带锚点及题注，引出段落中的表格引用为交叉引用
+    包含格式字符的文本使用pass:c[]宏原样输出，避免C++类型中的*、<<、[]等被解释为格式或宏
+    """
+    def _escape(self, text):
+        lines = []
+        for line in text.split('\n'):
+            if _ADOC_SPECIAL.search(line):
+                line = 'pass:c[{0}]'.format(line.replace(']', '\\]'))
+            lines.append(line)
+        return ' +\n'.join(lines)
+
+    def _ref(self, number):
+        return '<<table-{0},表{0}>>'.format(number)
+
+    def _heading(self, text, title_level):
+        # "="为文档标题，章节标题从"=="开始，最多6个"="
+        return '{0} {1}\n\n'.format('=' * max(2, min(title_level + 1, 6)), self._escape(text))
+
+    def _paragraph(self, markup):
+        return markup + '\n\n'
+
+    def _table(self, number, title, widths, rows, header_row=True, header_col=False):
+        cols = ','.join('{0}{1}'.format(int(round(width * 10)), 'h' if header_col and c == 0 else '')
+                        for c, width in enumerate(widths))
+        lines = ['[[table-{0}]]\n.表 {0} {1}\n[cols="{2}"{3}]\n|===\n'.format(
+            number, self._escape(title), cols, ',options="header"' if header_row else '')]
+        for row in rows:
+            lines.append(''.join('|{0}\n'.format(self._escape(cell).replace('|', '\\|')) for cell in row))
+            lines.append('\n')
+        lines.append('|===\n\n')
+        return ''.join(lines)
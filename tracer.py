@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import time
+import threading
+
+
+class _NullSpan:
+    """
+    未启用计时时使用的空计时区间，所有操作均为空操作
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """
+    计时区间，退出with语句时将耗时记录到所属的Tracer中
+    """
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.add(self.name, self.cat, self.start, time.perf_counter() - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        """
+        补充区间的参数，如解析完成后得到的类名
+        """
+        self.args.update(args)
+
+
+class Tracer:
+    """
+    运行过程计时工具，记录各处理阶段(读取文件、构造文档树、各get_*方法、写入、保存等)的耗时
+    可导出为Chrome trace格式(chrome://tracing 或 Perfetto 中查看)及耗时汇总
+    未启用时span返回空操作对象，几乎不产生额外开销
+    """
+    def __init__(self, enabled=True):
+        """
+        构造函数
+        :param enabled: 是否启用计时
+        """
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        # 已记录的区间，元素为(名称, 分类, 开始时间, 耗时, 进程id, 线程id, 参数)，时间单位为秒
+        self.events = []
+
+    def span(self, name, cat='parse', **args):
+        """
+        创建计时区间，用于with语句
+        :param name: 区间名称(处理阶段)
+        :param cat: 区间分类，如parse、writer、cache
+        :param args: 区间的参数，如文件名、类名
+        :return: 计时区间对象
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def add(self, name, cat, start, duration, args):
+        """
+        记录一个已结束的区间
+        :param start: 开始时间(time.perf_counter)
+        :param duration: 耗时(秒)
+        :return: 无
+        """
+        self.events.append((name, cat, start, duration, os.getpid(), threading.get_ident(), args))
+
+    def extend(self, events):
+        """
+        合并其他Tracer(如进程池中的解析进程)记录的区间
+        :param events: 其他Tracer的events
+        :return: 无
+        """
+        if self.enabled:
+            self.events.extend(events)
+
+    def export_chrome(self, file_name):
+        """
+        导出为Chrome trace格式的json文件
+        :param file_name: 输出文件路径
+        :return: 无
+        """
+        trace_events = []
+        for name, cat, start, duration, pid, tid, args in self.events:
+            trace_events.append({'name': name, 'cat': cat, 'ph': 'X', 'pid': pid, 'tid': tid % 1000000,
+                                 'ts': round((start - self.origin) * 1e6, 1), 'dur': round(duration * 1e6, 1),
+                                 'args': args})
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, file, ensure_ascii=False)
+
+    def summary(self, top=20):
+        """
+        汇总各处理阶段的耗时，以及耗时最长的文件和类
+        :param top: 列出耗时最长的文件/类的数量
+        :return: 汇总信息字典
+        """
+        stages = {}
+        files = {}
+        for name, cat, start, duration, pid, tid, args in self.events:
+            stage = stages.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            stage['count'] += 1
+            stage['total'] += duration
+            stage['max'] = max(stage['max'], duration)
+            # parse及write区间记录了文件名和类名，按文件累计
+            if 'file' in args and name in ('parse', 'write'):
+                item = files.setdefault(args['file'], {'file': args['file'], 'class': '', 'parse': 0.0,
+                                                       'write': 0.0})
+                item[name] += duration
+                item['class'] = args.get('class', item['class'])
+        for stage in stages.values():
+            stage['mean'] = stage['total'] / stage['count']
+        items = list(files.values())
+        for item in items:
+            item['total'] = item['parse'] + item['write']
+        return {'stages': stages,
+                'slowest_files': sorted(items, key=lambda item: item['parse'], reverse=True)[:top],
+                'slowest_classes': sorted(items, key=lambda item: item['total'], reverse=True)[:top]}
+
+    def export_summary(self, file_name, top=20):
+        """
+        导出耗时汇总为json文件
+        :param file_name: 输出文件路径
+        :param top: 列出耗时最长的文件/类的数量
+        :return: 汇总信息字典
+        """
+        summary = self.summary(top)
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+        return summary
+
+
+NULL_TRACER = Tracer(enabled=False)
+
+
+class Progress:
+    """
+    单行刷新的处理进度，显示已处理数量、处理速度及预计剩余时间
+    """
+    def __init__(self, total, stream=None, interval=0.2):
+        """
+        构造函数
+        :param total: 文件总数
+        :param stream: 输出流，默认为标准错误
+        :param interval: 最短刷新间隔(秒)
+        """
+        self.total = total
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last = 0.0
+
+    def update(self, count, label=''):
+        """
+        更新进度
+        :param count: 已处理的文件数
+        :param label: 附加显示的文本，如当前文件名
+        :return: 无
+        """
+        now = time.perf_counter()
+        if now - self.last < self.interval and count < self.total:
+            return
+        self.last = now
+        elapsed = now - self.start
+        rate = count / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - count) / rate if rate > 0 else 0.0
+        line = '处理文件:[{0}/{1}] {2:.1f} 文件/秒 已用{3} 剩余{4} {5}'.format(
+            count, self.total, rate, _format_seconds(elapsed), _format_seconds(eta), label)
+        self.stream.write('\r' + line[:160].ljust(160))
+        self.stream.flush()
+
+    def finish(self):
+        """
+        结束进度显示并换行
+        :return: 无
+        """
+        self.stream.write('\n')
+        self.stream.flush()
+
+
+def _format_seconds(seconds):
+    """
+    将秒数格式化为 时:分:秒
+    """
+    seconds = int(seconds)
+    return '{0:02d}:{1:02d}:{2:02d}'.format(seconds // 3600, seconds // 60 % 60, seconds % 60)
@@ -1,17 +1,31 @@
 import os
 import os.path
 
-def get_file_list(dir):
+# doxygen生成文件名时对特殊字符的转义，见doxygen的escapeCharsInString
+_DOXYGEN_ESCAPES = {'1': ':', '2': '/', '3': '<', '4': '>', '5': '*', '6': '&', '7': '|', '8': '.', '9': '!'}
+_DOXYGEN_ESCAPES_0 = {'0': ',', '1': ' ', '2': '{', '3': '}', '4': '?', '5': '^', '6': '%', '7': '(', '8': ')',
+                      '9': '+', 'a': '=', 'b': '$', 'c': '\\', 'd': '@', 'e': ']', 'f': '[', 'g': '#'}
+# 类型描述文件名的前缀
+_COMPOUND_PREFIXES = ('class', 'struct', 'union', 'interface', 'exception')
+
+def iter_file_list(dir):
     """
-    获取目录下的所有文件，不包含子目录中的文件
+    逐个产生目录下的所有文件，包含子目录中的文件
     :param dir: 需要遍历的目录
-    :return: dir目录中的文件列表
+    :return: 产生dir目录中文件路径的生成器
     """
-    filelist = []
     for parent, dirnames, filenames in os.walk(dir):
         for filename in filenames:
-            filelist.append(os.path.join(parent, filename))
-    return filelist
+            yield os.path.join(parent, filename)
+
+
+def get_file_list(dir):
+    """
+    获取目录下的所有文件，包含子目录中的文件
+    :param dir: 需要遍历的目录
+    :return: dir目录中的文件列表
+    """
+    return list(iter_file_list(dir))
 
 
 def get_file(dir, *args):
@@ -31,5 +45,41 @@ def get_file(dir, *args):
     return filelist
 
 
+def compound_name(file_path):
+    """
+    根据doxygen生成的类型描述文件名还原类型的完整名称，如classns_1_1_my_class.html还原为ns::MyClass
+    无需解析html即可获知类型所在的命名空间
+    :param file_path: 类型描述html文件路径
+    :return: 类型的完整名称，文件名不符合doxygen命名规则时返回不含扩展名的文件名
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    for prefix in _COMPOUND_PREFIXES:
+        if stem.startswith(prefix):
+            stem = stem[len(prefix):]
+            break
+    else:
+        return stem
+    name = []
+    i = 0
+    while i < len(stem):
+        ch = stem[i]
+        if ch != '_' or i + 1 == len(stem):
+            name.append(ch)
+            i += 1
+            continue
+        nxt = stem[i + 1]
+        if nxt == '_':
+            name.append('_')
+        elif nxt == '0' and i + 2 < len(stem):
+            name.append(_DOXYGEN_ESCAPES_0.get(stem[i + 2], ''))
+            i += 1
+        elif nxt in _DOXYGEN_ESCAPES:
+            name.append(_DOXYGEN_ESCAPES[nxt])
+        else:
+            name.append(nxt.upper())  # 文件名不区分大小写时，大写字母转义为'_'加小写字母
+        i += 2
+    return ''.join(name)
+
+
 if __name__ == '__main__':
     print(get_file('.', '.py'))
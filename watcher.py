@@ -0,0 +1,177 @@
+import os
+import time
+import threading
+
+
+def _stat(path):
+    """
+    获取文件的修改时间及大小，用于判断文件是否变化
+    :param path: 文件或目录路径
+    :return: (修改时间, 大小)二元组，文件不存在时返回None
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Watcher:
+    """
+    监视模式：常驻内存保存文件列表及各文件的解析结果，文件变化后只重新解析变化的文件，
+    一批变化结束(debounce秒内无新的变化)后按文件顺序重新输出全部类型
+    安装watchdog时由文件系统事件触发检查，否则每interval秒轮询一次
+    """
+    def __init__(self, find_files, parse, emit, watch_dirs, marker_files=(), interval=1.0, debounce=2.0):
+        """
+        构造函数
+        :param find_files: 无参数的可调用对象，返回当前的文件列表，仅在目录内容或marker_files变化时调用
+        :param parse: 以(文件列表, on_error)为参数的可调用对象，按顺序产生(文件路径, DataType对象)二元组，
+                      解析失败的文件由parse报告错误，并以(文件路径, 异常对象)为参数调用on_error后跳过
+        :param emit: 以按文件顺序排列的(文件路径, DataType对象)列表为参数的可调用对象，生成输出
+        :param watch_dirs: 监视的目录列表
+        :param marker_files: 文件列表的来源文件，如annotated.html、index.xml，变化时重新获取文件列表
+        :param interval: 轮询间隔(秒)
+        :param debounce: 最后一次变化后等待的时间(秒)，期间的变化合并为一次输出
+        """
+        self.find_files = find_files
+        self.parse = parse
+        self.emit = emit
+        self.watch_dirs = list(watch_dirs)
+        self.marker_files = list(marker_files)
+        self.interval = interval
+        self.debounce = debounce
+        self.file_list = []
+        self.stats = {}  # 文件路径 -> 上次解析时的(修改时间, 大小)
+        self.models = {}  # 文件路径 -> DataType对象
+        self.markers = None
+        self._event = threading.Event()
+        self._observer = None
+
+    def _markers(self):
+        """
+        获取监视目录(包含子目录)及来源文件的状态，目录中增删文件时目录的修改时间随之变化
+        :return: 路径 -> 状态的字典
+        """
+        markers = {path: _stat(path) for path in self.marker_files}
+        for watch_dir in self.watch_dirs:
+            for parent, dirnames, filenames in os.walk(watch_dir):
+                markers[parent] = _stat(parent)
+        return markers
+
+    def scan(self):
+        """
+        检查文件变化，目录内容或来源文件变化时重新获取文件列表
+        :return: 新增、修改及删除的文件集合
+        """
+        changed = set()
+        markers = self._markers()
+        if markers != self.markers:
+            self.markers = markers
+            file_list = self.find_files()
+            removed = set(self.file_list) - set(file_list)
+            for path in removed:
+                self.stats.pop(path, None)
+                self.models.pop(path, None)
+            changed |= removed
+            self.file_list = file_list
+        for path in self.file_list:
+            st = _stat(path)
+            if st is not None and st != self.stats.get(path):
+                self.stats[path] = st
+                changed.add(path)
+        return changed
+
+    def update(self, changed):
+        """
+        重新解析变化的文件，解析失败(如doxygen仍在写入)的文件保留原解析结果及本次的状态，
+        跳过该文件继续解析其他文件，文件再次变化后重试
+        :param changed: 变化的文件集合
+        :return: 是否有解析结果发生变化(重新解析成功或文件被删除)
+        """
+        files = [path for path in self.file_list if path in changed]
+        # 被删除的文件在scan中已移除解析结果
+        removed = len(files) < len(changed)
+        failed = []
+
+        def on_error(path, error):
+            failed.append(path)
+        done = set()
+        try:
+            for path, dt in self.parse(files, on_error):
+                self.models[path] = dt
+                done.add(path)
+        except Exception as error:
+            # 不能归于单个文件的错误，未完成的文件同样保留原解析结果
+            print('解析失败：{0}'.format(error))
+            failed.extend(path for path in files if path not in done and path not in failed)
+        if failed:
+            print('{0}个文件解析失败，保留原解析结果，将在文件再次变化后重试'.format(len(failed)))
+        return removed or bool(done)
+
+    def _wait(self):
+        """
+        等待下一次检查：有文件系统事件时立即返回，否则等待一个轮询间隔
+        """
+        if self._observer is not None:
+            self._event.wait()
+            self._event.clear()
+        else:
+            time.sleep(self.interval)
+
+    def _start_observer(self):
+        """
+        安装了watchdog时启动文件系统事件监视
+        :return: 是否使用文件系统事件
+        """
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return False
+        event = self._event
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, fs_event):
+                event.set()
+        self._observer = Observer()
+        for watch_dir in self.watch_dirs:
+            self._observer.schedule(Handler(), watch_dir, recursive=True)
+        self._observer.start()
+        return True
+
+    def run(self):
+        """
+        首次解析全部文件并输出，之后持续监视，直到按Ctrl+C
+        :return: 无
+        """
+        changed = self.scan()
+        self.update(changed)
+        self.emit([(path, self.models[path]) for path in self.file_list if path in self.models])
+        mode = '文件系统事件' if self._start_observer() else '每{0}秒轮询'.format(self.interval)
+        print('开始监视：{0}({1})，按Ctrl+C退出'.format(', '.join(self.watch_dirs), mode))
+        try:
+            while True:
+                self._wait()
+                changed = self.scan()
+                if not changed:
+                    continue
+                # 合并一批连续的变化，最后一次变化后debounce秒内无新变化才重新输出
+                quiet_since = time.monotonic()
+                while time.monotonic() - quiet_since < self.debounce:
+                    time.sleep(min(self.interval, self.debounce))
+                    more = self.scan()
+                    if more:
+                        changed |= more
+                        quiet_since = time.monotonic()
+                print('检测到{0}个文件变化'.format(len(changed)))
+                if not self.update(changed):
+                    print('解析结果没有变化，不重新输出')
+                    continue
+                self.emit([(path, self.models[path]) for path in self.file_list if path in self.models])
+        except KeyboardInterrupt:
+            print('停止监视')
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
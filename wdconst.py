@@ -0,0 +1,46 @@
+# office word 的枚举常量，取值与Word对象模型(win32com.client.constants)一致
+# 直接使用数值，导入docwriter时无需加载pywin32，也无需生成Word类型库的包装代码
+
+# WdCaptionPosition
+wdCaptionPositionAbove = 0
+
+# WdReferenceKind
+wdOnlyLabelAndNumber = 3
+
+# WdBuiltinStyle
+wdStyleHeading1 = -2
+wdStyleHeading2 = -3
+wdStyleHeading3 = -4
+wdStyleHeading4 = -5
+wdStyleHeading5 = -6
+wdStyleHeading6 = -7
+wdStyleHeading7 = -8
+
+# WdLineWidth
+wdLineWidth150pt = 12
+
+# WdParagraphAlignment
+wdAlignParagraphCenter = 1
+
+# WdRowAlignment
+wdAlignRowCenter = 1
+
+# WdUnits
+wdParagraph = 4
+
+# WdReplace
+wdReplaceOne = 1
+
+# WdTableFieldSeparator
+wdSeparateByTabs = 1
+
+# WdBuiltinStyle
+wdStyleNormal = -1
+
+# WdStyleType
+wdStyleTypeParagraph = 1
+wdStyleTypeTable = 3
+
+# WdConditionCode
+wdFirstRow = 0
+wdFirstColumn = 4
@@ -0,0 +1,341 @@
+import os
+import pathlib
+from xml.etree.ElementTree import iterparse
+from datatype import DataType, VarInfo, FunInfo, TypedefInfo, EnumInfo
+from tracer import Tracer, NULL_TRACER
+import util
+
+# 解析器版本，提取结果的内容或格式发生变化时需递增，使解析缓存失效
+PARSER_VERSION = 2
+
+# 可见性对应的doxygen成员分组(sectiondef)的kind前缀，如public-attrib、protected-func、private-static-attrib
+VISIABLE_KIND = {'Public': 'public', 'Protected': 'protected', 'Private': 'private'}
+
+# 作为数据类型输出的compound种类，与annotated.html中列出的类型一致
+_COMPOUND_KINDS = ('class', 'struct', 'union', 'interface', 'exception')
+
+# 不属于描述正文的段落内容：参数说明、返回值等小节
+_NOT_DESC = ('parameterlist', 'simplesect')
+
+
+def _text(el):
+    """
+    获取元素的全部文本，合并连续的空白字符
+    :param el: xml元素，可为None
+    :return: 文本
+    """
+    if el is None:
+        return ''
+    return ' '.join(''.join(el.itertext()).split())
+
+
+def _para_text(el):
+    """
+    获取段落的正文文本，不包含段落中嵌套的参数说明、返回值等小节
+    :param el: para元素
+    :return: 文本
+    """
+    parts = [el.text or '']
+    for child in el:
+        if child.tag not in _NOT_DESC:
+            parts.append(_para_text(child))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+
+def _paragraphs(*descriptions):
+    """
+    获取briefdescription、detaileddescription中各段落的正文
+    :param descriptions: 描述元素，可为None
+    :return: 非空段落文本列表
+    """
+    paras = []
+    for description in descriptions:
+        if description is None:
+            continue
+        for para in description.iterfind('para'):
+            text = ' '.join(_para_text(para).split())
+            if text:
+                paras.append(text)
+    return paras
+
+
+class XmlDocParser:
+    """
+    用于解析doxygen生成的xml文档(GENERATE_XML)，生成与HtmlDocParser相同的类信息
+    使用iterparse逐个处理成员定义并随即清除，内存占用与成员数量无关
+    """
+    cache_version = 'xml:{0}'.format(PARSER_VERSION)
+
+    def __init__(self, file_path, tracer=NULL_TRACER):
+        """
+        构造函数，单次遍历compound xml文件，提取全部类型信息
+        :param file_path: 需要解析的compound xml文件的路径，如classns_1_1_foo.xml
+        :param tracer: 计时工具，记录遍历文件的耗时
+        """
+        self.class_name = ''
+        self.class_desc = ''
+        self.var_lists = {visiable: [] for visiable in VISIABLE_KIND}
+        self.fun_lists = {visiable: [] for visiable in VISIABLE_KIND}
+        self.typedef_list = []
+        self.enum_list = []
+        self.bases = []
+        with tracer.span('iterparse'):
+            self._parse(file_path)
+
+    def _parse(self, file_path):
+        """
+        遍历compound xml文件，成员定义(memberdef)结束时提取其信息并清除
+        :param file_path: compound xml文件路径
+        :return: 无
+        """
+        section = ''
+        path = []  # 当前元素的祖先元素名称
+        brief = None
+        for event, el in iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                path.append(el.tag)
+                if el.tag == 'sectiondef':
+                    section = el.get('kind', '')
+                continue
+            path.pop()
+            parent = path[-1] if path else ''
+            if el.tag == 'memberdef':
+                self._member(section, el)
+                el.clear()
+            elif parent != 'compounddef':
+                continue
+            elif el.tag == 'compoundname':
+                self.class_name = _text(el)
+            elif el.tag == 'basecompoundref':
+                # 文本为源代码中的写法，可能未带命名空间，工程内的基类由refid还原完整名称
+                self.bases.append(util.compound_name(el.get('refid')) if el.get('refid') else _text(el))
+            elif el.tag == 'briefdescription':
+                brief = el
+            elif el.tag == 'detaileddescription':
+                self.class_desc = '\n'.join(_paragraphs(brief, el))
+            elif el.tag in ('sectiondef', 'listofallmembers', 'programlisting', 'collaborationgraph',
+                            'inheritancegraph'):
+                el.clear()
+
+    def _member(self, section, el):
+        """
+        根据成员定义所在的分组提取成员信息
+        :param section: 成员分组的kind，如public-attrib、public-static-func、public-type
+        :param el: memberdef元素
+        :return: 无
+        """
+        kind = el.get('kind')
+        if kind == 'typedef':
+            self._typedef(el)
+            return
+        if kind == 'enum':
+            self._enum(el)
+            return
+        for visiable, prefix in VISIABLE_KIND.items():
+            if kind == 'variable' and section in (prefix + '-attrib', prefix + '-static-attrib'):
+                self.var_lists[visiable].append(self._var(el))
+            elif kind == 'function' and section in (prefix + '-func', prefix + '-static-func'):
+                fun = self._fun(el)
+                if fun is not None:
+                    self.fun_lists[visiable].append(fun)
+
+    @staticmethod
+    def _var(el):
+        """
+        提取成员变量信息
+        :param el: memberdef元素
+        :return: VarInfo对象
+        """
+        mem_type = _text(el.find('type'))
+        if el.get('static') == 'yes':
+            mem_type = ('static ' + mem_type).strip()
+        mem_name = _text(el.find('name')) + _text(el.find('argsstring'))
+        return VarInfo(mem_type, mem_name, ' '.join(_paragraphs(el.find('briefdescription'))))
+
+    @staticmethod
+    def _fun(el):
+        """
+        提取成员函数信息，既无简要说明也无详细说明的函数与HtmlDocParser一致被忽略
+        :param el: memberdef元素
+        :return: FunInfo对象，或None
+        """
+        brief = _paragraphs(el.find('briefdescription'))
+        detailed = el.find('detaileddescription')
+        detail = _paragraphs(detailed)
+        params = []
+        ret = ''
+        retvals = []
+        if detailed is not None:
+            for param_list in detailed.iter('parameterlist'):
+                for item in param_list.iterfind('parameteritem'):
+                    name = _text(item.find('parameternamelist'))
+                    desc = _text(item.find('parameterdescription'))
+                    if param_list.get('kind') == 'retval':
+                        retvals.append(' '.join([name, desc]))
+                    elif param_list.get('kind') == 'param':
+                        name_el = item.find('parameternamelist/parametername')
+                        direction = name_el.get('direction') if name_el is not None else None
+                        params.append(' '.join(['[{0}]'.format(direction) if direction else '', name, desc]))
+            ret = ' '.join(_text(sect) for sect in detailed.iter('simplesect') if sect.get('kind') == 'return')
+        has_detail = bool(detail or params or ret or retvals)
+        if not brief and not has_detail:
+            return None
+        if has_detail:
+            # 与html中的"更多..."一致，有详细说明时使用简要说明及详细说明的全部段落
+            fun_desc = '。'.join(brief + detail)
+            fun_ret = '\n'.join([ret] + retvals)
+        else:
+            fun_desc = ' '.join(brief)
+            fun_ret = ''
+        fun_type = _text(el.find('type'))
+        if el.get('virt') in ('virtual', 'pure-virtual'):
+            fun_type = 'virtual ' + fun_type
+        if el.get('static') == 'yes':
+            fun_type = 'static ' + fun_type
+        fun_name = ' '.join(filter(None, [_text(el.find('name')), _text(el.find('argsstring'))]))
+        template = ''
+        template_params = el.find('templateparamlist')
+        if template_params is not None:
+            items = []
+            for param in template_params.iterfind('param'):
+                item = ' '.join(filter(None, [_text(param.find('type')), _text(param.find('declname'))]))
+                default = _text(param.find('defval'))
+                items.append(item + (' = ' + default if default else ''))
+            template = 'template<{0} >'.format(', '.join(items))
+        return FunInfo(fun_type.strip(), fun_name, fun_desc, params, fun_ret, template)
+
+    def _typedef(self, el):
+        """
+        提取类型重定义信息，using别名与HtmlDocParser一致不作为类型重定义
+        :param el: memberdef元素
+        :return: 无
+        """
+        define = _text(el.find('definition'))
+        if not define.startswith('typedef'):
+            return
+        define = ' '.join(filter(None, ['typedef', _text(el.find('type')), _text(el.find('name')) +
+                                        _text(el.find('argsstring'))]))
+        self.typedef_list.append(TypedefInfo(define, ' '.join(_paragraphs(el.find('briefdescription')))))
+
+    def _enum(self, el):
+        """
+        提取枚举值信息，与html一致仅输出带有说明的枚举类型的枚举值
+        :param el: memberdef元素
+        :return: 无
+        """
+        values = []
+        for value in el.iterfind('enumvalue'):
+            values.append(EnumInfo(_text(value.find('name')), ' '.join(_paragraphs(
+                value.find('briefdescription'), value.find('detaileddescription')))))
+        if any(value.desc for value in values):
+            self.enum_list.extend(values)
+
+    def get_class_name(self):
+        """
+        获取类名称
+        :return:类的名称
+        """
+        return self.class_name
+
+    def get_class_desc(self):
+        """
+        获取类的描述信息
+        :return: 类的描述信息
+        """
+        return self.class_desc
+
+    def get_var_info(self, visiable='Public'):
+        """
+        根据visiable获取成员变量列表
+        :param visiable: 成员变量可见性，取值:Public Protected Private
+        :return: 对应可见性的成员变量VarInfo列表
+        """
+        return self.var_lists[visiable]
+
+    def get_fun_info(self, visiable='Public'):
+        """
+        根据visiable获取成员函数列表
+        :param visiable: 成员函数可见性，取值:Public Protected Private
+        :return: 对应可见性的函数描述FunInfo列表
+        """
+        return self.fun_lists[visiable]
+
+    def get_typedefs(self):
+        """
+        获取数据类型中的数据类型重定义列表
+        :return: 重定义变量的TypedefInfo列表
+        """
+        return self.typedef_list
+
+    def get_enums(self):
+        """
+        获取类型中定义的枚举类型列表
+        :return:枚举类型的EnumInfo列表
+        """
+        return self.enum_list
+
+    def get_bases(self):
+        """
+        获取类型的直接基类
+        :return: 基类完整名称列表
+        """
+        return self.bases
+
+    @staticmethod
+    def parse(file_path, tracer=NULL_TRACER):
+        """
+        解析file_path指定的compound xml文件，提取其中的数据类型信息
+        该方法为静态方法且返回值可被pickle，可直接提交给进程池执行
+        :param file_path: 需要解析的xml文件的路径
+        :param tracer: 计时工具，记录解析的耗时
+        :return: 数据类型信息DataType对象
+        """
+        with tracer.span('parse', file=file_path) as parse_span:
+            doc_parser = XmlDocParser(file_path, tracer)
+            parse_span.set(**{'class': doc_parser.class_name})
+        return DataType(doc_parser.get_class_name(), doc_parser.get_class_desc(),
+                        [doc_parser.get_var_info(visiable) for visiable in VISIABLE_KIND],
+                        [doc_parser.get_fun_info(visiable) for visiable in VISIABLE_KIND],
+                        doc_parser.get_typedefs(), doc_parser.get_enums(), doc_parser.get_bases())
+
+    @staticmethod
+    def parse_traced(file_path):
+        """
+        解析file_path指定的xml文件并记录耗时，供进程池中的解析进程使用
+        :param file_path: 需要解析的xml文件的路径
+        :return: DataType对象及计时区间列表组成的二元组
+        """
+        tracer = Tracer()
+        data_type = XmlDocParser.parse(file_path, tracer)
+        return data_type, tracer.events
+
+    @staticmethod
+    def get_data_files(xml_dir):
+        """
+        从xml_dir目录的index.xml中提取各数据类型的compound xml文件名
+        :param xml_dir: doxygen生成的xml目录
+        :return: 数据类型定义xml文件名列表
+        """
+        return list(XmlDocParser.iter_data_files(xml_dir))
+
+    @staticmethod
+    def iter_data_files(xml_dir):
+        """
+        从xml_dir目录的index.xml中逐个产生各数据类型的compound xml文件名
+        :param xml_dir: doxygen生成的xml目录
+        :return: 产生数据类型定义xml文件名的生成器
+        """
+        if not pathlib.Path(xml_dir).exists():
+            print(xml_dir + ' 目录不存在 !')
+            exit(-1)
+        filename = os.path.join(xml_dir, 'index.xml')
+        if not pathlib.Path(filename).exists():
+            print('在目录：{0}中未找到 index.xml '.format(xml_dir))
+            exit(-1)
+        print('找到index.xml 在：{0}'.format(xml_dir))
+        for event, el in iterparse(filename):
+            if el.tag == 'compound':
+                if el.get('kind') in _COMPOUND_KINDS:
+                    yield '{0}/{1}.xml'.format(xml_dir, el.get('refid'))
+                el.clear()